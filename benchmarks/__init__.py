@@ -0,0 +1,9 @@
+"""
+MD Audit 性能基准套件
+
+- corpus: 可复现（固定种子）的合成Markdown语料生成器
+- runner: 各阶段计时（解析/关键词/各引擎/端到端批量分析），输出JSON结果
+- compare: 与保存的基线结果对比，标记性能回退
+
+用法见 `python -m benchmarks --help`
+"""
@@ -0,0 +1,242 @@
+"""
+基准套件命令行
+
+示例:
+  python -m benchmarks generate --out /tmp/corpus --docs 200 --lang-mix en=0.5,zh=0.3,mixed=0.2
+  python -m benchmarks run --docs 100 --output results.json
+  python -m benchmarks run --corpus /tmp/corpus --output current.json
+  python -m benchmarks compare baseline.json current.json --threshold 0.1
+  python -m benchmarks memory document --size-mb 20 --output memory-doc.md
+  python -m benchmarks memory batch --docs 500 --json memory-batch.json
+  python -m benchmarks diagnostics --docs 100
+  python -m benchmarks serialization --diagnostics 200
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import sys
+from pathlib import Path
+
+from benchmarks.corpus import CorpusGenerator, parse_lang_mix
+
+CACHE_DIR = Path(__file__).resolve().parent / ".cache"
+
+
+def _add_corpus_args(parser: argparse.ArgumentParser):
+    parser.add_argument('--docs', type=int, default=50, help='文档数量（默认50）')
+    parser.add_argument('--seed', type=int, default=42, help='随机种子（默认42）')
+    parser.add_argument('--lang-mix', type=str, default='en=0.5,zh=0.3,mixed=0.2',
+                        help='语言占比（默认 en=0.5,zh=0.3,mixed=0.2）')
+    parser.add_argument('--min-words', type=int, default=300, help='单篇最少词数（默认300）')
+    parser.add_argument('--max-words', type=int, default=2500, help='单篇最多词数（默认2500）')
+
+
+def _generate(out_dir: Path, args) -> Path:
+    lang_mix = parse_lang_mix(args.lang_mix)
+    generator = CorpusGenerator(seed=args.seed)
+    paths = generator.generate_corpus(out_dir, args.docs, lang_mix, args.min_words, args.max_words)
+    spec = {
+        "docs": args.docs, "seed": args.seed, "lang_mix": lang_mix,
+        "min_words": args.min_words, "max_words": args.max_words,
+    }
+    (out_dir / "corpus.json").write_text(json.dumps(spec, indent=2), encoding="utf-8")
+    print(f"已生成 {len(paths)} 篇文档到 {out_dir}", file=sys.stderr)
+    return out_dir
+
+
+def _cached_corpus(args) -> Path:
+    """按生成参数缓存语料，参数相同则复用"""
+    key = f"{args.docs}:{args.seed}:{args.lang_mix}:{args.min_words}:{args.max_words}"
+    out_dir = CACHE_DIR / f"corpus-{hashlib.sha256(key.encode()).hexdigest()[:12]}"
+    if not (out_dir / "corpus.json").exists():
+        _generate(out_dir, args)
+    return out_dir
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="MD Audit 性能基准套件")
+    subparsers = parser.add_subparsers(dest='command')
+
+    gen_parser = subparsers.add_parser('generate', help='生成合成语料')
+    gen_parser.add_argument('--out', type=str, required=True, help='输出目录')
+    _add_corpus_args(gen_parser)
+
+    run_parser = subparsers.add_parser('run', help='运行计时基准')
+    run_parser.add_argument('--corpus', type=str, help='已有语料目录（缺省则按参数生成并缓存）')
+    _add_corpus_args(run_parser)
+    run_parser.add_argument('--repeat', type=int, default=3, help='每项重复次数（默认3）')
+    run_parser.add_argument('--workers', type=int, default=4, help='analyze_directory并发线程数（默认4）')
+    run_parser.add_argument('--only', nargs='+', help='仅运行指定基准项（名称前缀）')
+    run_parser.add_argument('--config', type=str, help='配置文件路径（可选）')
+    run_parser.add_argument('-o', '--output', type=str, help='结果JSON输出路径（缺省输出到stdout）')
+    run_parser.add_argument('--baseline', type=str, help='运行后与该基线对比')
+    run_parser.add_argument('--threshold', type=float, default=0.10, help='回退判定阈值（默认0.10）')
+
+    cmp_parser = subparsers.add_parser('compare', help='对比两份结果，存在回退时返回1')
+    cmp_parser.add_argument('baseline', type=str, help='基线结果JSON')
+    cmp_parser.add_argument('current', type=str, help='当前结果JSON')
+    cmp_parser.add_argument('--threshold', type=float, default=0.10, help='回退判定阈值（默认0.10）')
+    cmp_parser.add_argument('--min-delta-ms', type=float, default=1.0, help='绝对差值噪声下限（默认1ms）')
+
+    mem_parser = subparsers.add_parser('memory', help='内存剖析（峰值RSS与tracemalloc分配点）')
+    mem_parser.add_argument('mode', choices=['document', 'batch'], help='document: 单篇超大文档；batch: 批量分析')
+    mem_parser.add_argument('--file', type=str, help='document模式：已有文档路径（缺省则生成）')
+    mem_parser.add_argument('--size-mb', type=float, default=10.0, help='document模式：生成文档大小（默认10MB）')
+    mem_parser.add_argument('--lang', type=str, default='en', help='document模式：生成文档语言（默认en）')
+    mem_parser.add_argument('--corpus', type=str, help='batch模式：已有语料目录（缺省则按参数生成并缓存）')
+    _add_corpus_args(mem_parser)
+    mem_parser.add_argument('--workers', type=int, default=4, help='batch模式：并发线程数（默认4）')
+    mem_parser.add_argument('--top', type=int, default=15, help='分配点排行条数（默认15）')
+    mem_parser.add_argument('--config', type=str, help='配置文件路径（可选）')
+    mem_parser.add_argument('-o', '--output', type=str, help='Markdown报告输出路径（缺省输出到stdout）')
+    mem_parser.add_argument('--json', type=str, help='同时保存JSON结果')
+
+    diag_parser = subparsers.add_parser('diagnostics', help='诊断项构造开销对比（校验构造 vs DiagnosticItem.trusted）')
+    diag_parser.add_argument('--corpus', type=str, help='已有语料目录（缺省则按参数生成并缓存）')
+    _add_corpus_args(diag_parser)
+    diag_parser.add_argument('--repeat', type=int, default=5, help='重复次数（默认5）')
+    diag_parser.add_argument('--config', type=str, help='配置文件路径（可选）')
+    diag_parser.add_argument('-o', '--output', type=str, help='Markdown报告输出路径（缺省输出到stdout）')
+    diag_parser.add_argument('--json', type=str, help='同时保存JSON结果')
+
+    ser_parser = subparsers.add_parser('serialization', help='报告JSON编码耗时对比（FastAPI默认 vs orjson/pydantic-core）')
+    ser_parser.add_argument('--corpus', type=str, help='已有语料目录（缺省则按参数生成并缓存）')
+    _add_corpus_args(ser_parser)
+    ser_parser.add_argument('--diagnostics', type=int, default=200, help='报告诊断项条数（默认200）')
+    ser_parser.add_argument('--repeat', type=int, default=200, help='重复次数（默认200）')
+    ser_parser.add_argument('--config', type=str, help='配置文件路径（可选）')
+    ser_parser.add_argument('-o', '--output', type=str, help='Markdown报告输出路径（缺省输出到stdout）')
+    ser_parser.add_argument('--json', type=str, help='同时保存JSON结果')
+
+    args = parser.parse_args()
+
+    if args.command == 'generate':
+        _generate(Path(args.out), args)
+        return 0
+
+    if args.command == 'run':
+        from benchmarks.runner import run_suite
+
+        corpus_dir = Path(args.corpus) if args.corpus else _cached_corpus(args)
+        results = run_suite(corpus_dir, repeat=args.repeat, workers=args.workers,
+                            only=args.only, config_path=args.config)
+        payload = json.dumps(results, indent=2, ensure_ascii=False)
+        if args.output:
+            Path(args.output).write_text(payload, encoding="utf-8")
+            print(f"结果已保存到 {args.output}", file=sys.stderr)
+        else:
+            print(payload)
+        if args.baseline:
+            return _compare(json.loads(Path(args.baseline).read_text(encoding="utf-8")), results, args.threshold)
+        return 0
+
+    if args.command == 'compare':
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        current = json.loads(Path(args.current).read_text(encoding="utf-8"))
+        return _compare(baseline, current, args.threshold, args.min_delta_ms)
+
+    if args.command == 'memory':
+        return _memory(args)
+
+    if args.command == 'diagnostics':
+        return _diagnostics(args)
+
+    if args.command == 'serialization':
+        return _serialization(args)
+
+    parser.print_help()
+    return 0
+
+
+def _large_document(args) -> Path:
+    """按大小缓存生成的超大文档"""
+    size = int(args.size_mb * 1024 * 1024)
+    path = CACHE_DIR / f"large-{args.lang}-{args.seed}-{size}.md"
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        text = CorpusGenerator(seed=args.seed).generate_large_document(size, args.lang)
+        path.write_text(text, encoding="utf-8")
+        print(f"已生成 {path.stat().st_size / 1024 / 1024:.1f} MB 文档 {path}", file=sys.stderr)
+    return path
+
+
+def _memory(args) -> int:
+    from benchmarks.memory import format_report, profile_batch, profile_document
+    from benchmarks.runner import build_analyzer
+
+    analyzer = build_analyzer(args.config)
+    # 预热：jieba词典等一次性加载不计入剖析结果
+    analyzer.parser.extract_keywords("预热 warm up", max_keywords=1)
+    if args.mode == 'document':
+        file_path = Path(args.file) if args.file else _large_document(args)
+        result = profile_document(analyzer, str(file_path), top=args.top)
+    else:
+        corpus_dir = Path(args.corpus) if args.corpus else _cached_corpus(args)
+        result = profile_batch(analyzer, corpus_dir, workers=args.workers, top=args.top)
+
+    report = format_report(result)
+    if args.output:
+        Path(args.output).write_text(report, encoding="utf-8")
+        print(f"报告已保存到 {args.output}", file=sys.stderr)
+    else:
+        print(report)
+    if args.json:
+        Path(args.json).write_text(json.dumps(result, indent=2, ensure_ascii=False), encoding="utf-8")
+    return 0
+
+
+def _diagnostics(args) -> int:
+    from benchmarks.diagnostics import collect_fields, format_report, run
+    from benchmarks.runner import build_analyzer
+
+    corpus_dir = Path(args.corpus) if args.corpus else _cached_corpus(args)
+    docs = collect_fields(build_analyzer(args.config), corpus_dir)
+    result = run(docs, repeat=args.repeat)
+
+    report = format_report(result)
+    if args.output:
+        Path(args.output).write_text(report, encoding="utf-8")
+        print(f"报告已保存到 {args.output}", file=sys.stderr)
+    else:
+        print(report)
+    if args.json:
+        Path(args.json).write_text(json.dumps(result, indent=2, ensure_ascii=False), encoding="utf-8")
+    return 0
+
+
+def _serialization(args) -> int:
+    from benchmarks.runner import build_analyzer
+    from benchmarks.serialization import build_report, format_report, run
+
+    corpus_dir = Path(args.corpus) if args.corpus else _cached_corpus(args)
+    report = build_report(build_analyzer(args.config), corpus_dir, args.diagnostics)
+    result = run(report, repeat=args.repeat)
+
+    output = format_report(result)
+    if args.output:
+        Path(args.output).write_text(output, encoding="utf-8")
+        print(f"报告已保存到 {args.output}", file=sys.stderr)
+    else:
+        print(output)
+    if args.json:
+        Path(args.json).write_text(json.dumps(result, indent=2, ensure_ascii=False), encoding="utf-8")
+    return 0
+
+
+def _compare(baseline: dict, current: dict, threshold: float, min_delta_ms: float = 1.0) -> int:
+    from benchmarks.compare import compare_results, format_comparison
+
+    rows = compare_results(baseline, current, threshold, min_delta_ms)
+    print(format_comparison(rows), file=sys.stderr)
+    regressions = [r for r in rows if r["status"] == "regression"]
+    if regressions:
+        print(f"\n❌ 发现 {len(regressions)} 项性能回退（阈值 {threshold:.0%}）", file=sys.stderr)
+        return 1
+    print("\n✅ 未发现性能回退", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
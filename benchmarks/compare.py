@@ -0,0 +1,77 @@
+"""
+基准结果对比
+
+以中位数比较当前结果与基线：相对变化超过阈值且绝对差值超过
+最小噪声阈值时判定为回退（regression）或提升（improvement）。
+"""
+from __future__ import annotations
+
+from typing import Dict, List
+
+
+def compare_results(
+    baseline: Dict[str, object],
+    current: Dict[str, object],
+    threshold: float = 0.10,
+    min_delta_ms: float = 1.0,
+) -> List[Dict[str, object]]:
+    """
+    对比两份基准结果
+
+    Args:
+        baseline: 基线结果（run_suite输出）
+        current: 当前结果
+        threshold: 相对变化阈值（0.10 = 10%）
+        min_delta_ms: 绝对差值下限，低于此值视为噪声
+
+    Returns:
+        每个基准项一行：name/baseline_ms/current_ms/change/status
+    """
+    base_results = baseline.get("results", {})
+    cur_results = current.get("results", {})
+    rows = []
+    for name in sorted(set(base_results) | set(cur_results)):
+        base = base_results.get(name)
+        cur = cur_results.get(name)
+        if base is None or cur is None:
+            rows.append({
+                "name": name,
+                "baseline_ms": base["median_ms"] if base else None,
+                "current_ms": cur["median_ms"] if cur else None,
+                "change": None,
+                "status": "missing" if cur is None else "new",
+            })
+            continue
+
+        base_ms = base["median_ms"]
+        cur_ms = cur["median_ms"]
+        change = (cur_ms - base_ms) / base_ms if base_ms else 0.0
+        if abs(cur_ms - base_ms) < min_delta_ms or abs(change) < threshold:
+            status = "ok"
+        elif change > 0:
+            status = "regression"
+        else:
+            status = "improvement"
+        rows.append({
+            "name": name,
+            "baseline_ms": base_ms,
+            "current_ms": cur_ms,
+            "change": round(change, 4),
+            "status": status,
+        })
+    return rows
+
+
+def format_comparison(rows: List[Dict[str, object]]) -> str:
+    """输出Markdown对比表"""
+    marks = {"regression": "🔴", "improvement": "🟢", "ok": "⚪", "missing": "⚠️", "new": "🆕"}
+    lines = [
+        "| 基准项 | 基线(ms) | 当前(ms) | 变化 | 状态 |",
+        "|--------|----------|----------|------|------|",
+    ]
+    for row in rows:
+        base = f"{row['baseline_ms']:.1f}" if row["baseline_ms"] is not None else "-"
+        cur = f"{row['current_ms']:.1f}" if row["current_ms"] is not None else "-"
+        change = f"{row['change']:+.1%}" if row["change"] is not None else "-"
+        lines.append(f"| `{row['name']}` | {base} | {cur} | {change} | {marks[row['status']]} {row['status']} |")
+    return "\n".join(lines)
@@ -0,0 +1,291 @@
+"""
+合成Markdown语料生成器
+
+同一种子+参数始终生成逐字节相同的语料，保证基准结果可比。
+每篇文档包含frontmatter、多级标题、段落、代码块、表格、FAQ和内外链，
+语言可为英文（en）、中文（zh）或中英混合（mixed）。
+"""
+from __future__ import annotations
+
+import json
+import random
+from pathlib import Path
+from typing import Dict, List, Optional
+
+LANGUAGES = ("en", "zh", "mixed")
+
+EN_WORDS = (
+    "markdown search engine optimization content keyword ranking page index crawler "
+    "metadata title description heading structure link anchor authority experience "
+    "expertise trust citation reference source article guide tutorial example python "
+    "javascript api performance latency cache server client request response document "
+    "analysis report score diagnostic quality readability paragraph section summary "
+    "question answer feature snippet overview semantic entity variant density coverage "
+    "position internal external image alt text table list code block framework library "
+    "developer engineer team project workflow pipeline build deploy release version "
+    "update publish author date review audit checklist strategy traffic conversion "
+    "user visitor mobile desktop speed layout shift paint input delay vitals metric"
+).split()
+
+EN_GLUE = "the a of to and in for with on by from is are can will this that".split()
+
+EN_PROPER = (
+    "Google Search Console", "Core Web Vitals", "Python", "FastAPI", "Markdown",
+    "Lighthouse", "OpenAI", "Schema Markup", "Search Engine Land", "Ahrefs",
+)
+
+EN_ACRONYMS = ("SEO", "API", "HTML", "CSS", "JSON", "LLM", "CDN", "URL", "FAQ", "SERP")
+
+ZH_WORDS = (
+    "搜索 引擎 优化 内容 关键词 排名 页面 索引 爬虫 元数据 标题 描述 结构 链接 锚文本 "
+    "权威 经验 专业 可信 引用 来源 文章 指南 教程 示例 性能 延迟 缓存 服务器 客户端 "
+    "请求 响应 文档 分析 报告 评分 诊断 质量 可读性 段落 章节 摘要 问题 答案 特性 "
+    "语义 实体 变体 密度 覆盖 位置 内部 外部 图片 表格 列表 代码 框架 开发者 工程师 "
+    "团队 项目 流程 构建 部署 发布 版本 更新 作者 日期 审核 清单 策略 流量 转化 用户 "
+    "访客 移动端 桌面端 速度 布局 指标 数据 案例 实践 方法论 步骤 算法 模型 架构"
+).split()
+
+ZH_PUNCT = ("，", "、", "；")
+
+
+class CorpusGenerator:
+    """基于固定种子的Markdown文档生成器"""
+
+    def __init__(self, seed: int = 42):
+        self.seed = seed
+
+    # ===== 文本片段 =====
+
+    def _en_sentence(self, rng: random.Random, min_words: int = 8, max_words: int = 20) -> str:
+        words = []
+        for _ in range(rng.randint(min_words, max_words)):
+            roll = rng.random()
+            if roll < 0.25:
+                words.append(rng.choice(EN_GLUE))
+            elif roll < 0.30:
+                words.append(rng.choice(EN_PROPER))
+            elif roll < 0.34:
+                words.append(rng.choice(EN_ACRONYMS))
+            else:
+                words.append(rng.choice(EN_WORDS))
+        sentence = " ".join(words)
+        if rng.random() < 0.1:
+            sentence += f' called "{rng.choice(EN_PROPER)}"'
+        if rng.random() < 0.1:
+            sentence += f" improved by {rng.randint(2, 95)}% in {rng.randint(2015, 2025)}"
+        return sentence[0].upper() + sentence[1:] + "."
+
+    def _zh_sentence(self, rng: random.Random, min_words: int = 6, max_words: int = 16) -> str:
+        parts = []
+        count = rng.randint(min_words, max_words)
+        for i in range(count):
+            parts.append(rng.choice(ZH_WORDS))
+            if 0 < i < count - 1 and rng.random() < 0.15:
+                parts.append(rng.choice(ZH_PUNCT))
+        if rng.random() < 0.1:
+            parts.append(f"「{rng.choice(ZH_WORDS)}{rng.choice(ZH_WORDS)}」")
+        if rng.random() < 0.1:
+            parts.append(f"提升{rng.randint(2, 95)}%")
+        return "".join(parts) + "。"
+
+    def _sentence(self, rng: random.Random, lang: str) -> str:
+        if lang == "mixed":
+            lang = "en" if rng.random() < 0.5 else "zh"
+        return self._en_sentence(rng) if lang == "en" else self._zh_sentence(rng)
+
+    def _paragraph(self, rng: random.Random, lang: str, target_words: int) -> str:
+        sentences = []
+        words = 0
+        while words < target_words:
+            sentence = self._sentence(rng, lang)
+            sentences.append(sentence)
+            words += len(sentence.split()) if sentence.isascii() else len(sentence)
+        joiner = "" if lang == "zh" else " "
+        return joiner.join(sentences)
+
+    def _phrase(self, rng: random.Random, lang: str, words: int = 4) -> str:
+        if lang == "zh" or (lang == "mixed" and rng.random() < 0.5):
+            return "".join(rng.choice(ZH_WORDS) for _ in range(words))
+        return " ".join(rng.choice(EN_WORDS) for _ in range(words)).title()
+
+    def _code_block(self, rng: random.Random) -> str:
+        name = rng.choice(EN_WORDS)
+        return "\n".join([
+            "```python",
+            f"def {name}_handler(request):",
+            f"    value = request.get('{rng.choice(EN_WORDS)}', {rng.randint(1, 100)})",
+            f"    return {{'{name}': value * {rng.randint(2, 9)}}}",
+            "```",
+        ])
+
+    def _table(self, rng: random.Random, lang: str) -> str:
+        cols = rng.randint(2, 4)
+        header = [self._phrase(rng, lang, 1) for _ in range(cols)]
+        rows = [
+            "| " + " | ".join(header) + " |",
+            "|" + "---|" * cols,
+        ]
+        for _ in range(rng.randint(2, 5)):
+            rows.append("| " + " | ".join(str(rng.randint(1, 999)) for _ in range(cols)) + " |")
+        return "\n".join(rows)
+
+    def _faq(self, rng: random.Random, lang: str) -> str:
+        heading = "## FAQ" if lang == "en" else "## 常见问题"
+        lines = [heading, ""]
+        for _ in range(rng.randint(2, 5)):
+            question = self._phrase(rng, lang, rng.randint(3, 6))
+            lines.append(f"### {question}?")
+            lines.append(self._paragraph(rng, lang, rng.randint(30, 60)))
+            lines.append("")
+        return "\n".join(lines)
+
+    def _links(self, rng: random.Random, lang: str, doc_names: List[str], index: int) -> str:
+        links = []
+        for _ in range(rng.randint(1, 4)):
+            target = doc_names[rng.randrange(len(doc_names))]
+            links.append(f"[{self._phrase(rng, lang, 2)}](./{target})")
+        if rng.random() < 0.7:
+            links.append(f"[{self._phrase(rng, lang, 2)}](https://developers.google.com/search/docs/{index})")
+        if rng.random() < 0.2:
+            links.append("[click here](https://example.com)")
+        return " ".join(links)
+
+    # ===== 文档与语料 =====
+
+    def generate_document(
+        self,
+        index: int,
+        lang: str,
+        target_words: int,
+        doc_names: Optional[List[str]] = None,
+    ) -> str:
+        """生成单篇文档（index参与种子派生，单篇可独立复现）"""
+        rng = random.Random(f"{self.seed}:{index}:{lang}:{target_words}")
+        doc_names = doc_names or [f"doc_{index:05d}.md"]
+
+        title = self._phrase(rng, lang, rng.randint(4, 8))
+        lines = [
+            "---",
+            f"title: {json.dumps(title, ensure_ascii=False)}",
+            f"description: {json.dumps(self._sentence(rng, lang)[:150], ensure_ascii=False)}",
+            f"author: Author {rng.randint(1, 50)}",
+            f"date: {rng.randint(2019, 2025)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            "---",
+            "",
+            f"# {title}",
+            "",
+            self._paragraph(rng, lang, rng.randint(40, 100)),
+            "",
+        ]
+
+        words = 0
+        section = 0
+        while words < target_words:
+            section += 1
+            lines.append(f"## {self._phrase(rng, lang, rng.randint(2, 5))}")
+            lines.append("")
+            for _ in range(rng.randint(1, 3)):
+                if rng.random() < 0.4:
+                    lines.append(f"### {self._phrase(rng, lang, rng.randint(2, 4))}")
+                    lines.append("")
+                para_words = rng.randint(60, 200)
+                lines.append(self._paragraph(rng, lang, para_words))
+                lines.append("")
+                words += para_words
+            roll = rng.random()
+            if roll < 0.2:
+                lines.extend([self._code_block(rng), ""])
+            elif roll < 0.35:
+                lines.extend([self._table(rng, lang), ""])
+            elif roll < 0.55:
+                lines.extend([f"- {self._phrase(rng, lang, 3)}" for _ in range(rng.randint(2, 5))] + [""])
+            if rng.random() < 0.6:
+                lines.extend([self._links(rng, lang, doc_names, index), ""])
+            if rng.random() < 0.15:
+                lines.extend([f"![{self._phrase(rng, lang, 2) if rng.random() < 0.7 else ''}](images/{index}_{section}.png)", ""])
+
+        if rng.random() < 0.6:
+            lines.extend([self._faq(rng, lang), ""])
+        lines.append("## Conclusion" if lang == "en" else "## 总结")
+        lines.append("")
+        lines.append(self._paragraph(rng, lang, rng.randint(40, 120)))
+        lines.append("")
+        return "\n".join(lines)
+
+    def generate_large_document(self, target_bytes: int, lang: str = "en") -> str:
+        """
+        生成超大单篇文档（模拟自动生成的API参考页）
+
+        先生成一篇基础文档，再以带编号标题的章节重复其正文直至达到目标字节数，
+        避免逐词随机生成数十MB文本的开销。
+        """
+        base = self.generate_document(0, lang, 3000)
+        head, _, body = base.partition("\n## ")
+        body = "## " + body
+        parts = [head, ""]
+        size = len(head.encode("utf-8"))
+        body_bytes = len(body.encode("utf-8"))
+        part = 0
+        while size < target_bytes:
+            part += 1
+            chunk = body.replace("\n## ", f"\n## [{part}] ")
+            chunk = f"## [{part}] " + chunk[3:]
+            parts.append(chunk)
+            size += body_bytes + 8
+        return "\n".join(parts)
+
+    def generate_corpus(
+        self,
+        out_dir: Path,
+        count: int,
+        lang_mix: Dict[str, float],
+        min_words: int = 300,
+        max_words: int = 2500,
+    ) -> List[Path]:
+        """
+        生成语料目录
+
+        Args:
+            out_dir: 输出目录（按语言分子目录）
+            count: 文档数量
+            lang_mix: 语言占比，如 {"en": 0.5, "zh": 0.3, "mixed": 0.2}
+            min_words: 单篇最少词数
+            max_words: 单篇最多词数
+
+        Returns:
+            生成的文件路径列表
+        """
+        rng = random.Random(self.seed)
+        langs = [lang for lang in LANGUAGES if lang_mix.get(lang, 0) > 0]
+        weights = [lang_mix[lang] for lang in langs]
+        plan = [
+            (rng.choices(langs, weights=weights)[0], rng.randint(min_words, max_words))
+            for _ in range(count)
+        ]
+        names = [f"{lang}/doc_{i:05d}.md" for i, (lang, _) in enumerate(plan)]
+
+        paths = []
+        for i, (lang, words) in enumerate(plan):
+            path = out_dir / names[i]
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # 内链目标使用相对当前语言目录的路径
+            siblings = [f"../{n}" for n in names[max(0, i - 20):i + 20]]
+            path.write_text(self.generate_document(i, lang, words, siblings), encoding="utf-8")
+            paths.append(path)
+        return paths
+
+
+def parse_lang_mix(spec: str) -> Dict[str, float]:
+    """解析语言占比参数，如 'en=0.5,zh=0.3,mixed=0.2'"""
+    mix: Dict[str, float] = {}
+    for part in spec.split(","):
+        if not part.strip():
+            continue
+        lang, _, weight = part.partition("=")
+        lang = lang.strip()
+        if lang not in LANGUAGES:
+            raise ValueError(f"未知语言 {lang}（可选：{', '.join(LANGUAGES)}）")
+        mix[lang] = float(weight or 1)
+    if not mix or sum(mix.values()) <= 0:
+        raise ValueError(f"语言占比无效：{spec}")
+    return mix
@@ -0,0 +1,141 @@
+"""
+诊断项构造开销对比
+
+引擎内部诊断由校验构造 DiagnosticItem(...) 改为 DiagnosticItem.trusted(...)（跳过字段校验，
+直接写入实例字段），外部输入仍走校验构造。本基准在真实语料的诊断字段上对比以下路径：
+- validated: 每条诊断校验构造 DiagnosticItem，再构造SEOReport（改动前的引擎行为）
+- trusted: 每条诊断经 DiagnosticItem.trusted 构造，再构造SEOReport（当前实现）
+- model_construct: 对照，Pydantic v2 的 model_construct 为纯Python逐字段处理，慢于校验构造
+
+输出每篇文档的构建耗时与 tracemalloc 分配峰值。
+"""
+from __future__ import annotations
+
+import contextlib
+import gc
+import io
+import statistics
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from md_audit.models.data_models import DiagnosticItem, SEOReport
+
+RESULT_VERSION = 2
+
+
+def collect_fields(analyzer, corpus_dir: Path) -> List[List[dict]]:
+    """分析语料，取每篇文档全部诊断项的字段（作为各构造路径的共同输入）"""
+    docs = []
+    for path in sorted(Path(corpus_dir).rglob("*.md")):
+        with contextlib.redirect_stdout(io.StringIO()):
+            report = analyzer.analyze(str(path))
+        docs.append([dict(item) for item in report.diagnostics])
+    return docs
+
+
+def _trusted_args(fields: dict) -> dict:
+    """诊断字段 -> DiagnosticItem.trusted 参数（line/column 合并为 location）"""
+    args = dict(fields)
+    line, column = args.pop("line"), args.pop("column")
+    if line is not None:
+        args["location"] = (line, column)
+    return args
+
+
+def _build_validated(fields: List[dict]):
+    items = [DiagnosticItem(**f) for f in fields]
+    return SEOReport(file_path="bench.md", total_score=50.0, diagnostics=items)
+
+
+def _build_trusted(fields: List[dict]):
+    items = [DiagnosticItem.trusted(**f) for f in fields]
+    return SEOReport(file_path="bench.md", total_score=50.0, diagnostics=items)
+
+
+def _build_model_construct(fields: List[dict]):
+    items = [DiagnosticItem.model_construct(**f) for f in fields]
+    return SEOReport(file_path="bench.md", total_score=50.0, diagnostics=items)
+
+
+BUILDERS: Dict[str, Callable[[List[dict]], object]] = {
+    "validated": _build_validated,
+    "trusted": _build_trusted,
+    "model_construct": _build_model_construct,
+}
+
+
+def run(docs: List[List[dict]], repeat: int = 5) -> Dict[str, object]:
+    """对比各构造路径的耗时与分配峰值"""
+    doc_count = len(docs)
+    diag_count = sum(len(d) for d in docs)
+    results: Dict[str, object] = {
+        "version": RESULT_VERSION,
+        "docs": doc_count,
+        "diagnostics": diag_count,
+        "repeat": repeat,
+        "paths": {},
+    }
+    inputs = {
+        "validated": docs,
+        "trusted": [[_trusted_args(f) for f in fields] for fields in docs],
+        "model_construct": docs,
+    }
+
+    for name, build in BUILDERS.items():
+        path_docs = inputs[name]
+        for fields in path_docs:  # 预热
+            build(fields)
+
+        runs = []
+        for _ in range(repeat):
+            gc.collect()
+            start = time.perf_counter()
+            for fields in path_docs:
+                build(fields)
+            runs.append(time.perf_counter() - start)
+
+        peaks = []
+        tracemalloc.start()
+        try:
+            for fields in path_docs:
+                gc.collect()
+                tracemalloc.reset_peak()
+                before = tracemalloc.get_traced_memory()[0]
+                report = build(fields)
+                peaks.append(tracemalloc.get_traced_memory()[1] - before)
+                del report
+        finally:
+            tracemalloc.stop()
+
+        median = statistics.median(runs)
+        results["paths"][name] = {
+            "per_doc_us": round(median / doc_count * 1e6, 2) if doc_count else 0.0,
+            "per_diag_us": round(median / diag_count * 1e6, 3) if diag_count else 0.0,
+            "peak_kb_per_doc": round(statistics.mean(peaks) / 1024, 2) if peaks else 0.0,
+        }
+    return results
+
+
+def format_report(result: Dict[str, object]) -> str:
+    """输出Markdown对比报告"""
+    lines = [
+        "# 诊断项构造开销对比",
+        "",
+        f"- 文档: {result['docs']} 篇，诊断项 {result['diagnostics']} 条，重复 {result['repeat']} 次取中位数",
+        "",
+        "| 路径 | 每篇耗时(µs) | 每条耗时(µs) | 每篇分配峰值(KB) |",
+        "|------|--------------|--------------|------------------|",
+    ]
+    for name, row in result["paths"].items():
+        lines.append(
+            f"| `{name}` | {row['per_doc_us']:.1f} | {row['per_diag_us']:.2f} | {row['peak_kb_per_doc']:.1f} |"
+        )
+    base, new = result["paths"].get("validated"), result["paths"].get("trusted")
+    if base and new and base["per_doc_us"]:
+        lines.append("")
+        lines.append(f"每篇节省 {base['per_doc_us'] - new['per_doc_us']:.1f} µs"
+                     f"（{1 - new['per_doc_us'] / base['per_doc_us']:.0%}），"
+                     f"分配峰值减少 {base['peak_kb_per_doc'] - new['peak_kb_per_doc']:.1f} KB")
+    return "\n".join(lines)
@@ -0,0 +1,346 @@
+"""
+内存剖析
+
+两种模式：
+- document: 单篇超大文档依次经过 parse 的各子步骤（frontmatter/markdown/BeautifulSoup/提取）
+  和每个引擎，记录各阶段的 tracemalloc 驻留增量、峰值增量与RSS，并给出驻留结构
+  （raw_content、html_content、BeautifulSoup树、各引擎诊断列表）的大小。
+- batch: analyze_directory 处理N篇文档，记录峰值与报告列表的驻留大小。
+
+两种模式都输出 tracemalloc 分配点排行（按源码行），用于定位占用内存的结构。
+注意：tracemalloc 本身会放大RSS，RSS数值仅用于同条件下的前后对比。
+"""
+from __future__ import annotations
+
+import contextlib
+import gc
+import io
+import linecache
+import os
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+RESULT_VERSION = 1
+MB = 1024 * 1024
+
+# 分配点排行中忽略的帧（剖析工具自身）
+_IGNORED_FILES = (tracemalloc.__file__, linecache.__file__, __file__)
+
+
+def _current_rss() -> Optional[int]:
+    """当前RSS（字节），仅Linux可用"""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _peak_rss() -> Optional[int]:
+    """进程生命周期内的峰值RSS（字节）"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux以KB为单位，macOS以字节为单位
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _mb(value: Optional[int]) -> Optional[float]:
+    return round(value / MB, 3) if value is not None else None
+
+
+def _snapshot() -> tracemalloc.Snapshot:
+    filters = [tracemalloc.Filter(False, f) for f in _IGNORED_FILES]
+    return tracemalloc.take_snapshot().filter_traces(filters)
+
+
+def _top_stats(stats, limit: int) -> List[Dict[str, object]]:
+    rows = []
+    for stat in stats[:limit]:
+        frame = stat.traceback[0]
+        size = getattr(stat, "size_diff", stat.size)
+        count = getattr(stat, "count_diff", stat.count)
+        rows.append({
+            "location": f"{_short_path(frame.filename)}:{frame.lineno}",
+            "code": linecache.getline(frame.filename, frame.lineno).strip()[:80],
+            "size_mb": _mb(size),
+            "count": count,
+        })
+    return rows
+
+
+def _short_path(filename: str) -> str:
+    """缩短路径：仓库内显示相对路径，第三方包显示site-packages之后的部分"""
+    root = str(Path(__file__).resolve().parent.parent)
+    if filename.startswith(root):
+        return os.path.relpath(filename, root)
+    marker = "site-packages" + os.sep
+    if marker in filename:
+        return filename.split(marker, 1)[1]
+    return filename
+
+
+class MemoryTracker:
+    """按阶段记录 tracemalloc 驻留/峰值增量与RSS"""
+
+    def __init__(self, top: int = 5):
+        self.top = top
+        self.stages: List[Dict[str, object]] = []
+
+    def run(self, name: str, fn: Callable[[], object]) -> object:
+        """
+        执行一个阶段并记录内存
+
+        驻留增量 = 阶段结束后仍被引用的新分配（即返回结构的大小）；
+        峰值增量 = 阶段执行期间的最高占用减去阶段开始时的占用。
+        """
+        gc.collect()
+        before = _snapshot()
+        start_current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        started = time.perf_counter()
+
+        result = fn()
+
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        # 先回收循环引用（如BeautifulSoup树）再计量驻留，临时结构只体现在峰值中
+        gc.collect()
+        current, _ = tracemalloc.get_traced_memory()
+        after = _snapshot()
+        self.stages.append({
+            "stage": name,
+            "elapsed_ms": round(elapsed * 1000, 3),
+            "retained_mb": _mb(current - start_current),
+            "peak_mb": _mb(peak - start_current),
+            "rss_mb": _mb(_current_rss()),
+            "peak_rss_mb": _mb(_peak_rss()),
+            "top_allocators": _top_stats(after.compare_to(before, "lineno"), self.top),
+        })
+        return result
+
+
+def _length(obj) -> Optional[int]:
+    """结构长度：字符串为字符数，列表为元素数，BeautifulSoup树为标签数"""
+    if hasattr(obj, "find_all"):
+        return len(obj.find_all(True))
+    if isinstance(obj, (str, list, tuple, dict)):
+        return len(obj)
+    return None
+
+
+def _diagnostics_of(result) -> List[object]:
+    """取引擎返回值中的诊断列表（规则引擎返回(score, list)，其余引擎返回dict）"""
+    if isinstance(result, tuple):
+        return result[1]
+    if isinstance(result, dict):
+        return result.get("diagnostics", [])
+    return []
+
+
+def _structure_sizes(items: Dict[str, Tuple[Optional[int], Optional[float]]]) -> List[Dict[str, object]]:
+    rows = []
+    for name, (length, retained_mb) in items.items():
+        rows.append({"structure": name, "length": length, "retained_mb": retained_mb})
+    rows.sort(key=lambda r: r["retained_mb"] or 0, reverse=True)
+    return rows
+
+
+def profile_document(analyzer, file_path: str, top: int = 15) -> Dict[str, object]:
+    """
+    剖析单篇文档经过parse子步骤与各引擎时的内存
+
+    Args:
+        analyzer: MarkdownSEOAnalyzer实例（建议禁用AI）
+        file_path: Markdown文件路径
+        top: 分配点排行条数
+
+    Returns:
+        JSON可序列化的结果字典
+    """
+    import frontmatter
+    from bs4 import BeautifulSoup
+
+    parser = analyzer.parser
+    rules = analyzer.rules_engine
+    tracker = MemoryTracker()
+
+    tracemalloc.start()
+    try:
+        # parse 子步骤：与 MarkdownParser.parse 相同的处理顺序，逐步保留中间结构以计量大小
+        def load():
+            with open(file_path, "r", encoding="utf-8") as f:
+                return frontmatter.load(f)
+
+        post = tracker.run("parse.frontmatter", load)
+        raw_content = tracker.run("parse.normalize", lambda: parser._normalize_headings(post.content))
+        html_content = tracker.run("parse.markdown", lambda: parser.md_parser.convert(raw_content))
+        parser.md_parser.reset()
+        soup = tracker.run("parse.soup", lambda: BeautifulSoup(html_content, "html.parser"))
+        text_content = tracker.run("parse.get_text", soup.get_text)
+        # 字符串可能与上一步共享对象（如未发生替换），直接取对象大小
+        structures = {
+            "raw_content": (_length(raw_content), _mb(sys.getsizeof(raw_content))),
+            "html_content": (_length(html_content), _mb(sys.getsizeof(html_content))),
+            "BeautifulSoup tree": (_length(soup), tracker.stages[3]["retained_mb"]),
+            "soup.get_text()": (_length(text_content), _mb(sys.getsizeof(text_content))),
+        }
+        # 释放中间结构，后续阶段的驻留增量不受其影响
+        del post, raw_content, html_content, soup, text_content
+
+        parsed = tracker.run("parse", lambda: parser.parse(file_path))
+        structures["ParsedMarkdown"] = (None, tracker.stages[-1]["retained_mb"])
+
+        # 分配点排行：此时仅 ParsedMarkdown 驻留，排行反映其内部结构
+        parse_snapshot = _snapshot()
+
+        max_keywords = analyzer.config.keywords.max_auto_keywords
+        keywords = tracker.run(
+            "extract_keywords",
+            lambda: parser.extract_keywords(parsed.raw_content, max_keywords=max_keywords),
+        )
+
+        engines = [
+            ("rules.metadata", lambda: rules.run_metadata(parsed)),
+            ("rules.structure", lambda: rules.run_structure(parsed)),
+            ("rules.keyword", lambda: rules.run_keyword(parsed, keywords)),
+            ("intent", lambda: analyzer.intent_analyzer.analyze(parsed)),
+            ("content_depth", lambda: analyzer.content_depth_analyzer.analyze(parsed)),
+            ("eeat", lambda: analyzer.eeat_analyzer.analyze(parsed)),
+            ("ai_search", lambda: analyzer.ai_search_optimizer.analyze(parsed)),
+            ("links", lambda: analyzer.link_analyzer.analyze(parsed.links, parsed.word_count)),
+        ]
+        diagnostics: Dict[str, object] = {}
+        for name, fn in engines:
+            diagnostics[name] = tracker.run(name, fn)
+            structures[f"{name} diagnostics"] = (len(_diagnostics_of(diagnostics[name])), tracker.stages[-1]["retained_mb"])
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            report = tracker.run(
+                "analyze (end-to-end)",
+                lambda: analyzer.analyze(file_path),
+            )
+        structures["SEOReport"] = (_length(report.diagnostics), tracker.stages[-1]["retained_mb"])
+        traced_peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "mode": "document",
+        "file": str(file_path),
+        "bytes": os.path.getsize(file_path),
+        "word_count": parsed.word_count,
+        "stages": tracker.stages,
+        "structures": _structure_sizes(structures),
+        "top_allocators": _top_stats(parse_snapshot.statistics("lineno"), top),
+        "traced_peak_mb": _mb(traced_peak),
+        "peak_rss_mb": _mb(_peak_rss()),
+    }
+
+
+def profile_batch(analyzer, corpus_dir: Path, workers: int = 4, top: int = 15) -> Dict[str, object]:
+    """
+    剖析 analyze_directory 批量分析的内存
+
+    Args:
+        analyzer: MarkdownSEOAnalyzer实例（建议禁用AI）
+        corpus_dir: 语料目录
+        workers: 并发线程数
+        top: 分配点排行条数
+
+    Returns:
+        JSON可序列化的结果字典
+    """
+    files = list(Path(corpus_dir).rglob("*.md"))
+    tracker = MemoryTracker(top=top)
+
+    tracemalloc.start()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            reports = tracker.run(
+                "analyze_directory",
+                lambda: analyzer.analyze_directory(str(corpus_dir), max_workers=workers, show_progress=False),
+            )
+        stage = tracker.stages[0]
+        # 驻留的报告列表中诊断项数量，用于换算单条诊断的平均占用
+        diag_count = sum(len(r.diagnostics) for r in reports)
+    finally:
+        tracemalloc.stop()
+
+    retained = stage["retained_mb"] or 0
+    return {
+        "mode": "batch",
+        "corpus": str(corpus_dir),
+        "files": len(files),
+        "bytes": sum(f.stat().st_size for f in files),
+        "workers": workers,
+        "reports": len(reports),
+        "diagnostics": diag_count,
+        "stages": tracker.stages,
+        "retained_per_report_kb": round(retained * 1024 / len(reports), 3) if reports else 0.0,
+        "top_allocators": stage["top_allocators"],
+        "traced_peak_mb": stage["peak_mb"],
+        "peak_rss_mb": _mb(_peak_rss()),
+    }
+
+
+def _fmt(value) -> str:
+    return "-" if value is None else f"{value:.2f}" if isinstance(value, float) else str(value)
+
+
+def format_report(result: Dict[str, object]) -> str:
+    """输出Markdown内存剖析报告"""
+    lines = [f"# 内存剖析（{result['mode']}）", ""]
+    if result["mode"] == "document":
+        lines.append(f"- 文件: `{result['file']}`（{result['bytes'] / MB:.2f} MB，{result['word_count']} 字）")
+    else:
+        lines.append(f"- 语料: `{result['corpus']}`（{result['files']} 篇，{result['bytes'] / MB:.2f} MB，"
+                     f"{result['workers']} 线程）")
+        lines.append(f"- 报告: {result['reports']} 份，诊断项 {result['diagnostics']} 条，"
+                     f"平均每份驻留 {result['retained_per_report_kb']:.1f} KB")
+    lines.append(f"- tracemalloc 峰值: {_fmt(result['traced_peak_mb'])} MB，进程峰值RSS: {_fmt(result['peak_rss_mb'])} MB")
+    lines.append("")
+
+    lines.extend([
+        "## 各阶段",
+        "",
+        "| 阶段 | 耗时(ms) | 驻留增量(MB) | 峰值增量(MB) | RSS(MB) | 峰值RSS(MB) |",
+        "|------|----------|--------------|--------------|---------|-------------|",
+    ])
+    for stage in result["stages"]:
+        lines.append(
+            f"| `{stage['stage']}` | {_fmt(stage['elapsed_ms'])} | {_fmt(stage['retained_mb'])} | "
+            f"{_fmt(stage['peak_mb'])} | {_fmt(stage['rss_mb'])} | {_fmt(stage['peak_rss_mb'])} |"
+        )
+    lines.append("")
+
+    if result.get("structures"):
+        lines.extend([
+            "## 驻留结构",
+            "",
+            "| 结构 | 长度 | 驻留(MB) |",
+            "|------|------|----------|",
+        ])
+        for row in result["structures"]:
+            lines.append(f"| {row['structure']} | {_fmt(row['length'])} | {_fmt(row['retained_mb'])} |")
+        lines.append("")
+
+    lines.extend([
+        "## 分配点排行",
+        "",
+        "| 位置 | 代码 | 大小(MB) | 块数 |",
+        "|------|------|----------|------|",
+    ])
+    for row in result["top_allocators"]:
+        code = row["code"].replace("|", "\\|")
+        lines.append(f"| `{row['location']}` | `{code}` | {_fmt(row['size_mb'])} | {row['count']} |")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,154 @@
+"""
+基准计时
+
+对同一份语料分别计时：
+- parse: MarkdownParser.parse
+- extract_keywords: MarkdownParser.extract_keywords
+- 各引擎: rules.metadata / rules.structure / rules.keyword / intent /
+  content_depth / eeat / ai_search / links
+- analyze_directory: 端到端批量分析（禁用AI，不含CWV）
+
+每项重复repeat次，记录每次遍历整份语料的耗时，输出JSON结果。
+"""
+from __future__ import annotations
+
+import contextlib
+import io
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from md_audit.analyzer import MarkdownSEOAnalyzer
+from md_audit.config import load_config
+
+RESULT_VERSION = 1
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, timeout=5,
+            cwd=Path(__file__).resolve().parent.parent,
+        )
+        return result.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def _summarize(runs: List[float], doc_count: int) -> Dict[str, object]:
+    runs_ms = [round(r * 1000, 3) for r in runs]
+    median = statistics.median(runs_ms)
+    return {
+        "runs_ms": runs_ms,
+        "min_ms": min(runs_ms),
+        "median_ms": round(median, 3),
+        "mean_ms": round(statistics.mean(runs_ms), 3),
+        "max_ms": max(runs_ms),
+        "per_doc_ms": round(median / doc_count, 4) if doc_count else 0.0,
+    }
+
+
+def _time_runs(fn: Callable[[], None], repeat: int) -> List[float]:
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        runs.append(time.perf_counter() - start)
+    return runs
+
+
+def build_analyzer(config_path: Optional[str] = None) -> MarkdownSEOAnalyzer:
+    """构造基准用分析器（禁用AI，屏蔽初始化告警输出）"""
+    config = load_config(config_path)
+    config.enable_ai_analysis = False
+    with contextlib.redirect_stdout(io.StringIO()):
+        return MarkdownSEOAnalyzer(config)
+
+
+def run_suite(
+    corpus_dir: Path,
+    repeat: int = 3,
+    workers: int = 4,
+    only: Optional[List[str]] = None,
+    config_path: Optional[str] = None,
+) -> Dict[str, object]:
+    """
+    运行基准套件
+
+    Args:
+        corpus_dir: 语料目录
+        repeat: 每项重复次数
+        workers: analyze_directory 并发线程数
+        only: 仅运行指定基准项（名称前缀匹配）
+        config_path: 配置文件路径（可选）
+
+    Returns:
+        JSON可序列化的结果字典
+    """
+    files = sorted(str(p) for p in Path(corpus_dir).rglob("*.md"))
+    if not files:
+        raise FileNotFoundError(f"语料目录中没有.md文件: {corpus_dir}")
+
+    analyzer = build_analyzer(config_path)
+    parser = analyzer.parser
+    max_keywords = analyzer.config.keywords.max_auto_keywords
+
+    # 预热（jieba词典加载等一次性开销不计入结果）
+    warm = parser.parse(files[0])
+    parser.extract_keywords(warm.raw_content, max_keywords=max_keywords)
+
+    parsed_docs = [parser.parse(f) for f in files]
+    keywords = [parser.extract_keywords(p.raw_content, max_keywords=max_keywords) for p in parsed_docs]
+    pairs = list(zip(parsed_docs, keywords))
+
+    rules = analyzer.rules_engine
+    benchmarks: Dict[str, Callable[[], None]] = {
+        "parse": lambda: [parser.parse(f) for f in files],
+        "extract_keywords": lambda: [
+            parser.extract_keywords(p.raw_content, max_keywords=max_keywords) for p in parsed_docs
+        ],
+        "rules.metadata": lambda: [rules.run_metadata(p) for p in parsed_docs],
+        "rules.structure": lambda: [rules.run_structure(p) for p in parsed_docs],
+        "rules.keyword": lambda: [rules.run_keyword(p, kw) for p, kw in pairs],
+        "intent": lambda: [analyzer.intent_analyzer.analyze(p) for p in parsed_docs],
+        "content_depth": lambda: [analyzer.content_depth_analyzer.analyze(p) for p in parsed_docs],
+        "eeat": lambda: [analyzer.eeat_analyzer.analyze(p) for p in parsed_docs],
+        "ai_search": lambda: [analyzer.ai_search_optimizer.analyze(p) for p in parsed_docs],
+        "links": lambda: [analyzer.link_analyzer.analyze(p.links, p.word_count) for p in parsed_docs],
+    }
+
+    def run_directory():
+        with contextlib.redirect_stdout(io.StringIO()):
+            analyzer.analyze_directory(str(corpus_dir), max_workers=workers, show_progress=False)
+
+    benchmarks["analyze_directory"] = run_directory
+
+    results: Dict[str, object] = {}
+    for name, fn in benchmarks.items():
+        if only and not any(name.startswith(prefix) for prefix in only):
+            continue
+        print(f"  {name} ...", file=sys.stderr, flush=True)
+        results[name] = _summarize(_time_runs(fn, repeat), len(files))
+
+    total_bytes = sum(os.path.getsize(f) for f in files)
+    return {
+        "version": RESULT_VERSION,
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "corpus": {"dir": str(corpus_dir), "files": len(files), "bytes": total_bytes},
+            "repeat": repeat,
+            "workers": workers,
+        },
+        "results": results,
+    }
@@ -0,0 +1,97 @@
+"""
+报告序列化对比
+
+以真实分析报告为模板，将诊断项循环扩充到指定条数，对比报告编码为JSON字节的耗时：
+- fastapi-default: model_dump + jsonable_encoder + json.dumps（路由返回模型时FastAPI的默认路径）
+- history-indent: model_dump + json.dumps(indent=2)（历史记录原存储方式）
+- model_dump_json: Pydantic内置JSON序列化
+- fast_json(model): md_audit.utils.fast_json 直接序列化SEOReport（pydantic-core）
+- fast_json(dict): 已有 model_dump 字典时经 orjson 序列化（历史记录/分析接口路径）
+- msgspec(dict): 安装了msgspec时额外对比
+"""
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+import statistics
+import time
+from pathlib import Path
+from typing import Callable, Dict
+
+from md_audit.models.data_models import SEOReport
+from md_audit.utils import fast_json
+
+RESULT_VERSION = 1
+
+
+def build_report(analyzer, corpus_dir: Path, diagnostics: int) -> SEOReport:
+    """分析语料中的第一篇文档，并将其诊断项循环扩充到指定条数"""
+    path = next(iter(sorted(Path(corpus_dir).rglob("*.md"))))
+    with contextlib.redirect_stdout(io.StringIO()):
+        report = analyzer.analyze(str(path))
+    items = report.diagnostics
+    expanded = [items[i % len(items)] for i in range(diagnostics)] if items else []
+    return report.model_copy(update={"diagnostics": expanded})
+
+
+def _encoders(report: SEOReport) -> Dict[str, Callable[[], bytes]]:
+    report_dict = report.model_dump()
+    encoders: Dict[str, Callable[[], bytes]] = {}
+    try:
+        from fastapi.encoders import jsonable_encoder
+        encoders["fastapi-default"] = lambda: json.dumps(jsonable_encoder(report.model_dump())).encode("utf-8")
+    except ImportError:
+        pass
+    encoders["history-indent"] = lambda: json.dumps(report.model_dump(), ensure_ascii=False, indent=2).encode("utf-8")
+    encoders["model_dump_json"] = lambda: report.model_dump_json().encode("utf-8")
+    encoders["fast_json(model)"] = lambda: fast_json.dumps(report)
+    encoders["fast_json(dict)"] = lambda: fast_json.dumps(report_dict)
+    try:
+        import msgspec
+        encoders["msgspec(dict)"] = lambda: msgspec.json.encode(report_dict)
+    except ImportError:
+        pass
+    return encoders
+
+
+def run(report: SEOReport, repeat: int = 200) -> Dict[str, object]:
+    """对比各编码路径，每项执行repeat次取单次耗时中位数"""
+    rows = {}
+    for name, encode in _encoders(report).items():
+        payload = encode()  # 预热
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            encode()
+            samples.append(time.perf_counter() - start)
+        rows[name] = {
+            "median_us": round(statistics.median(samples) * 1e6, 1),
+            "min_us": round(min(samples) * 1e6, 1),
+            "bytes": len(payload),
+        }
+    return {
+        "version": RESULT_VERSION,
+        "diagnostics": len(report.diagnostics),
+        "repeat": repeat,
+        "orjson": fast_json.HAS_ORJSON,
+        "encoders": rows,
+    }
+
+
+def format_report(result: Dict[str, object]) -> str:
+    """输出Markdown对比报告"""
+    lines = [
+        "# 报告序列化对比",
+        "",
+        f"- 诊断项: {result['diagnostics']} 条，重复 {result['repeat']} 次，"
+        f"orjson: {'已安装' if result['orjson'] else '未安装'}",
+        "",
+        "| 编码路径 | 中位数(µs) | 最小(µs) | 字节数 | 相对fastapi-default |",
+        "|----------|------------|----------|--------|---------------------|",
+    ]
+    base = result["encoders"].get("fastapi-default", {}).get("median_us")
+    for name, row in result["encoders"].items():
+        speedup = f"{base / row['median_us']:.1f}x" if base and row["median_us"] else "-"
+        lines.append(f"| `{name}` | {row['median_us']:.1f} | {row['min_us']:.1f} | {row['bytes']} | {speedup} |")
+    return "\n".join(lines)
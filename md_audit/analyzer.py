@@ -1,54 +1,154 @@
+from __future__ import annotations
+
+import time
+import threading
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import List, Optional
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Sequence, Union
+from md_audit import engines
 from md_audit.parsers.markdown_parser import MarkdownParser
-from md_audit.engines import (
-    RulesEngine,
-    AIEngine,
-    CoreWebVitalsAnalyzer,
-    ContentDepthAnalyzer,
-    EEATAnalyzer,
-    AISearchOptimizer,
-    LinkAnalyzer,
-    IntentAnalyzer,
+from md_audit.config import CompiledConfig, MarkdownSEOConfig, compile_config
+from md_audit.utils.metrics import STAGE_LATENCY
+from md_audit.utils.file_walker import FileWalker, MARKDOWN_EXTENSIONS
+
+if TYPE_CHECKING:
+    from md_audit.corpus import CorpusAuditor
+    from md_audit.corpus.tfidf import DocumentFrequency
+    from md_audit.models.data_models import SEOReport, StageTiming
+    from md_audit.parsers.section_cache import SectionCache
+
+# CWV分析器尚未探测Lighthouse的占位值（探测结果可能为None，需与之区分）
+_CWV_UNPROBED = object()
+
+# 超大文件流式解析时，读取抽样正文（raw_content/html_content）的检查阶段
+SAMPLED_STAGES = (
+    "keywords", "rules.structure", "rules.keyword", "intent",
+    "content_depth", "eeat", "ai_search", "ai",
 )
-from md_audit.models.data_models import SEOReport
-from md_audit.config import MarkdownSEOConfig
+
+# 目录批量分析时每个工作线程最多对应的已提交未完成任务数（超出时先收取完成的结果再继续遍历）
+IN_FLIGHT_PER_WORKER = 4
+
+
+class _LazyEngine:
+    """
+    分析引擎属性：首次访问时导入并以编译后的配置构造，之后缓存在实例上
+
+    引擎模块导入 pydantic 模型等依赖，构造推迟到首次分析，CLI在此之前即可输出进度
+    """
+
+    def __init__(self, class_name: str):
+        self.class_name = class_name
+
+    def __set_name__(self, owner, name: str):
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        with instance._engine_lock:
+            engine = instance.__dict__.get(self.name)
+            if engine is None:
+                engine = getattr(engines, self.class_name)(instance.compiled)
+                instance.__dict__[self.name] = engine
+        return engine
 
 
 class MarkdownSEOAnalyzer:
     """Markdown SEO分析协调器（2025 SEO标准）"""
 
-    def __init__(self, config: MarkdownSEOConfig):
-        self.config = config
-        self.parser = MarkdownParser()
-        self.rules_engine = RulesEngine(config)
-        self.content_depth_analyzer = ContentDepthAnalyzer(config)
-        self.eeat_analyzer = EEATAnalyzer(config)
-        self.ai_search_optimizer = AISearchOptimizer(config)
-        self.link_analyzer = LinkAnalyzer(config)
-        self.intent_analyzer = IntentAnalyzer(config)
+    rules_engine = _LazyEngine("RulesEngine")
+    content_depth_analyzer = _LazyEngine("ContentDepthAnalyzer")
+    eeat_analyzer = _LazyEngine("EEATAnalyzer")
+    ai_search_optimizer = _LazyEngine("AISearchOptimizer")
+    link_analyzer = _LazyEngine("LinkAnalyzer")
+    intent_analyzer = _LazyEngine("IntentAnalyzer")
+
+    def __init__(
+        self,
+        config: Union[MarkdownSEOConfig, CompiledConfig],
+        reuse: Optional['MarkdownSEOAnalyzer'] = None
+    ):
+        """
+        Args:
+            config: 配置或已编译的配置计划
+            reuse: 旧分析器（热加载时传入）。复用其CWV探测结果，
+                LLM配置未变时复用其AI引擎，避免重复探测Lighthouse与创建客户端
+
+        规则等分析引擎在首次分析时构造；AI引擎仅在启用时导入（openai）；
+        CWV分析器在首次提供CWV URL时才探测Lighthouse
+        """
+        # 配置只编译一次，各引擎共享同一份只读计划
+        self.compiled = compile_config(config)
+        self.config = config = self.compiled.config
+        self.parser = MarkdownParser(config.large_files)
+        self._engine_lock = threading.Lock()
 
         # AI引擎可选（如果配置禁用或API key未设置）
         self.ai_engine = None
-        if config.enable_ai_analysis and config.llm_api_key:
-            try:
-                self.ai_engine = AIEngine(config)
-            except ValueError as e:
-                print(f"[警告] AI引擎初始化失败：{e}")
+        if self.compiled.ai_enabled:
+            if (reuse is not None and reuse.ai_engine is not None
+                    and reuse.compiled.llm_settings == self.compiled.llm_settings):
+                self.ai_engine = reuse.ai_engine
+            else:
+                try:
+                    from md_audit.engines.ai_engine import AIEngine
+                    self.ai_engine = AIEngine(config)
+                except ValueError as e:
+                    print(f"[警告] AI引擎初始化失败：{e}")
+
+        # CWV分析器可选（Lighthouse可能未安装；探测结果与配置无关，热加载时直接复用）
+        self._cwv_analyzer = reuse._cwv_analyzer if reuse is not None else _CWV_UNPROBED
+        self._cwv_lock = threading.Lock()
+
+    @property
+    def cwv_analyzer(self):
+        """CWV分析器（首次访问时探测Lighthouse，不可用时为None）"""
+        if self._cwv_analyzer is _CWV_UNPROBED:
+            with self._cwv_lock:
+                if self._cwv_analyzer is _CWV_UNPROBED:
+                    from md_audit.engines.cwv_analyzer import CoreWebVitalsAnalyzer
+                    try:
+                        self._cwv_analyzer = CoreWebVitalsAnalyzer()
+                    except RuntimeError as e:
+                        print(f"[警告] CWV分析器初始化失败：{e}")
+                        self._cwv_analyzer = None
+        return self._cwv_analyzer
+
+    @contextmanager
+    def _stage(self, name: str, timings: Optional[List[StageTiming]] = None):
+        """
+        记录单个分析阶段耗时
 
-        # CWV分析器可选（Lighthouse可能未安装）
-        self.cwv_analyzer = None
+        始终输出到 /metrics 的阶段直方图；传入timings列表时（--profile模式）
+        额外记录墙钟与当前线程CPU耗时（thread_time，避免统计到其他工作线程）
+        """
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
         try:
-            self.cwv_analyzer = CoreWebVitalsAnalyzer()
-        except RuntimeError as e:
-            print(f"[警告] CWV分析器初始化失败：{e}")
+            yield
+        finally:
+            wall = time.perf_counter() - wall_start
+            STAGE_LATENCY.observe(wall, stage=name)
+            if timings is not None:
+                from md_audit.models.data_models import StageTiming
+                timings.append(StageTiming(
+                    stage=name,
+                    wall_ms=round(wall * 1000, 3),
+                    cpu_ms=round((time.thread_time() - cpu_start) * 1000, 3)
+                ))
 
     def analyze(
         self,
         file_path: str,
         user_keywords: list[str] = None,
-        cwv_url: Optional[str] = None
+        cwv_url: Optional[str] = None,
+        profile: bool = False,
+        collect_features: bool = False,
+        document_frequency: Optional['DocumentFrequency'] = None,
+        text: Optional[str] = None,
+        sections: Optional['SectionCache'] = None
     ) -> SEOReport:
         """
         分析Markdown文件（2025 SEO标准）
@@ -57,6 +157,11 @@ class MarkdownSEOAnalyzer:
             file_path: Markdown文件路径
             user_keywords: 用户提供的关键词（可选）
             cwv_url: Core Web Vitals评估URL（可选，需Lighthouse）
+            profile: 是否记录各阶段耗时并附加到报告（report.profile）
+            collect_features: 是否采集站点级检查所需的文档特征（report.corpus_features）
+            document_frequency: 语料文档频率表（传入时自动提取的关键词按TF-IDF排序）
+            text: 文档内容（如编辑器缓冲区）；给出时不读取文件，file_path 仅用作报告中的路径
+            sections: 该文档的分段解析缓存（需同时给出text），只重新解析内容变化的章节
 
         Returns:
             完整的SEO诊断报告
@@ -67,8 +172,18 @@ class MarkdownSEOAnalyzer:
         - Core Web Vitals: 15分（可选，需提供URL）
         - AI内容质量: 15分（可选，需API密钥）
         """
+        timings: Optional[List[StageTiming]] = [] if profile else None
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+
         # Step 1: 解析Markdown
-        parsed = self.parser.parse(file_path)
+        with self._stage("parse", timings):
+            if text is None:
+                parsed = self.parser.parse(file_path)
+            elif sections is not None:
+                parsed = sections.parse(text)
+            else:
+                parsed = self.parser.parse_text(text)
 
         # Step 2: 确定关键词
         if user_keywords:
@@ -76,26 +191,38 @@ class MarkdownSEOAnalyzer:
             extracted = []
         else:
             # 自动提取
-            keywords = self.parser.extract_keywords(
-                parsed.raw_content,
-                max_keywords=self.config.keywords.max_auto_keywords
-            )
+            with self._stage("keywords", timings):
+                keywords = self.parser.extract_keywords(
+                    parsed.raw_content,
+                    max_keywords=self.config.keywords.max_auto_keywords,
+                    idf=document_frequency.idf if document_frequency is not None else None,
+                    frequencies=(sections.keyword_frequencies(parsed.raw_content)
+                                 if text is not None and sections is not None else None)
+                )
             extracted = keywords
 
         diagnostics = []
 
         # Step 3: 运行基础规则（元数据/结构/关键词）
-        meta_score_raw, meta_diags = self.rules_engine.run_metadata(parsed)
-        structure_raw, structure_diags = self.rules_engine.run_structure(parsed)
-        keyword_raw, keyword_diags = self.rules_engine.run_keyword(parsed, keywords)
+        with self._stage("rules.metadata", timings):
+            meta_score_raw, meta_diags = self.rules_engine.run_metadata(parsed)
+        with self._stage("rules.structure", timings):
+            structure_raw, structure_diags = self.rules_engine.run_structure(parsed)
+        with self._stage("rules.keyword", timings):
+            keyword_raw, keyword_diags = self.rules_engine.run_keyword(parsed, keywords)
         diagnostics.extend(meta_diags + structure_diags + keyword_diags)
 
         # Step 4: 搜索意图、内容深度、E-E-A-T、AI搜索、链接质量
-        intent_res = self.intent_analyzer.analyze(parsed)
-        content_depth = self.content_depth_analyzer.analyze(parsed)
-        eeat = self.eeat_analyzer.analyze(parsed)
-        ai_search = self.ai_search_optimizer.analyze(parsed)
-        links = self.link_analyzer.analyze(parsed.links, parsed.word_count)
+        with self._stage("intent", timings):
+            intent_res = self.intent_analyzer.analyze(parsed)
+        with self._stage("content_depth", timings):
+            content_depth = self.content_depth_analyzer.analyze(parsed)
+        with self._stage("eeat", timings):
+            eeat = self.eeat_analyzer.analyze(parsed)
+        with self._stage("ai_search", timings):
+            ai_search = self.ai_search_optimizer.analyze(parsed)
+        with self._stage("links", timings):
+            links = self.link_analyzer.analyze(parsed.links, parsed.word_count, parsed.source_map)
         diagnostics.extend(
             intent_res["diagnostics"]
             + content_depth["diagnostics"]
@@ -107,39 +234,59 @@ class MarkdownSEOAnalyzer:
         # Step 5: CWV（可选，不计入100分）
         cwv_score = 0.0
         if cwv_url and self.cwv_analyzer:
-            cwv_score = self.cwv_analyzer.analyze(cwv_url, diagnostics)
+            with self._stage("cwv", timings):
+                cwv_score = self.cwv_analyzer.analyze(cwv_url, diagnostics)
 
         # Step 6: AI 语义（满分10）
         ai_result = None
         ai_score = 0.0
         if self.ai_engine:
-            ai_result = self.ai_engine.analyze(parsed, keywords)
+            with self._stage("ai", timings):
+                ai_result = self.ai_engine.analyze(parsed, keywords)
             original_ai_score = self.ai_engine.calculate_ai_score(ai_result)  # 0-40
-            ai_score = (original_ai_score / 40) * self.config.score_weights.ai_semantic
+            ai_score = self.compiled.scale("ai_semantic", original_ai_score)
 
         # Step 7: 权重归一化到新100分体系（Schema已移除）
-        weights = self.config.score_weights
-        metadata_score = min(weights.metadata, (meta_score_raw / 25) * weights.metadata)
-        structure_core = (structure_raw / 22) * (weights.structure - 3)  # 预留3分给链接
-        structure_score = min(weights.structure, structure_core + links["total_link_score"])
-        keyword_score = min(weights.keywords, (keyword_raw / 8) * weights.keywords)
-        content_depth_score = min(weights.content_depth, content_depth["total_depth_score"])
-        eeat_score = min(weights.eeat, eeat["total_eeat_score"])
-        ai_search_score = min(weights.ai_search, ai_search["total_geo_score"])
-        intent_score = min(weights.intent, intent_res["intent_score"])
-
-        total_score = (
-            metadata_score
-            + intent_score
-            + content_depth_score
-            + eeat_score
-            + structure_score
-            + ai_search_score
-            + keyword_score
-            + ai_score
-        )
+        with self._stage("scoring", timings):
+            plan = self.compiled
+            weights = plan.score_weights
+            metadata_score = min(weights["metadata"], plan.scale("metadata", meta_score_raw))
+            structure_core = plan.scale("structure", structure_raw)  # 已预留3分给链接
+            structure_score = min(weights["structure"], structure_core + links["total_link_score"])
+            keyword_score = min(weights["keywords"], plan.scale("keywords", keyword_raw))
+            content_depth_score = min(weights["content_depth"], content_depth["total_depth_score"])
+            eeat_score = min(weights["eeat"], eeat["total_eeat_score"])
+            ai_search_score = min(weights["ai_search"], ai_search["total_geo_score"])
+            intent_score = min(weights["intent"], intent_res["intent_score"])
+
+            total_score = (
+                metadata_score
+                + intent_score
+                + content_depth_score
+                + eeat_score
+                + structure_score
+                + ai_search_score
+                + keyword_score
+                + ai_score
+            )
 
-        return SEOReport(
+        sampled_checks = []
+        if parsed.sampled:
+            skipped = {"keywords"} if user_keywords else set()
+            if not self.ai_engine:
+                skipped.add("ai")
+            sampled_checks = [stage for stage in SAMPLED_STAGES if stage not in skipped]
+
+        from md_audit.models.data_models import SEOReport, StageTiming
+
+        if timings is not None:
+            timings.append(StageTiming(
+                stage="total",
+                wall_ms=round((time.perf_counter() - wall_start) * 1000, 3),
+                cpu_ms=round((time.thread_time() - cpu_start) * 1000, 3)
+            ))
+
+        report = SEOReport(
             file_path=file_path,
             total_score=round(total_score, 1),
             metadata_score=round(metadata_score, 1),
@@ -157,98 +304,121 @@ class MarkdownSEOAnalyzer:
             ai_analysis=ai_result,
             extracted_keywords=extracted,
             user_keywords=user_keywords or [],
-            cwv_url=cwv_url
+            cwv_url=cwv_url,
+            sampled_checks=sampled_checks,
+            profile=timings
         )
+        if collect_features:
+            from md_audit.corpus.features import extract_features
+            report.corpus_features = extract_features(parsed, self.parser)
+        return report
 
     def analyze_directory(
         self,
         directory: str,
         user_keywords: Optional[List[str]] = None,
         max_workers: int = 4,
-        show_progress: bool = True
+        show_progress: bool = True,
+        profile: bool = False,
+        extensions: Sequence[str] = MARKDOWN_EXTENSIONS,
+        include: Sequence[str] = (),
+        exclude: Sequence[str] = (),
+        use_gitignore: bool = True,
+        corpus: Optional['CorpusAuditor'] = None,
+        document_frequency: Optional['DocumentFrequency'] = None,
+        on_report: Optional[Callable[[SEOReport], SEOReport]] = None
     ) -> List[SEOReport]:
         """
         批量分析目录中的所有Markdown文件
 
+        文件边遍历边提交到线程池，首批文件在目录树扫描完成前即开始分析；已提交未完成的任务
+        达到上限（工作线程数 × IN_FLIGHT_PER_WORKER）时先收取完成的结果再继续遍历
+
         Args:
             directory: 目录路径
             user_keywords: 用户提供的关键词（应用于所有文件）
             max_workers: 并发工作线程数
             show_progress: 是否显示进度条（文件数>10时）
+            profile: 是否为每个报告记录各阶段耗时
+            extensions: 分析的文件扩展名（默认 .md、.markdown）
+            include: 包含规则（gitignore语法，非空时只分析匹配的文件）
+            exclude: 排除规则（gitignore语法）
+            use_gitignore: 是否遵循目录中的 .gitignore
+            corpus: 站点级检查（报告完成时逐个加入，汇总前由调用方 finalize）
+            document_frequency: 语料文档频率表（TF-IDF关键词模式，见 md_audit.corpus.tfidf）
+            on_report: 每个报告完成时在主线程中调用（加入 corpus 之后），返回值代替原报告
+                保存在结果列表中（流式输出可返回去掉诊断的精简副本以节省内存）
 
         Returns:
             所有文件的SEO报告列表
         """
-        # 递归查找所有.md文件
         dir_path = Path(directory)
         if not dir_path.exists():
             raise FileNotFoundError(f"目录不存在: {directory}")
         if not dir_path.is_dir():
             raise NotADirectoryError(f"路径不是目录: {directory}")
 
-        md_files = list(dir_path.rglob("*.md"))
-        if not md_files:
-            print(f"警告：目录 {directory} 中未找到.md文件")
-            return []
-
-        print(f"找到 {len(md_files)} 个Markdown文件")
-
-        # 判断是否需要进度条
-        use_progress = show_progress and len(md_files) > 10
+        md_files = FileWalker(
+            str(dir_path), extensions, include=include, exclude=exclude, use_gitignore=use_gitignore
+        )
 
-        # 并发处理
         reports = []
         failed_files = []
+        progress = None
+        task = None
+        in_flight: Dict[Future, str] = {}
 
-        if use_progress:
+        def collect(future: Future) -> None:
+            # 取出后不再引用已完成的future（其结果即完整报告），流式输出时内存不随文件数增长
+            file = in_flight.pop(future)
             try:
-                from rich.progress import Progress, TaskID
-                with Progress() as progress:
-                    task = progress.add_task("[cyan]分析中...", total=len(md_files))
-
-                    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                        future_to_file = {
-                            executor.submit(self._analyze_safe, str(file), user_keywords): file
-                            for file in md_files
-                        }
-
-                        for future in as_completed(future_to_file):
-                            file = future_to_file[future]
-                            try:
-                                report = future.result()
-                                if report:
-                                    reports.append(report)
-                                else:
-                                    failed_files.append(str(file))
-                            except Exception as e:
-                                print(f"[错误] 处理文件 {file} 失败: {e}")
-                                failed_files.append(str(file))
-                            finally:
-                                progress.update(task, advance=1)
-            except ImportError:
-                # rich未安装，回退到无进度条模式
-                print("[警告] rich库未安装，无法显示进度条（pip install rich）")
-                use_progress = False
-
-        if not use_progress:
-            # 无进度条模式
-            with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                future_to_file = {
-                    executor.submit(self._analyze_safe, str(file), user_keywords): file
-                    for file in md_files
-                }
-
-                for future in as_completed(future_to_file):
-                    file = future_to_file[future]
-                    try:
-                        report = future.result()
-                        if report:
-                            reports.append(report)
-                        else:
-                            failed_files.append(str(file))
-                    except Exception as e:
-                        print(f"[错误] 处理文件 {file} 失败: {e}")
-                        failed_files.append(str(file))
+                report = future.result()
+                if report:
+                    reports.append(report)
+                    if corpus is not None:
+                        corpus.add(report)
+                    if on_report is not None:
+                        reports[-1] = on_report(report)
+                else:
+                    failed_files.append(file)
+            except Exception as e:
+                print(f"[错误] 处理文件 {file} 失败: {e}")
+                failed_files.append(file)
+            finally:
+                if progress is not None:
+                    progress.update(task, advance=1)
+
+        # 未完成任务数有上限：遍历中途即收取结果（on_report/corpus 立即处理），超大目录不会堆积已完成的报告
+        window = max(1, max_workers) * IN_FLIGHT_PER_WORKER
+        discovered = 0
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            try:
+                for file in md_files:
+                    in_flight[executor.submit(self._analyze_safe, file, user_keywords, profile,
+                                              corpus is not None, document_frequency)] = file
+                    discovered += 1
+                    # 文件数超过10时显示进度条（总数随遍历增长）
+                    if show_progress and discovered > 10:
+                        if progress is None:
+                            progress, task = self._start_progress()
+                            show_progress = progress is not None
+                        if progress is not None:
+                            progress.update(task, total=discovered)
+                    if len(in_flight) >= window:
+                        done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            collect(future)
+
+                if not discovered:
+                    print(f"警告：目录 {directory} 中未找到Markdown文件（{'/'.join(md_files.extensions)}）")
+                    return []
+                print(f"找到 {discovered} 个Markdown文件")
+
+                for future in as_completed(in_flight):
+                    collect(future)
+            finally:
+                if progress is not None:
+                    progress.stop()
 
         # 输出统计
         print(f"\n✅ 成功分析: {len(reports)} 个文件")
@@ -261,10 +431,69 @@ class MarkdownSEOAnalyzer:
 
         return reports
 
+    @staticmethod
+    def _start_progress():
+        """启动进度条；rich未安装时返回 (None, None)"""
+        try:
+            from rich.progress import Progress
+        except ImportError:
+            print("[警告] rich库未安装，无法显示进度条（pip install rich）")
+            return None, None
+        progress = Progress()
+        task = progress.add_task("[cyan]分析中...", total=None)
+        progress.start()
+        return progress, task
+
+    def analyze_files(
+        self,
+        file_paths: List[str],
+        user_keywords: Optional[List[str]] = None,
+        max_workers: int = 4,
+        profile: bool = False,
+        corpus: Optional['CorpusAuditor'] = None,
+        document_frequency: Optional['DocumentFrequency'] = None,
+        on_report: Optional[Callable[[SEOReport], SEOReport]] = None
+    ) -> Dict[str, Optional[SEOReport]]:
+        """
+        并发分析指定文件（不遍历目录，供监听模式与增量分析使用）
+
+        Args:
+            file_paths: 文件路径列表
+            user_keywords: 用户关键词（应用于所有文件）
+            max_workers: 并发工作线程数
+            profile: 是否为每个报告记录各阶段耗时
+            corpus: 站点级检查（成功的报告按完成顺序加入）
+            document_frequency: 语料文档频率表（TF-IDF关键词模式）
+            on_report: 每个报告完成时在主线程中调用（加入 corpus 之后），返回值代替原报告
+                保存在结果中（同 analyze_directory）
+
+        Returns:
+            {文件路径: SEO报告}，分析失败的文件值为None（顺序与输入一致）
+        """
+        if not file_paths:
+            return {}
+        results: Dict[str, Optional[SEOReport]] = dict.fromkeys(file_paths)
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(file_paths)))) as executor:
+            future_to_file = {executor.submit(self._analyze_safe, path, user_keywords, profile,
+                                              corpus is not None, document_frequency): path
+                              for path in file_paths}
+            for future in as_completed(future_to_file):
+                path = future_to_file.pop(future)
+                report = future.result()
+                if report is None:
+                    continue
+                if corpus is not None:
+                    corpus.add(report)
+                results[path] = on_report(report) if on_report is not None else report
+        return results
+
     def _analyze_safe(
         self,
         file_path: str,
-        user_keywords: Optional[List[str]] = None
+        user_keywords: Optional[List[str]] = None,
+        profile: bool = False,
+        collect_features: bool = False,
+        document_frequency: Optional['DocumentFrequency'] = None
     ) -> Optional[SEOReport]:
         """
         安全分析单个文件（捕获异常，返回None而非抛出）
@@ -272,12 +501,16 @@ class MarkdownSEOAnalyzer:
         Args:
             file_path: 文件路径
             user_keywords: 用户关键词
+            profile: 是否记录各阶段耗时
+            collect_features: 是否采集文档特征
+            document_frequency: 语料文档频率表
 
         Returns:
             SEO报告或None（失败时）
         """
         try:
-            return self.analyze(file_path, user_keywords)
+            return self.analyze(file_path, user_keywords, profile=profile, collect_features=collect_features,
+                                document_frequency=document_frequency)
         except FileNotFoundError:
             print(f"[跳过] 文件不存在: {file_path}")
             return None
@@ -3,9 +3,13 @@ MD Audit 配置系统 - 2025 SEO Standards
 基于 Ahrefs, SEMrush, Backlinko 权威标准
 """
 import os
+import re
+import copy
 import json
+import hashlib
 from dataclasses import dataclass, asdict, field
-from typing import Optional, List
+from types import MappingProxyType
+from typing import Optional, List, Mapping, Pattern, Tuple, Union
 from pathlib import Path
 
 # 自动加载.env文件
@@ -173,6 +177,24 @@ class ContentDepthRules:
     evidence_min_data_points: int = 2
 
 
+@dataclass
+class LargeFileRules:
+    """
+    超大文件分级配置
+
+    - 小于 streaming_threshold_bytes：完整解析
+    - 不小于阈值：流式解析。frontmatter、标题大纲、链接/图片与字数完整统计，
+      正文按 sample_budget_bytes 抽样（开头、均匀抽取的中间章节、结尾）
+      供关键词/意图/深度/E-E-A-T/AI搜索等正文类检查使用
+    """
+    enabled: bool = True
+    streaming_threshold_bytes: int = 2 * 1024 * 1024
+    sample_budget_bytes: int = 200 * 1024
+    sample_chunk_bytes: int = 8 * 1024
+    head_ratio: float = 0.5
+    tail_ratio: float = 0.2
+
+
 @dataclass
 class ScoreWeights:
     """
@@ -202,6 +224,7 @@ class MarkdownSEOConfig:
     ai_search: AISearchRules = None
     intent: IntentRules = None
     content_depth: ContentDepthRules = None
+    large_files: LargeFileRules = None
     score_weights: ScoreWeights = None
 
     # LLM配置
@@ -232,6 +255,8 @@ class MarkdownSEOConfig:
             self.intent = IntentRules()
         if self.content_depth is None:
             self.content_depth = ContentDepthRules()
+        if self.large_files is None:
+            self.large_files = LargeFileRules()
         if self.score_weights is None:
             self.score_weights = ScoreWeights()
 
@@ -269,6 +294,7 @@ class MarkdownSEOConfig:
             ai_search=AISearchRules(**filter_comments(data.get('ai_search_rules', {}))),
             intent=IntentRules(**filter_comments(data.get('intent_rules', {}))) if data.get('intent_rules') else IntentRules(),
             content_depth=ContentDepthRules(**filter_comments(data.get('content_depth_rules', {}))),
+            large_files=LargeFileRules(**filter_comments(data.get('large_file_rules', {}))),
             score_weights=ScoreWeights(**filter_comments(data.get('score_weights', {}))) if data.get('score_weights') else ScoreWeights(),
             llm_api_key=data.get('llm_api_key', ''),
             llm_base_url=data.get('llm_base_url', 'https://newapi.deepwisdom.ai/v1'),
@@ -281,9 +307,9 @@ class MarkdownSEOConfig:
         config._apply_env_overrides()
         return config
 
-    def to_json(self, json_path: str):
-        """保存配置到JSON文件"""
-        data = {
+    def to_dict(self) -> dict:
+        """导出为与配置文件结构一致的字典（不含API密钥）"""
+        return {
             'title_rules': asdict(self.title),
             'description_rules': asdict(self.description),
             'keyword_rules': asdict(self.keywords),
@@ -293,6 +319,7 @@ class MarkdownSEOConfig:
             'ai_search_rules': asdict(self.ai_search),
             'intent_rules': asdict(self.intent),
             'content_depth_rules': asdict(self.content_depth),
+            'large_file_rules': asdict(self.large_files),
             'score_weights': asdict(self.score_weights),
             'llm_api_key': '',
             'llm_base_url': self.llm_base_url,
@@ -301,6 +328,10 @@ class MarkdownSEOConfig:
             'llm_max_retries': self.llm_max_retries,
             'enable_ai_analysis': self.enable_ai_analysis,
         }
+
+    def to_json(self, json_path: str):
+        """保存配置到JSON文件"""
+        data = self.to_dict()
         with open(json_path, 'w', encoding='utf-8') as f:
             json.dump(data, f, indent=2, ensure_ascii=False)
 
@@ -315,3 +346,124 @@ def load_config(config_path: Optional[str] = None) -> MarkdownSEOConfig:
         return MarkdownSEOConfig.from_json(str(default_path))
 
     return MarkdownSEOConfig()
+
+
+# 编译计划格式版本：评分逻辑或指纹口径变化时递增，使旧缓存整体失效
+COMPILED_CONFIG_VERSION = 1
+
+# 各维度原始分满分（归一化到 ScoreWeights 对应权重）
+SCORE_RAW_MAX = {
+    'metadata': 25,
+    'structure': 22,
+    'keywords': 8,
+    'ai_semantic': 40,
+}
+
+# 结构维度预留给链接质量的分数
+STRUCTURE_LINK_RESERVE = 3
+
+
+def _digest(data) -> str:
+    """规范化JSON（键排序、紧凑分隔符）的SHA-256"""
+    payload = json.dumps(data, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+@dataclass(frozen=True)
+class CompiledConfig:
+    """
+    编译后的只读配置计划
+
+    由 compile_config 构建一次，供各引擎在初始化时读取：
+    - config: 源配置的深拷贝（编译后修改原配置不影响本计划）
+    - 预编译的正则与词表（意图词、结论标题、总结关键词、劣质锚文本、权威域名）
+    - score_weights / score_normalization: 各维度权重上限，以及原始分满分与可得权重分
+    - fingerprint: 影响分析结果的全部配置项的SHA-256，用作报告缓存（--cache/--since）、
+      守护进程分析器池与Web热加载判断的键
+    """
+    config: MarkdownSEOConfig
+    fingerprint: str
+    score_weights: Mapping[str, float]
+    score_normalization: Mapping[str, Tuple[float, float]]
+    intent_pattern: Pattern
+    conclusion_pattern: Pattern
+    summary_pattern: Optional[Pattern]
+    poor_anchor_texts: Tuple[str, ...]
+    high_authority_domains: Tuple[str, ...]
+
+    @property
+    def ai_enabled(self) -> bool:
+        """AI语义分析是否实际可用（已启用且配置了API密钥）"""
+        return self.config.enable_ai_analysis and bool(self.config.llm_api_key)
+
+    @property
+    def llm_settings(self) -> Tuple:
+        """LLM客户端相关配置（含密钥），用于判断能否复用已创建的AI引擎"""
+        c = self.config
+        return (c.enable_ai_analysis, c.llm_api_key, c.llm_base_url,
+                c.llm_model, c.llm_timeout, c.llm_max_retries)
+
+    def scale(self, dimension: str, raw: float) -> float:
+        """将维度原始分换算为权重分（未截断到上限）"""
+        raw_max, points = self.score_normalization[dimension]
+        # 保持 (raw / 满分) * 权重 的运算顺序，预乘系数会在舍入边界产生差异
+        return (raw / raw_max) * points
+
+
+def compile_config(config: Union[MarkdownSEOConfig, CompiledConfig]) -> CompiledConfig:
+    """
+    编译配置计划（已编译的计划原样返回）
+
+    Args:
+        config: 源配置或已编译的配置计划
+
+    Returns:
+        只读的 CompiledConfig
+    """
+    if isinstance(config, CompiledConfig):
+        return config
+
+    source = copy.deepcopy(config)
+
+    # 指纹：API密钥、超时与重试次数不影响结果，仅记录AI是否实际启用
+    sections = source.to_dict()
+    sections['llm'] = {
+        'base_url': sections.pop('llm_base_url'),
+        'model': sections.pop('llm_model'),
+        'ai_enabled': source.enable_ai_analysis and bool(source.llm_api_key),
+    }
+    for key in ('llm_api_key', 'llm_timeout', 'llm_max_retries', 'enable_ai_analysis'):
+        sections.pop(key)
+    section_fingerprints = {name: _digest(data) for name, data in sections.items()}
+    fingerprint = _digest({'version': COMPILED_CONFIG_VERSION, 'sections': section_fingerprints})
+
+    weights = asdict(source.score_weights)
+    total = sum(weights.values())
+    if abs(total - 100.0) > 1e-6:
+        print(f"[警告] 评分权重合计为 {total:g}，总分将不再是100分制")
+    normalization = {
+        dim: (raw_max, weights[dim] - (STRUCTURE_LINK_RESERVE if dim == 'structure' else 0))
+        for dim, raw_max in SCORE_RAW_MAX.items()
+    }
+
+    intent_rules = source.intent
+    summary_keywords = source.ai_search.summary_keywords
+    return CompiledConfig(
+        config=source,
+        fingerprint=fingerprint,
+        score_weights=MappingProxyType(weights),
+        score_normalization=MappingProxyType(normalization),
+        intent_pattern=re.compile(
+            "|".join(re.escape(w) for w in intent_rules.intent_keywords), re.IGNORECASE
+        ),
+        conclusion_pattern=re.compile(
+            r'^#+\s*(%s)' % "|".join(re.escape(h) for h in intent_rules.conclusion_headings),
+            re.IGNORECASE | re.MULTILINE
+        ),
+        # 总结关键词按正则解释（与原逐个re.search一致），合并为单个交替式
+        summary_pattern=re.compile(
+            "|".join(f"(?:{p})" for p in summary_keywords), re.IGNORECASE
+        ) if summary_keywords else None,
+        poor_anchor_texts=tuple(source.links.poor_anchor_texts),
+        high_authority_domains=tuple(source.eeat.high_authority_domains),
+    )
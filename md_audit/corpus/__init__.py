@@ -0,0 +1,28 @@
+"""
+站点级（语料）检查
+
+单文件分析只能看到一篇文档，这里汇总批量分析的全部结果做跨文档检查。
+"""
+from md_audit.corpus.auditor import CorpusAuditor
+from md_audit.corpus.cannibalization import CannibalizationGroup, KeywordTargetIndex
+from md_audit.corpus.duplicates import DuplicateCluster, DuplicateDetector
+from md_audit.corpus.features import DocumentFeatures, extract_features
+from md_audit.corpus.link_graph import LinkGraph, LinkGraphResult
+from md_audit.corpus.tfidf import DocumentFrequency, build_document_frequency
+from md_audit.corpus.uniqueness import UniquenessConflict, UniquenessIndex
+
+__all__ = [
+    "CannibalizationGroup",
+    "build_document_frequency",
+    "CorpusAuditor",
+    "DocumentFeatures",
+    "DocumentFrequency",
+    "DuplicateCluster",
+    "DuplicateDetector",
+    "extract_features",
+    "KeywordTargetIndex",
+    "LinkGraph",
+    "LinkGraphResult",
+    "UniquenessConflict",
+    "UniquenessIndex",
+]
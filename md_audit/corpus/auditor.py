@@ -0,0 +1,99 @@
+"""
+站点级（语料）检查协调器
+
+批量分析时报告逐个流入 add()（报告需携带 corpus_features），
+全部加入后 finalize() 运行各项跨文档检查，annotate() 把逐页诊断追加到报告，
+summary_lines() 输出汇总章节。
+"""
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+from md_audit.corpus.cannibalization import CannibalizationGroup, KeywordTargetIndex, format_cannibalization
+from md_audit.corpus.duplicates import DEFAULT_THRESHOLD, DuplicateCluster, DuplicateDetector, format_duplicates
+from md_audit.corpus.features import DocumentFeatures
+from md_audit.corpus.link_graph import LinkGraph, LinkGraphResult, format_link_graph
+from md_audit.corpus.uniqueness import UniquenessConflict, UniquenessIndex, format_uniqueness
+from md_audit.models.data_models import DiagnosticItem, SEOReport
+from md_audit.utils.file_walker import MARKDOWN_EXTENSIONS
+
+
+class CorpusAuditor:
+    """
+    Args:
+        root: 分析目录（报告路径以其为前缀）
+        index_page: 首页相对路径（默认自动查找 index/README）
+        extensions: 页面扩展名（与目录遍历一致）
+        duplicate_threshold: 近重复判定的相似度阈值
+    """
+
+    def __init__(self, root: str, index_page: Optional[str] = None,
+                 extensions: Sequence[str] = MARKDOWN_EXTENSIONS,
+                 duplicate_threshold: float = DEFAULT_THRESHOLD):
+        self.root = Path(root)
+        self.link_graph = LinkGraph(str(self.root), index_page, extensions)
+        self.duplicate_detector = DuplicateDetector(duplicate_threshold)
+        self.keyword_targets = KeywordTargetIndex()
+        self.uniqueness_index = UniquenessIndex()
+        self.links: Optional[LinkGraphResult] = None
+        self.duplicates: Optional[List[DuplicateCluster]] = None
+        self.cannibalization: Optional[List[CannibalizationGroup]] = None
+        self.uniqueness: Optional[List[UniquenessConflict]] = None
+
+    def rel_path(self, report: SEOReport) -> str:
+        return Path(report.file_path).relative_to(self.root).as_posix()
+
+    def add(self, report: SEOReport) -> None:
+        """加入一个报告（未携带文档特征的报告忽略）"""
+        features: Optional[DocumentFeatures] = report.corpus_features
+        if features is None:
+            return
+        rel_path = self.rel_path(report)
+        self.link_graph.add_document(rel_path, features.links, features.anchors)
+        self.duplicate_detector.add(rel_path, features.signature)
+        self.keyword_targets.add(rel_path, report.extracted_keywords, report.user_keywords, features.terms)
+        self.uniqueness_index.add(rel_path, features.title, features.description)
+
+    def finalize(self) -> 'CorpusAuditor':
+        self.links = self.link_graph.finalize()
+        self.duplicates = self.duplicate_detector.finalize()
+        self.cannibalization = self.keyword_targets.finalize()
+        self.uniqueness = self.uniqueness_index.finalize()
+        return self
+
+    def page_diagnostics(self, report: SEOReport) -> List[DiagnosticItem]:
+        """finalize 之后，单个报告对应页面的逐页诊断（标题/描述重复等）"""
+        if report.corpus_features is None:
+            return []
+        return self.uniqueness_index.diagnostics_for(self.rel_path(report))
+
+    def annotate(self, reports: Sequence[SEOReport]) -> None:
+        """finalize 之后，把逐页诊断（标题/描述重复等）追加到对应报告（不影响得分）"""
+        for report in reports:
+            items = self.page_diagnostics(report)
+            if items:
+                report.diagnostics.extend(items)
+
+    def document_diagnostics(self) -> Iterator[Tuple[str, List[DiagnosticItem]]]:
+        """finalize 之后的逐页诊断 (相对路径, 诊断)，按路径排序（流式输出不保留完整报告时使用）"""
+        for rel_path in sorted(self.uniqueness_index.paths_with_diagnostics()):
+            yield rel_path, self.uniqueness_index.diagnostics_for(rel_path)
+
+    def summary_lines(self) -> List[str]:
+        """汇总报告中的站点级章节（Markdown行）"""
+        lines: List[str] = []
+        if self.links is not None and self.links.pages:
+            lines.extend(format_link_graph(self.links))
+        if self.duplicates is not None and len(self.duplicate_detector):
+            if lines:
+                lines.append("")
+            lines.extend(format_duplicates(self.duplicates, len(self.duplicate_detector),
+                                           self.duplicate_detector.threshold))
+        if self.uniqueness is not None and len(self.uniqueness_index):
+            if lines:
+                lines.append("")
+            lines.extend(format_uniqueness(self.uniqueness, len(self.uniqueness_index)))
+        if self.cannibalization is not None and len(self.keyword_targets):
+            if lines:
+                lines.append("")
+            lines.extend(format_cannibalization(self.cannibalization, len(self.keyword_targets)))
+        return lines
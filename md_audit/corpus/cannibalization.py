@@ -0,0 +1,174 @@
+"""
+关键词蚕食检测
+
+多个页面以同一关键词为目标时会在搜索结果中相互竞争。报告流入时增量建立
+关键词 -> 页面 的倒排索引，词项来源：
+- 关键词：自动提取的关键词（extracted_keywords）或用户关键词（user_keywords）
+- 标题与H1/H2：按关键词提取相同的分词与质量过滤规则切出单词及双词组合（worker中完成）
+
+页面对某词项的目标强度为各来源权重之和；仅出现在H2中的词项不视为目标。
+被两个及以上页面作为目标的词项即为蚕食词项，页面集合相同的词项合并为一组，
+严重度 = 各词项（强度之和 − 最强页面强度）之和，即除首选页面外其余页面的竞争强度。
+
+批量分析的 -k 关键词作用于全部文件，只来自用户关键词且覆盖全部页面的词项不计。
+"""
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from md_audit.parsers.markdown_parser import MarkdownParser
+
+# 词项来源（位掩码）
+SOURCE_TITLE = 1
+SOURCE_H1 = 2
+SOURCE_H2 = 4
+SOURCE_KEYWORD = 8        # 自动提取的关键词
+SOURCE_USER_KEYWORD = 16  # 用户关键词
+
+SOURCE_WEIGHTS = {
+    SOURCE_TITLE: 3,
+    SOURCE_H1: 2,
+    SOURCE_H2: 1,
+    SOURCE_KEYWORD: 2,
+    SOURCE_USER_KEYWORD: 3,
+}
+SOURCE_LABELS = {
+    SOURCE_TITLE: "标题",
+    SOURCE_H1: "H1",
+    SOURCE_H2: "H2",
+    SOURCE_KEYWORD: "关键词",
+    SOURCE_USER_KEYWORD: "用户关键词",
+}
+
+# 目标强度低于此值（如仅出现在H2中）不视为以该词项为目标
+MIN_TARGET_WEIGHT = 2
+
+# 来源掩码 -> 目标强度（查表，finalize 时逐条使用）
+_MASK_WEIGHTS = tuple(
+    sum(weight for source, weight in SOURCE_WEIGHTS.items() if mask & source)
+    for mask in range(2 * max(SOURCE_WEIGHTS))
+)
+
+
+def source_weight(mask: int) -> int:
+    return _MASK_WEIGHTS[mask]
+
+
+def source_labels(mask: int) -> str:
+    return "/".join(label for source, label in SOURCE_LABELS.items() if mask & source)
+
+
+def heading_terms(parser: 'MarkdownParser', title: str, h1_tags: Sequence[str],
+                  h2_tags: Sequence[str]) -> Dict[str, int]:
+    """标题与H1/H2 -> {词项: 来源掩码}（切分规则与 MarkdownParser.extract_keywords 一致）"""
+    terms: Dict[str, int] = {}
+    for source, texts in ((SOURCE_TITLE, (title,)), (SOURCE_H1, h1_tags), (SOURCE_H2, h2_tags)):
+        for text in texts:
+            if not text:
+                continue
+            words = parser._tokenize(parser._clean_text(text))
+            candidates = list(words)
+            candidates.extend(f"{words[i]}{words[i + 1]}" for i in range(len(words) - 1))
+            for term in candidates:
+                if parser._is_quality_keyword(term):
+                    term = term.strip().lower()
+                    terms[term] = terms.get(term, 0) | source
+    return terms
+
+
+@dataclass
+class CannibalizationGroup:
+    """以相同词项为目标的页面组（路径相对站点根目录）"""
+    terms: List[str]
+    documents: List[Tuple[str, int]]   # (页面, 来源掩码)，按首个词项的目标强度降序
+    severity: int
+
+    @property
+    def primary(self) -> str:
+        """目标强度最高的页面（建议保留为该词项的着陆页）"""
+        return self.documents[0][0]
+
+
+class KeywordTargetIndex:
+    """关键词倒排索引（页面可流式加入，finalize 时按页面集合分组并排序）"""
+
+    def __init__(self):
+        self._paths: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self._postings: Dict[str, Dict[int, int]] = defaultdict(dict)   # 词项 -> {页面id: 来源掩码}
+
+    def add(self, rel_path: str, keywords: Iterable[str] = (), user_keywords: Iterable[str] = (),
+            terms: Optional[Dict[str, int]] = None) -> None:
+        doc = self._ids.get(rel_path)
+        if doc is None:
+            doc = self._ids[rel_path] = len(self._paths)
+            self._paths.append(rel_path)
+        postings = self._postings
+        for term in keywords:
+            term = term.strip().lower()
+            if term:
+                entry = postings[term]
+                entry[doc] = entry.get(doc, 0) | SOURCE_KEYWORD
+        for term in user_keywords:
+            term = term.strip().lower()
+            if term:
+                entry = postings[term]
+                entry[doc] = entry.get(doc, 0) | SOURCE_USER_KEYWORD
+        for term, mask in (terms or {}).items():
+            entry = postings[term]
+            entry[doc] = entry.get(doc, 0) | mask
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def finalize(self) -> List[CannibalizationGroup]:
+        """返回蚕食分组（按严重度降序）"""
+        total = len(self._paths)
+        weight_of = _MASK_WEIGHTS
+        grouped: Dict[Tuple[int, ...], List[Tuple[int, str, Dict[int, int]]]] = defaultdict(list)
+        for term, entry in self._postings.items():
+            if len(entry) < 2:
+                continue
+            targets = {doc: mask for doc, mask in entry.items() if weight_of[mask] >= MIN_TARGET_WEIGHT}
+            if len(targets) < 2:
+                continue
+            if total > 2 and len(targets) == total and all(mask == SOURCE_USER_KEYWORD for mask in targets.values()):
+                continue  # 批量分析统一指定的关键词
+            weights = [weight_of[mask] for mask in targets.values()]
+            grouped[tuple(sorted(targets))].append((sum(weights) - max(weights), term, targets))
+
+        groups = []
+        for docs, items in grouped.items():
+            items.sort(key=lambda item: (-item[0], item[1]))
+            lead = items[0][2]
+            ranked = sorted(docs, key=lambda doc: (-source_weight(lead[doc]), self._paths[doc]))
+            groups.append(CannibalizationGroup(
+                terms=[term for _, term, _ in items],
+                documents=[(self._paths[doc], lead[doc]) for doc in ranked],
+                severity=sum(score for score, _, _ in items),
+            ))
+        groups.sort(key=lambda g: (-g.severity, -len(g.documents), g.terms[0]))
+        return groups
+
+
+def format_cannibalization(groups: List[CannibalizationGroup], checked: int, top_n: int = 20) -> List[str]:
+    """输出汇总报告中的关键词蚕食章节（Markdown行）"""
+    lines = [
+        "## 关键词蚕食",
+        "",
+        f"参与检测 {checked} 个文件，发现 {len(groups)} 组页面以相同关键词为目标"
+        "（严重度 = 除首选页面外其余页面的目标强度之和）",
+    ]
+    if not groups:
+        return lines
+    lines.extend(["", "| # | 严重度 | 关键词 | 页面数 | 页面（来源） |", "|---|--------|--------|--------|------|"])
+    for i, group in enumerate(groups[:top_n], 1):
+        terms = "、".join(group.terms[:5]) + (f" 等{len(group.terms)}个" if len(group.terms) > 5 else "")
+        shown = ", ".join(f"`{path}`（{source_labels(mask)}）" for path, mask in group.documents[:5])
+        if len(group.documents) > 5:
+            shown += f" 等{len(group.documents)}个"
+        lines.append(f"| {i} | {group.severity} | {terms} | {len(group.documents)} | {shown} |")
+    if len(groups) > top_n:
+        lines.append(f"| ... | 还有 {len(groups) - top_n} 组 | | | |")
+    return lines
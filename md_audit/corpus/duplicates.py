@@ -0,0 +1,204 @@
+"""
+近重复内容检测（MinHash + LSH）
+
+- 分词：清理后的正文（MarkdownParser._clean_text）按英文单词/数字与单个汉字切分，
+  连续 SHINGLE_SIZE 个词元为一个 shingle
+- 签名：单次哈希 MinHash（one permutation hashing）：每个 shingle 只计算一次
+  blake2b 哈希，按哈希值分入 SIGNATURE_SIZE 个桶，每桶保留最小值，空桶向右借值
+  （rotation densification）。签名计算为 O(shingle数)，与进程无关，可写入增量缓存
+- LSH：签名切成 LSH_BANDS 段，任一段完全相同的文档成为候选对；
+  候选对按签名相同位置比例估计 Jaccard 相似度，达到阈值的合并为重复簇（并查集）
+
+候选对只来自同一分桶的文档，整体近似线性，无需 O(n²) 两两比较。
+"""
+import hashlib
+import re
+from array import array
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Tuple
+
+# 每个 shingle 包含的词元数
+SHINGLE_SIZE = 5
+# 签名长度（桶数）
+SIGNATURE_SIZE = 128
+# LSH 分段：16段×8行，相似度约0.7以上的文档对大概率成为候选
+LSH_BANDS = 16
+LSH_ROWS = SIGNATURE_SIZE // LSH_BANDS
+# 判定为近重复的估计 Jaccard 相似度
+DEFAULT_THRESHOLD = 0.8
+# shingle 数少于此值的文档（过短）不参与检测
+MIN_SHINGLES = 5
+# 单个分桶超过此规模时（大量模板页）只与桶内首个文档比较，避免桶内平方级比较
+MAX_BUCKET_PAIRWISE = 200
+
+_EMPTY = 0xFFFFFFFF
+TOKEN_RE = re.compile(r'[a-z0-9]+|[一-龥]')
+
+
+def shingles(clean_text: str, size: int = SHINGLE_SIZE) -> set:
+    """清理后的正文 -> shingle 集合（词元不足 size 个时整体作为一个 shingle）"""
+    tokens = TOKEN_RE.findall(clean_text.lower())
+    if len(tokens) < size:
+        return {" ".join(tokens)} if tokens else set()
+    return {" ".join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+
+
+def minhash_signature(items: Iterable[str], size: int = SIGNATURE_SIZE) -> bytes:
+    """计算单次哈希 MinHash 签名（size 个32位值，小端字节序）；输入为空时返回空字节串"""
+    mins = array("I", [_EMPTY]) * size
+    blake2b = hashlib.blake2b
+    for item in items:
+        h = int.from_bytes(blake2b(item.encode("utf-8"), digest_size=8).digest(), "little")
+        slot = h % size
+        value = h >> 32
+        if value < mins[slot]:
+            mins[slot] = value
+    filled = [i for i in range(size) if mins[i] != _EMPTY]
+    if not filled:
+        return b""
+    if len(filled) < size:
+        # 空桶取右侧最近非空桶的值并按距离偏移，保证相似文档的空桶大概率取到相同值
+        dense = array("I", mins)
+        for i in range(size):
+            if mins[i] == _EMPTY:
+                distance = 1
+                while mins[(i + distance) % size] == _EMPTY:
+                    distance += 1
+                dense[i] = (mins[(i + distance) % size] + distance * 0x9E3779B1) & 0xFFFFFFFE
+        mins = dense
+    return mins.tobytes()
+
+
+def signature_similarity(a: bytes, b: bytes) -> float:
+    """两个签名的估计 Jaccard 相似度（相同位置取值相等的比例）"""
+    if not a or len(a) != len(b):
+        return 0.0
+    va, vb = array("I"), array("I")
+    va.frombytes(a)
+    vb.frombytes(b)
+    return sum(1 for x, y in zip(va, vb) if x == y) / len(va)
+
+
+@dataclass
+class DuplicateCluster:
+    """近重复文档簇（路径相对站点根目录）"""
+    documents: List[str]
+    max_similarity: float
+    min_similarity: float
+    pairs: List[Tuple[str, str, float]] = field(default_factory=list)
+
+
+class _UnionFind:
+    def __init__(self):
+        self.parent: Dict[int, int] = {}
+
+    def find(self, x: int) -> int:
+        parent = self.parent
+        root = x
+        while parent.get(root, root) != root:
+            root = parent[root]
+        while parent.get(x, x) != root:
+            parent[x], x = root, parent[x]
+        return root
+
+    def union(self, a: int, b: int) -> None:
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            self.parent[max(ra, rb)] = min(ra, rb)
+
+
+class DuplicateDetector:
+    """
+    近重复检测（签名可流式加入，分桶随加入建立；finalize 时校验候选对并聚类）
+
+    Args:
+        threshold: 判定为近重复的估计 Jaccard 相似度
+    """
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD):
+        self.threshold = threshold
+        self._paths: List[str] = []
+        self._signatures: List[bytes] = []
+        self._buckets: List[Dict[bytes, List[int]]] = [defaultdict(list) for _ in range(LSH_BANDS)]
+
+    def add(self, rel_path: str, signature: bytes) -> None:
+        if len(signature) != SIGNATURE_SIZE * 4:
+            return  # 正文过短或旧格式签名
+        doc = len(self._paths)
+        self._paths.append(rel_path)
+        self._signatures.append(signature)
+        band_bytes = LSH_ROWS * 4
+        for band, buckets in enumerate(self._buckets):
+            buckets[signature[band * band_bytes:(band + 1) * band_bytes]].append(doc)
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def _candidate_pairs(self) -> Iterable[Tuple[int, int]]:
+        seen = set()
+        for buckets in self._buckets:
+            for members in buckets.values():
+                if len(members) < 2:
+                    continue
+                if len(members) > MAX_BUCKET_PAIRWISE:
+                    pairs = ((members[0], other) for other in members[1:])
+                else:
+                    pairs = ((members[i], other) for i in range(len(members)) for other in members[i + 1:])
+                for pair in pairs:
+                    if pair not in seen:
+                        seen.add(pair)
+                        yield pair
+
+    def finalize(self) -> List[DuplicateCluster]:
+        """返回重复簇（按文档数、最高相似度降序）"""
+        union = _UnionFind()
+        verified: List[Tuple[int, int, float]] = []
+        for a, b in self._candidate_pairs():
+            similarity = signature_similarity(self._signatures[a], self._signatures[b])
+            if similarity >= self.threshold:
+                verified.append((a, b, similarity))
+                union.union(a, b)
+
+        groups: Dict[int, List[Tuple[int, int, float]]] = defaultdict(list)
+        for a, b, similarity in verified:
+            groups[union.find(a)].append((a, b, similarity))
+
+        clusters = []
+        for pairs in groups.values():
+            members = {doc for a, b, _ in pairs for doc in (a, b)}
+            similarities = [s for _, _, s in pairs]
+            clusters.append(DuplicateCluster(
+                documents=sorted(self._paths[doc] for doc in members),
+                max_similarity=max(similarities),
+                min_similarity=min(similarities),
+                pairs=sorted((tuple(sorted((self._paths[a], self._paths[b]))) + (s,) for a, b, s in pairs),
+                             key=lambda p: (-p[2], p[0], p[1])),
+            ))
+        clusters.sort(key=lambda c: (-len(c.documents), -c.max_similarity, c.documents[0]))
+        return clusters
+
+
+def format_duplicates(clusters: List[DuplicateCluster], checked: int, threshold: float,
+                      top_n: int = 20) -> List[str]:
+    """输出汇总报告中的近重复内容章节（Markdown行）"""
+    duplicated = sum(len(c.documents) for c in clusters)
+    lines = [
+        "## 近重复内容",
+        "",
+        f"参与检测 {checked} 个文件（相似度阈值 {threshold:.0%}），"
+        f"发现 {len(clusters)} 组近重复内容，涉及 {duplicated} 个文件",
+    ]
+    if not clusters:
+        return lines
+    lines.extend(["", "| # | 文件数 | 相似度 | 文件 |", "|---|--------|--------|------|"])
+    for i, cluster in enumerate(clusters[:top_n], 1):
+        similarity = (f"{cluster.max_similarity:.0%}" if cluster.max_similarity == cluster.min_similarity
+                      else f"{cluster.min_similarity:.0%}~{cluster.max_similarity:.0%}")
+        shown = ", ".join(f"`{path}`" for path in cluster.documents[:5])
+        if len(cluster.documents) > 5:
+            shown += f" 等{len(cluster.documents)}个"
+        lines.append(f"| {i} | {len(cluster.documents)} | {similarity} | {shown} |")
+    if len(clusters) > top_n:
+        lines.append(f"| ... | 还有 {len(clusters) - top_n} 组 | | |")
+    return lines
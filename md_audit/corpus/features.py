@@ -0,0 +1,63 @@
+"""
+文档特征
+
+批量分析时在工作线程内从 ParsedMarkdown 提取站点级检查所需的精简特征，
+随报告流入 CorpusAuditor；增量分析时与报告一同写入缓存，未变更文件无需重新解析。
+"""
+import re
+from dataclasses import asdict, dataclass, field
+from typing import TYPE_CHECKING, Dict, Tuple
+
+from md_audit.corpus.cannibalization import heading_terms
+from md_audit.corpus.duplicates import MIN_SHINGLES, minhash_signature, shingles
+from md_audit.models.data_models import ParsedMarkdown
+
+if TYPE_CHECKING:
+    from md_audit.parsers.markdown_parser import MarkdownParser
+
+# 带协议（http:、mailto:、tel:等）或协议相对（//）的链接不属于站内链接
+EXTERNAL_HREF_RE = re.compile(r'^(?:[a-zA-Z][a-zA-Z0-9+.\-]*:|//)')
+
+
+@dataclass
+class DocumentFeatures:
+    """单个文档的站点级特征"""
+    links: Tuple[str, ...] = field(default_factory=tuple)    # 站内链接href（原样，含#片段）
+    anchors: Tuple[str, ...] = field(default_factory=tuple)  # 页面锚点
+    signature: bytes = b""                                   # 正文MinHash签名（过短时为空）
+    terms: Dict[str, int] = field(default_factory=dict)      # 标题/H1/H2词项 -> 来源掩码
+    title: str = ""
+    description: str = ""                                    # frontmatter中显式填写的描述
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["signature"] = self.signature.hex()
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'DocumentFeatures':
+        return cls(
+            links=tuple(data.get("links", ())),
+            anchors=tuple(data.get("anchors", ())),
+            signature=bytes.fromhex(data.get("signature", "")),
+            terms=dict(data.get("terms", {})),
+            title=data.get("title", ""),
+            description=data.get("description", ""),
+        )
+
+
+def is_internal_href(href: str) -> bool:
+    return bool(href) and not EXTERNAL_HREF_RE.match(href)
+
+
+def extract_features(parsed: ParsedMarkdown, parser: 'MarkdownParser') -> DocumentFeatures:
+    """从解析结果提取文档特征（正文清理规则与关键词提取一致）"""
+    items = shingles(parser._clean_text(parsed.raw_content))
+    return DocumentFeatures(
+        links=tuple(link.get("href", "") for link in parsed.links if is_internal_href(link.get("href", ""))),
+        anchors=tuple(parsed.anchors),
+        signature=minhash_signature(items) if len(items) >= MIN_SHINGLES else b"",
+        terms=heading_terms(parser, parsed.title, parsed.h1_tags, parsed.h2_tags),
+        title=str(parsed.title or ""),
+        description=str(parsed.frontmatter.get("description") or parsed.frontmatter.get("excerpt") or ""),
+    )
@@ -0,0 +1,302 @@
+"""
+站内链接图
+
+文档按加入顺序分配连续整数id，链接以 array 存储的 (源id, 目标id) 边表表示，
+构建与统计均为 O(文档数 + 链接数)：
+- 失效链接：目标页面不存在，或目标页面中不存在链接的 #锚点
+- 孤立页面：没有任何其他页面链接到（首页除外）
+- 入度/出度：按去重后的页面间链接计数
+- 链接深度：从首页出发的最少点击次数（BFS），不可达页面单独列出
+
+链接解析规则与常见文档站点生成器一致：相对路径相对当前文件所在目录，
+/ 开头相对站点根目录；目录链接指向其 index/README，无扩展名或 .html 链接
+对应同名 Markdown 文件。非页面资源（图片、PDF等）不在检查范围内。
+"""
+import os
+import posixpath
+from array import array
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import unquote
+
+from md_audit.utils.file_walker import MARKDOWN_EXTENSIONS
+
+# 目录的默认页面（按优先级）
+INDEX_NAMES = ("index", "README", "_index")
+
+# 视为页面链接的扩展名（Markdown源文件或构建后的HTML）
+HTML_EXTENSIONS = (".html", ".htm")
+
+# 失效原因
+MISSING_PAGE = "目标页面不存在"
+MISSING_ANCHOR = "锚点不存在"
+
+
+@dataclass
+class BrokenLink:
+    source: str   # 来源文件（相对站点根目录）
+    href: str     # 原始链接
+    reason: str
+
+
+@dataclass
+class LinkGraphResult:
+    """链接图统计结果（路径均相对站点根目录）"""
+    pages: int = 0
+    links: int = 0                 # 去重后的页面间链接数
+    index_page: Optional[str] = None
+    broken_links: List[BrokenLink] = field(default_factory=list)
+    orphans: List[str] = field(default_factory=list)
+    unreachable: List[str] = field(default_factory=list)
+    in_degree: Dict[str, int] = field(default_factory=dict)
+    out_degree: Dict[str, int] = field(default_factory=dict)
+    depth: Dict[str, int] = field(default_factory=dict)   # 仅含从首页可达的页面
+
+
+class LinkGraph:
+    """
+    站内链接图（文档可流式加入，全部加入后调用 finalize 解析链接并统计）
+
+    Args:
+        root: 站点根目录（用于判断未纳入分析的目标文件是否存在于磁盘）
+        index_page: 首页相对路径；None时依次查找根目录下的 index/README/_index
+        extensions: 页面扩展名
+    """
+
+    def __init__(self, root: str, index_page: Optional[str] = None,
+                 extensions: Sequence[str] = MARKDOWN_EXTENSIONS):
+        self.root = root
+        self.index_page = index_page
+        self.extensions = tuple(ext.lower() for ext in extensions)
+        self._ids: Dict[str, int] = {}
+        self._paths: List[str] = []
+        self._links: List[Tuple[str, ...]] = []
+        self._anchors: List[frozenset] = []
+
+    def add_document(self, rel_path: str, links: Sequence[str], anchors: Sequence[str]) -> int:
+        """加入文档（rel_path 为 / 分隔的相对路径），返回节点id"""
+        node = self._ids.get(rel_path)
+        if node is None:
+            node = self._ids[rel_path] = len(self._paths)
+            self._paths.append(rel_path)
+            self._links.append(tuple(links))
+            self._anchors.append(frozenset(anchors))
+        else:
+            self._links[node] = tuple(links)
+            self._anchors[node] = frozenset(anchors)
+        return node
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    # ===== 链接解析 =====
+
+    def _candidates(self, path: str) -> List[str]:
+        """链接路径（已规范化，相对站点根目录）可能对应的页面文件"""
+        if path in ("", "."):
+            return [name + ext for name in INDEX_NAMES for ext in self.extensions]
+        if path.lower().endswith(self.extensions):
+            return [path]
+        stem, ext = posixpath.splitext(path)
+        ext = ext.lower()
+        if ext in self.extensions:
+            return [path]
+        if ext in HTML_EXTENSIONS:
+            base = stem
+        elif ext:
+            return []  # 图片、PDF等资源
+        else:
+            base = path
+        candidates = [base + e for e in self.extensions]
+        candidates.extend(f"{base}/{name}{e}" for name in INDEX_NAMES for e in self.extensions)
+        return candidates
+
+    def _resolve_target(self, base_dir: str, path: str) -> Tuple[Optional[int], bool]:
+        """
+        解析链接的路径部分（不含 #片段 与 ?查询）
+
+        Returns:
+            (目标节点id或None, 是否为需检查的页面链接)
+        """
+        if "%" in path:
+            path = unquote(path)
+        if path.startswith("/"):
+            target = path.lstrip("/") or "."
+        else:
+            target = f"{base_dir}/{path}" if base_dir else path
+        if "." in target or "//" in target or target.endswith("/"):
+            target = posixpath.normpath(target)
+        if target.startswith("../") or target == "..":
+            return None, False  # 指向站点目录之外，无法校验
+        candidates = self._candidates(target)
+        if not candidates:
+            return None, False
+        for candidate in candidates:
+            node = self._ids.get(candidate)
+            if node is not None:
+                return node, True
+        # 未纳入分析但磁盘上存在（如被排除规则跳过）的目标不算失效
+        for candidate in candidates:
+            if os.path.isfile(os.path.join(self.root, *candidate.split("/"))):
+                return None, False
+        return None, True
+
+    def resolve(self, source: str, href: str) -> Tuple[Optional[int], str, bool]:
+        """
+        解析单条链接
+
+        Returns:
+            (目标节点id或None, 锚点片段, 是否为需检查的页面链接)
+        """
+        path, _, fragment = href.partition("#")
+        path = path.partition("?")[0]
+        fragment = unquote(fragment)
+        if not path:
+            return self._ids.get(source), fragment, True
+        target, checked = self._resolve_target(source.rpartition("/")[0], path)
+        return target, fragment, checked
+
+    def _find_index(self) -> Optional[int]:
+        if self.index_page is not None:
+            return self._ids.get(self.index_page)
+        for candidate in self._candidates(""):
+            node = self._ids.get(candidate)
+            if node is not None:
+                return node
+        return None
+
+    # ===== 统计 =====
+
+    def finalize(self) -> LinkGraphResult:
+        n = len(self._paths)
+        result = LinkGraphResult(pages=n)
+        src = array("i")
+        dst = array("i")
+        out_degree = array("i", bytes(4 * n))
+        in_degree = array("i", bytes(4 * n))
+
+        # 同一目录下的相同链接（导航栏、页脚等）只解析一次
+        resolved: Dict[Tuple[str, str], Tuple[Optional[int], bool]] = {}
+        for node, hrefs in enumerate(self._links):
+            source = self._paths[node]
+            base_dir = source.rpartition("/")[0]
+            seen = set()
+            for href in hrefs:
+                path, _, fragment = href.partition("#")
+                if "?" in path:
+                    path = path.partition("?")[0]
+                if "%" in fragment:
+                    fragment = unquote(fragment)
+                if not path:
+                    target, checked = node, True
+                else:
+                    key = (base_dir, path)
+                    hit = resolved.get(key)
+                    if hit is None:
+                        hit = resolved[key] = self._resolve_target(base_dir, path)
+                    target, checked = hit
+                if not checked:
+                    continue
+                if target is None:
+                    result.broken_links.append(BrokenLink(source, href, MISSING_PAGE))
+                    continue
+                if fragment and fragment not in self._anchors[target] \
+                        and fragment.lower() not in self._anchors[target]:
+                    result.broken_links.append(BrokenLink(source, href, MISSING_ANCHOR))
+                if target == node or target in seen:
+                    continue
+                seen.add(target)
+                src.append(node)
+                dst.append(target)
+                out_degree[node] += 1
+                in_degree[target] += 1
+        result.links = len(src)
+
+        # 邻接表（CSR：offsets[i]..offsets[i+1] 为节点i的出边）
+        offsets = array("i", bytes(4 * (n + 1)))
+        for node in src:
+            offsets[node + 1] += 1
+        for i in range(n):
+            offsets[i + 1] += offsets[i]
+        targets = array("i", bytes(4 * len(src)))
+        cursor = array("i", offsets[:n])
+        for s, d in zip(src, dst):
+            targets[cursor[s]] = d
+            cursor[s] += 1
+
+        index = self._find_index()
+        depth = array("i", [-1]) * n
+        if index is not None:
+            result.index_page = self._paths[index]
+            depth[index] = 0
+            queue = deque([index])
+            while queue:
+                node = queue.popleft()
+                for i in range(offsets[node], offsets[node + 1]):
+                    target = targets[i]
+                    if depth[target] < 0:
+                        depth[target] = depth[node] + 1
+                        queue.append(target)
+
+        for node, path in enumerate(self._paths):
+            result.in_degree[path] = in_degree[node]
+            result.out_degree[path] = out_degree[node]
+            if in_degree[node] == 0 and node != index:
+                result.orphans.append(path)
+            if depth[node] >= 0:
+                result.depth[path] = depth[node]
+            elif index is not None:
+                result.unreachable.append(path)
+        result.orphans.sort()
+        result.unreachable.sort()
+        return result
+
+
+def format_link_graph(result: LinkGraphResult, top_n: int = 20) -> List[str]:
+    """输出汇总报告中的站内链接章节（Markdown行）"""
+    max_depth = max(result.depth.values()) if result.depth else 0
+    lines = [
+        "## 站内链接",
+        "",
+        "| 指标 | 数值 |",
+        "|------|------|",
+        f"| 页面数 | {result.pages} |",
+        f"| 页面间链接（去重） | {result.links} |",
+        f"| 失效链接 | {len(result.broken_links)} |",
+        f"| 孤立页面（无入链） | {len(result.orphans)} |",
+        f"| 首页 | {f'`{result.index_page}`' if result.index_page else '未找到（index/README）'} |",
+    ]
+    if result.index_page:
+        lines.extend([
+            f"| 首页不可达页面 | {len(result.unreachable)} |",
+            f"| 最大链接深度 | {max_depth} |",
+        ])
+
+    if result.broken_links:
+        lines.extend(["", "### 失效链接", "", "| 来源 | 链接 | 原因 |", "|------|------|------|"])
+        for link in result.broken_links[:top_n]:
+            lines.append(f"| `{link.source}` | `{link.href}` | {link.reason} |")
+        if len(result.broken_links) > top_n:
+            lines.append(f"| ... | 还有 {len(result.broken_links) - top_n} 条 | |")
+
+    if result.orphans:
+        lines.extend(["", "### 孤立页面", ""])
+        lines.extend(f"- `{path}`" for path in result.orphans[:top_n])
+        if len(result.orphans) > top_n:
+            lines.append(f"- ... 还有 {len(result.orphans) - top_n} 个")
+
+    if result.depth:
+        distribution: Dict[int, int] = {}
+        for value in result.depth.values():
+            distribution[value] = distribution.get(value, 0) + 1
+        lines.extend(["", "### 链接深度分布（距首页点击次数）", "", "| 深度 | 页面数 |", "|------|--------|"])
+        lines.extend(f"| {d} | {distribution[d]} |" for d in sorted(distribution))
+        if result.unreachable:
+            lines.append(f"| 不可达 | {len(result.unreachable)} |")
+
+    if result.pages:
+        ranked = sorted(result.in_degree.items(), key=lambda item: (-item[1], item[0]))[:min(top_n, 10)]
+        lines.extend(["", "### 入链最多的页面", "", "| 页面 | 入链 | 出链 |", "|------|------|------|"])
+        lines.extend(f"| `{path}` | {count} | {result.out_degree[path]} |" for path, count in ranked)
+    return lines
@@ -0,0 +1,257 @@
+"""
+语料TF-IDF关键词提取（md-audit analyze <目录> --tfidf）
+
+自动提取关键词默认按文档内词频排序，领域通用词在每个页面都排在前面。
+语料模式分两遍：
+1. 流式遍历目录，按批计算每个文件的候选关键词集合（与 extract_keywords 相同的
+   切分与质量过滤），累加到文档频率表
+2. 正常分析，候选关键词按 词频 × IDF 排序（idf = ln((1+N)/(1+df)) + 1）
+
+文档频率表不保存词项字符串：词项以32位哈希（crc32）为id，df 为 id -> 文档数
+的计数表（随表一并保存）；每个文档只保存其词项id集合（稀疏向量，排序后差分编码并压缩）与内容摘要。
+表持久化到磁盘，后续运行中内容未变的文件直接复用，只需读取文件计算摘要；
+变更文件先减去旧贡献再加入新贡献。哈希冲突只会合并极少数词项的文档数，对排序影响可忽略。
+"""
+import base64
+import hashlib
+import math
+import os
+import zlib
+from array import array
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from itertools import accumulate
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import frontmatter
+
+from md_audit.parsers.markdown_parser import MarkdownParser
+from md_audit.utils import fast_json
+
+# 持久化格式版本（结构变化时递增，旧文件自动失效）
+DF_VERSION = 1
+
+# 未指定 --df-cache 时，文档频率表相对分析目录的默认位置
+DEFAULT_DF_NAME = ".md-audit-df.json"
+
+# 第一遍每个线程池任务处理的文件数（减少任务调度与结果传递开销）
+BATCH_SIZE = 64
+
+
+def content_digest(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def term_id(term: str) -> int:
+    return zlib.crc32(term.encode("utf-8"))
+
+
+def _pack_ids(ids: Sequence[int]) -> bytes:
+    """升序id -> 差分后以 array('I') 字节经zlib压缩"""
+    deltas = array("I", (b - a for a, b in zip([0] + list(ids), ids)))
+    return zlib.compress(deltas.tobytes(), 1)
+
+
+def _unpack_ids(packed: bytes) -> array:
+    deltas = array("I")
+    deltas.frombytes(zlib.decompress(packed))
+    return array("I", accumulate(deltas))
+
+
+def pack_terms(terms: Iterable[str]) -> bytes:
+    """词项集合 -> 压缩的id向量"""
+    return _pack_ids(sorted({term_id(term) for term in terms}))
+
+
+class DocumentFrequency:
+    """
+    文档频率表
+
+    文档以相对路径为键，可重复加入（替换旧贡献）；idf 为线程安全的只读查询
+    """
+
+    def __init__(self):
+        self._df: Counter = Counter()
+        self._docs: Dict[str, Tuple[str, bytes]] = {}
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    @property
+    def vocabulary_size(self) -> int:
+        return len(self._df)
+
+    def digests(self) -> Dict[str, str]:
+        """{相对路径: 内容摘要}"""
+        return {rel_path: digest for rel_path, (digest, _) in self._docs.items()}
+
+    def add(self, rel_path: str, terms: Iterable[str], digest: str = "") -> None:
+        self.add_packed(rel_path, pack_terms(terms), digest)
+
+    def add_packed(self, rel_path: str, packed: bytes, digest: str = "") -> None:
+        self.remove(rel_path)
+        self._df.update(_unpack_ids(packed))
+        self._docs[rel_path] = (digest, packed)
+
+    def remove(self, rel_path: str) -> None:
+        entry = self._docs.pop(rel_path, None)
+        if entry is None:
+            return
+        df = self._df
+        for tid in _unpack_ids(entry[1]):
+            count = df[tid] - 1
+            if count > 0:
+                df[tid] = count
+            else:
+                del df[tid]
+
+    def prune(self, keep: Iterable[str]) -> None:
+        """移除已不存在文件的贡献"""
+        keep = set(keep)
+        for rel_path in [p for p in self._docs if p not in keep]:
+            self.remove(rel_path)
+
+    def df(self, term: str) -> int:
+        return self._df.get(term_id(term), 0)
+
+    def idf(self, term: str) -> float:
+        """平滑IDF：ln((1+N)/(1+df)) + 1（表外词项按 df=0 计）"""
+        return math.log((1 + len(self._docs)) / (1 + self.df(term))) + 1
+
+    # ===== 持久化 =====
+
+    def load(self, path: str) -> bool:
+        """读取文档频率表；文件不存在、损坏或版本不一致时返回False"""
+        try:
+            data = fast_json.loads(Path(path).read_bytes())
+        except (OSError, ValueError):
+            return False
+        if not isinstance(data, dict) or data.get("version") != DF_VERSION:
+            return False
+        try:
+            # 计数表整体保存，读取时无需逐文档累加
+            ids, counts = array("I"), array("I")
+            ids.frombytes(zlib.decompress(base64.b64decode(data["df_ids"])))
+            counts.frombytes(zlib.decompress(base64.b64decode(data["df_counts"])))
+            if len(ids) != len(counts):
+                return False
+            self._df = Counter(dict(zip(ids, counts)))
+            self._docs = {rel_path: (digest, base64.b64decode(encoded))
+                          for rel_path, (digest, encoded) in data["docs"].items()}
+        except (KeyError, TypeError, ValueError, zlib.error):
+            self.__init__()
+            return False
+        return True
+
+    def save(self, path: str) -> None:
+        ids = array("I", self._df.keys())
+        counts = array("I", self._df.values())
+        docs = {rel_path: [digest, base64.b64encode(packed).decode("ascii")]
+                for rel_path, (digest, packed) in self._docs.items()}
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_bytes(fast_json.dumps({
+            "version": DF_VERSION,
+            "df_ids": base64.b64encode(zlib.compress(ids.tobytes(), 1)).decode("ascii"),
+            "df_counts": base64.b64encode(zlib.compress(counts.tobytes(), 1)).decode("ascii"),
+            "docs": docs,
+        }))
+        os.replace(tmp_path, path)  # 原子替换，中断时不留下半截文件
+
+
+def _document_body(parser: MarkdownParser, file_path: str, data: bytes) -> str:
+    """与分析时 extract_keywords 的输入一致：去除frontmatter并规范化标题的正文（超大文件为抽样正文）"""
+    rules = parser.large_file_rules
+    if rules and rules.enabled and len(data) >= rules.streaming_threshold_bytes:
+        return parser.parse(file_path).raw_content
+    post = frontmatter.loads(data.decode("utf-8"))
+    return parser._normalize_headings(post.content)
+
+
+def _scan_batch(parser: MarkdownParser, batch: Sequence[Tuple[str, str]],
+                known: Dict[str, str]) -> List[Tuple[str, str, Optional[bytes]]]:
+    """
+    计算一批文件的候选关键词id向量
+
+    Returns:
+        [(相对路径, 内容摘要, 压缩的id向量)]；内容与已知摘要一致时向量为None（复用），
+        无法读取或解码的文件跳过
+    """
+    results = []
+    for rel_path, file_path in batch:
+        try:
+            data = Path(file_path).read_bytes()
+        except OSError:
+            continue
+        digest = content_digest(data)
+        if known.get(rel_path) == digest:
+            results.append((rel_path, digest, None))
+            continue
+        try:
+            body = _document_body(parser, file_path, data)
+        except (UnicodeDecodeError, ValueError, OSError):
+            continue
+        results.append((rel_path, digest, pack_terms(parser.keyword_frequencies(body))))
+    return results
+
+
+def _batches(files: Iterable[Tuple[str, str]], size: int) -> Iterator[List[Tuple[str, str]]]:
+    batch = []
+    for item in files:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def build_document_frequency(
+    parser: MarkdownParser,
+    directory: str,
+    files: Iterable[str],
+    table: Optional[DocumentFrequency] = None,
+    max_workers: int = 4
+) -> Tuple[DocumentFrequency, int]:
+    """
+    第一遍：流式计算目录中文件的文档频率
+
+    Args:
+        parser: 分析器使用的解析器（切分规则与关键词提取一致）
+        directory: 分析目录（文档以相对路径为键）
+        files: 文件路径（可为遍历器，边遍历边处理）
+        table: 已持久化的文档频率表（内容未变的文件复用，其余重新计算）
+        max_workers: 并发工作线程数
+
+    Returns:
+        (文档频率表, 重新计算的文件数)；未出现在 files 中的旧文档会被移除
+    """
+    table = table if table is not None else DocumentFrequency()
+    root = Path(directory)
+    known = table.digests()
+    seen = set()
+    computed = 0
+    pending = []
+
+    def collect(future) -> None:
+        nonlocal computed
+        for rel_path, digest, packed in future.result():
+            seen.add(rel_path)
+            if packed is not None:
+                table.add_packed(rel_path, packed, digest)
+                computed += 1
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        items = ((Path(path).relative_to(root).as_posix(), str(path)) for path in files)
+        for batch in _batches(items, BATCH_SIZE):
+            pending.append(executor.submit(_scan_batch, parser, batch, known))
+            # 限制在途批次数，结果按提交顺序合并（在途结果与并发度成正比，与文件数无关）
+            if len(pending) > 2 * max_workers:
+                collect(pending.pop(0))
+        for future in pending:
+            collect(future)
+
+    table.prune(seen)
+    return table, computed
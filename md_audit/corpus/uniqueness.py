@@ -0,0 +1,202 @@
+"""
+标题与描述唯一性
+
+重复的 <title> 与 meta description 是典型的站点级SEO问题，单文件的元数据检查看不到。
+报告流入时按字段建立两级索引：
+- 完全重复：规范化文本（NFKC、小写、合并空白）的哈希
+- 近似重复：模糊指纹——去除数字与停用词后的词元集合（排序去重）的哈希，
+  可识别大小写/标点/语序差异与编号不同的标题（如"教程 第1部分"/"教程 第2部分"）
+
+索引只保存 指纹 -> 页面id列表，内存与不同标题/描述的数量成正比；
+finalize 后为每个冲突页面生成引用冲突文件的元数据诊断。
+描述只检查frontmatter中显式填写的 description/excerpt（缺失时的正文摘要不计）。
+"""
+import hashlib
+import re
+import unicodedata
+from collections import defaultdict
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Dict, List, Optional, Set
+
+from md_audit.models.data_models import DiagnosticItem, SeverityLevel
+
+# 检查的字段：(字段名, 显示名称)
+FIELDS = (("title", "标题"), ("description", "描述"))
+
+# 冲突类型
+EXACT = "exact"
+SIMILAR = "similar"
+
+# 诊断中列出的冲突文件数上限
+MAX_LISTED = 5
+
+WHITESPACE_RE = re.compile(r'\s+')
+FINGERPRINT_TOKEN_RE = re.compile(r'[a-z]+|[一-龥]')
+
+# 模糊指纹忽略的高频虚词
+FINGERPRINT_STOP_WORDS = frozenset({
+    'a', 'an', 'the', 'and', 'or', 'of', 'to', 'in', 'on', 'for', 'with', 'by', 'is', 'are',
+    'part', 'page', 'chapter', 'vol',
+    '的', '了', '和', '与', '及', '第', '篇', '章', '部', '分', '节',
+})
+
+
+def normalize_text(text: str) -> str:
+    return WHITESPACE_RE.sub(" ", unicodedata.normalize("NFKC", text)).strip().lower()
+
+
+def _digest(text: str) -> bytes:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest()
+
+
+def exact_key(text: str) -> Optional[bytes]:
+    normalized = normalize_text(text)
+    return _digest(normalized) if normalized else None
+
+
+def fuzzy_key(text: str) -> Optional[bytes]:
+    """模糊指纹（词元不足2个时不参与近似匹配，避免短文本误报）"""
+    tokens = sorted({token for token in FINGERPRINT_TOKEN_RE.findall(normalize_text(text))
+                     if token not in FINGERPRINT_STOP_WORDS})
+    return _digest(" ".join(tokens)) if len(tokens) >= 2 else None
+
+
+@dataclass
+class UniquenessConflict:
+    """一组标题或描述冲突的页面（路径相对站点根目录）"""
+    field: str
+    kind: str                 # EXACT / SIMILAR
+    text: str                 # 组内首个页面的原文
+    documents: List[str] = field(default_factory=list)
+
+
+class UniquenessIndex:
+    """标题/描述唯一性索引（页面可流式加入，finalize 时输出冲突组与逐页诊断）"""
+
+    def __init__(self):
+        self._paths: List[str] = []
+        self._texts: Dict[str, Dict[int, str]] = {name: {} for name, _ in FIELDS}
+        self._exact: Dict[str, Dict[bytes, List[int]]] = {name: defaultdict(list) for name, _ in FIELDS}
+        self._fuzzy: Dict[str, Dict[bytes, List[int]]] = {name: defaultdict(list) for name, _ in FIELDS}
+        self.conflicts: List[UniquenessConflict] = []
+        self._diagnostics: Dict[str, List[DiagnosticItem]] = {}
+
+    def add(self, rel_path: str, title: str = "", description: str = "") -> None:
+        doc = len(self._paths)
+        self._paths.append(rel_path)
+        for name, text in (("title", title), ("description", description)):
+            key = exact_key(text) if text else None
+            if key is None:
+                continue
+            group = self._exact[name][key]
+            group.append(doc)
+            if len(group) == 1:
+                # 每个不同文本只保留首个页面的原文与一个模糊指纹条目
+                self._texts[name][doc] = text
+                fuzzy = fuzzy_key(text)
+                if fuzzy is not None:
+                    self._fuzzy[name][fuzzy].append(doc)
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def finalize(self) -> List[UniquenessConflict]:
+        """返回冲突组（完全重复在前，按页面数降序），并生成逐页诊断"""
+        conflicts: List[UniquenessConflict] = []
+        diagnostics: Dict[int, List[DiagnosticItem]] = defaultdict(list)
+        for name, label in FIELDS:
+            exact_groups = self._exact[name]
+            texts = self._texts[name]
+            for docs in exact_groups.values():
+                if len(docs) < 2:
+                    continue
+                text = texts[docs[0]]
+                paths = sorted(self._paths[d] for d in docs)
+                conflicts.append(UniquenessConflict(name, EXACT, text, paths))
+                for doc in docs:
+                    diagnostics[doc].append(self._diagnostic(name, label, EXACT, text, paths, {self._paths[doc]}))
+
+            for representatives in self._fuzzy[name].values():
+                if len(representatives) < 2:
+                    continue
+                # 模糊指纹相同的不同文本：组内全部页面（含各自的完全重复页面）互为近似
+                members = {rep: exact_groups[exact_key(texts[rep])] for rep in representatives}
+                paths = sorted(self._paths[d] for rep in representatives for d in members[rep])
+                conflicts.append(UniquenessConflict(name, SIMILAR, texts[representatives[0]], paths))
+                for rep in representatives:
+                    same = {self._paths[d] for d in members[rep]}
+                    for doc in members[rep]:
+                        diagnostics[doc].append(self._diagnostic(name, label, SIMILAR, texts[rep], paths, same))
+
+        conflicts.sort(key=lambda c: (c.kind != EXACT, -len(c.documents), c.field, c.documents[0]))
+        self.conflicts = conflicts
+        self._diagnostics = {self._paths[doc]: items for doc, items in diagnostics.items()}
+        return conflicts
+
+    def diagnostics_for(self, rel_path: str) -> List[DiagnosticItem]:
+        """页面的唯一性诊断（finalize 之后可用）"""
+        return self._diagnostics.get(rel_path, [])
+
+    def paths_with_diagnostics(self) -> List[str]:
+        return list(self._diagnostics)
+
+    @staticmethod
+    def _diagnostic(name: str, label: str, kind: str, text: str, paths: List[str],
+                    exclude: Set[str]) -> DiagnosticItem:
+        """paths 为组内已排序的页面，exclude 为当前页面（及与其文本完全相同的页面），不计为冲突文件"""
+        count = len(paths) - len(exclude)
+        listed = "、".join(islice((path for path in paths if path not in exclude), MAX_LISTED))
+        if count > MAX_LISTED:
+            listed += f" 等{count}个文件"
+        if kind == EXACT:
+            return DiagnosticItem.trusted(
+                category="metadata",
+                check_name=f"{name}_unique",
+                severity=SeverityLevel.WARNING,
+                score=0,
+                message=f"{label}与其他 {count} 个页面完全相同：{listed}",
+                suggestion=f"每个页面应使用独立的{label}，重复的{label}会让搜索引擎难以区分页面并降低点击率",
+                current_value=text,
+                expected_value="站内唯一"
+            )
+        return DiagnosticItem.trusted(
+            category="metadata",
+            check_name=f"{name}_similar",
+            severity=SeverityLevel.INFO,
+            score=50,
+            message=f"{label}与其他 {count} 个页面高度相似（仅大小写、标点、语序或编号不同）：{listed}",
+            suggestion=f"突出各页面的差异化主题，避免{label}只靠编号区分",
+            current_value=text,
+            expected_value="站内唯一"
+        )
+
+
+def format_uniqueness(conflicts: List[UniquenessConflict], checked: int, top_n: int = 20) -> List[str]:
+    """输出汇总报告中的标题与描述唯一性章节（Markdown行）"""
+    counts = {(name, kind): 0 for name, _ in FIELDS for kind in (EXACT, SIMILAR)}
+    for conflict in conflicts:
+        counts[(conflict.field, conflict.kind)] += len(conflict.documents)
+    lines = [
+        "## 标题与描述唯一性",
+        "",
+        "| 字段 | 完全重复（页面） | 高度相似（页面） |",
+        "|------|------------------|------------------|",
+    ]
+    for name, label in FIELDS:
+        lines.append(f"| {label} | {counts[(name, EXACT)]} | {counts[(name, SIMILAR)]} |")
+    lines.append(f"\n参与检测 {checked} 个文件，发现 {len(conflicts)} 组冲突")
+    if not conflicts:
+        return lines
+    labels = dict(FIELDS)
+    lines.extend(["", "| 字段 | 类型 | 内容 | 页面 |", "|------|------|------|------|"])
+    for conflict in conflicts[:top_n]:
+        kind = "完全重复" if conflict.kind == EXACT else "高度相似"
+        text = conflict.text if len(conflict.text) <= 40 else conflict.text[:40] + "…"
+        shown = ", ".join(f"`{path}`" for path in conflict.documents[:MAX_LISTED])
+        if len(conflict.documents) > MAX_LISTED:
+            shown += f" 等{len(conflict.documents)}个"
+        lines.append(f"| {labels[conflict.field]} | {kind} | {text.replace('|', '/')} | {shown} |")
+    if len(conflicts) > top_n:
+        lines.append(f"| ... | 还有 {len(conflicts) - top_n} 组 | | |")
+    return lines
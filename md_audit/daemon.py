@@ -0,0 +1,327 @@
+"""
+常驻分析守护进程（md-audit daemon）
+
+守护进程在 Unix 域套接字上保持已预热的 MarkdownSEOAnalyzer（依赖已导入、
+jieba词典已加载、引擎已构建），CLI 单文件分析时优先转发给守护进程，
+未运行时回退到进程内分析。
+
+协议：每个连接一次请求，请求与响应均为单行JSON（UTF-8，以换行结尾）
+- {"op": "analyze", "path", "display_path", "keywords", "config", "no_ai", "profile", "cwd", "env"}
+  -> {"ok": true, "total_score", "report_md"} 或 {"ok": false, "error"}；
+  env 为客户端配置相关环境变量的摘要，与守护进程启动时不同时返回
+  {"ok": false, "fallback": true, "error"}，客户端改为进程内分析
+- {"op": "ping"} -> {"ok": true, "pid", "analyzers", "requests"}
+- {"op": "shutdown"} -> {"ok": true}
+
+客户端部分只依赖标准库，避免为转发请求而导入分析栈。
+"""
+import hashlib
+import json
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+# 套接字路径（可由环境变量覆盖）
+SOCKET_ENV = "MD_AUDIT_DAEMON_SOCKET"
+
+# 客户端连接超时（秒）：守护进程未运行时应立即回退
+CONNECT_TIMEOUT = 0.2
+# 单次分析的最长等待时间（秒）
+REQUEST_TIMEOUT = 300.0
+
+# 单行请求上限，防止异常客户端占满内存
+MAX_REQUEST_BYTES = 1024 * 1024
+
+HAS_UNIX_SOCKET = hasattr(socket, "AF_UNIX")
+
+# 影响分析配置的环境变量（与 MarkdownSEOConfig._apply_env_overrides 一致）
+CONFIG_ENV_VARS = ("MD_AUDIT_LLM_API_KEY", "MD_AUDIT_LLM_BASE_URL", "MD_AUDIT_LLM_MODEL", "MD_AUDIT_ENABLE_AI")
+
+
+def config_env_digest() -> str:
+    """
+    当前进程配置相关环境变量的摘要（不在套接字上传递API密钥原文）
+
+    .env 只补充未设置的变量，且守护进程与客户端加载的是同一份，
+    比较进程启动时的环境变量即可判断两边得到的配置是否一致
+    """
+    values = [os.environ.get(name) for name in CONFIG_ENV_VARS]
+    return hashlib.sha256(json.dumps(values).encode("utf-8")).hexdigest()
+
+
+def default_socket_path() -> str:
+    """默认套接字路径：$MD_AUDIT_DAEMON_SOCKET > $XDG_RUNTIME_DIR/md-audit.sock > 临时目录"""
+    path = os.getenv(SOCKET_ENV)
+    if path:
+        return path
+    runtime_dir = os.getenv("XDG_RUNTIME_DIR")
+    if runtime_dir and os.path.isdir(runtime_dir):
+        return os.path.join(runtime_dir, "md-audit.sock")
+    uid = os.getuid() if hasattr(os, "getuid") else "user"
+    return os.path.join(tempfile.gettempdir(), f"md-audit-{uid}.sock")
+
+
+# ===== 客户端 =====
+
+def send_request(payload: dict, socket_path: Optional[str] = None,
+                 timeout: float = REQUEST_TIMEOUT) -> Optional[dict]:
+    """
+    向守护进程发送一次请求
+
+    Returns:
+        响应字典；守护进程未运行（套接字不存在、拒绝连接、连接超时）时返回None
+    """
+    if not HAS_UNIX_SOCKET:
+        return None
+    path = socket_path or default_socket_path()
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(CONNECT_TIMEOUT)
+        try:
+            sock.connect(path)
+        except (FileNotFoundError, ConnectionRefusedError, socket.timeout, OSError):
+            return None
+        sock.settimeout(timeout)
+        sock.sendall(json.dumps(payload, ensure_ascii=False).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as reader:
+            line = reader.readline()
+        return json.loads(line) if line else None
+    finally:
+        sock.close()
+
+
+def analyze_via_daemon(
+    file_path: str,
+    keywords=None,
+    config_path: Optional[str] = None,
+    no_ai: bool = False,
+    profile: bool = False,
+    socket_path: Optional[str] = None
+) -> Optional[dict]:
+    """
+    通过守护进程分析单个文件
+
+    路径在客户端按当前目录解析为绝对路径，同时附带当前目录与配置环境变量摘要；
+    守护进程启动时的配置环境变量与客户端不同（如切换了API密钥或模型）时
+    守护进程拒绝分析，按未运行处理
+
+    Returns:
+        守护进程响应（ok/total_score/report_md 或 ok=False/error）；
+        守护进程未运行或环境不一致时返回None，调用方回退到进程内分析
+    """
+    response = send_request({
+        "op": "analyze",
+        "path": os.path.abspath(file_path),
+        "display_path": file_path,
+        "keywords": keywords or None,
+        "config": os.path.abspath(config_path) if config_path else None,
+        "no_ai": no_ai,
+        "profile": profile,
+        "cwd": os.getcwd(),
+        "env": config_env_digest(),
+    }, socket_path)
+    if response is not None and response.get("fallback"):
+        return None
+    return response
+
+
+# ===== 服务端 =====
+
+class AnalyzerPool:
+    """
+    按配置指纹缓存的已预热分析器
+
+    (配置文件, 是否禁用AI) 的配置文件修改后（mtime变化）重新加载并编译配置：
+    指纹未变（仅改动格式或不影响结果的项）时沿用原分析器，不同配置文件内容相同时
+    共享同一分析器；指纹变化时以旧实例为基础重建，复用CWV探测结果与AI客户端
+    """
+
+    def __init__(self):
+        # (配置文件, 是否禁用AI) -> (mtime, 分析器键)
+        self._sources: Dict[Tuple[Optional[str], bool], Tuple[Optional[int], Tuple]] = {}
+        # (配置指纹, LLM客户端配置) -> 分析器；指纹不含API密钥，密钥不同的配置不共享AI客户端
+        self._analyzers: Dict[Tuple, object] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._analyzers)
+
+    def get(self, config_path: Optional[str], no_ai: bool):
+        from md_audit.analyzer import MarkdownSEOAnalyzer
+        from md_audit.config import compile_config, load_config
+
+        source = (config_path, no_ai)
+        try:
+            mtime = os.stat(config_path).st_mtime_ns if config_path else None
+        except OSError:
+            mtime = None
+        with self._lock:
+            known = self._sources.get(source)
+            if known is not None and known[0] == mtime:
+                return self._analyzers[known[1]]
+            config = load_config(config_path)
+            if no_ai:
+                config.enable_ai_analysis = False
+            compiled = compile_config(config)
+            key = (compiled.fingerprint, compiled.llm_settings)
+            analyzer = self._analyzers.get(key)
+            if analyzer is None:
+                previous = self._analyzers.get(known[1]) if known is not None else None
+                analyzer = self._analyzers[key] = MarkdownSEOAnalyzer(compiled, reuse=previous)
+            self._sources[source] = (mtime, key)
+            # 旧指纹不再被任何配置文件引用时释放
+            if known is not None and known[1] != key and all(k != known[1] for _, k in self._sources.values()):
+                del self._analyzers[known[1]]
+            return analyzer
+
+
+class AnalysisDaemon:
+    """Unix 域套接字上的分析服务（每个连接一个线程）"""
+
+    def __init__(self, socket_path: str, idle_timeout: float = 0.0):
+        self.socket_path = socket_path
+        self.idle_timeout = idle_timeout
+        self.pool = AnalyzerPool()
+        self.requests = 0
+        self._requests_lock = threading.Lock()
+        # 启动时（加载配置与 .env 之前）的配置环境变量摘要，与客户端请求比对
+        self.env_digest = config_env_digest()
+        self._last_activity = time.monotonic()
+        self._stop = threading.Event()
+        self._server: Optional[socket.socket] = None
+
+    def warm_up(self, config_path: Optional[str] = None, no_ai: bool = False) -> None:
+        """预构建默认分析器并加载jieba词典"""
+        analyzer = self.pool.get(config_path, no_ai)
+        analyzer.parser.extract_keywords("预热 warm up", max_keywords=1)
+
+    def bind(self) -> None:
+        """绑定套接字（已有守护进程运行时抛出 RuntimeError）"""
+        self._server = _bind_socket(self.socket_path)
+
+    def serve_forever(self) -> None:
+        if self._server is None:
+            self.bind()
+        self._server.settimeout(1.0)  # 定期检查停止标志与空闲超时
+        try:
+            while not self._stop.is_set():
+                try:
+                    conn, _ = self._server.accept()
+                except socket.timeout:
+                    if self.idle_timeout and time.monotonic() - self._last_activity > self.idle_timeout:
+                        print(f"空闲超过 {self.idle_timeout:g} 秒，守护进程退出")
+                        break
+                    continue
+                self._last_activity = time.monotonic()
+                threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+        finally:
+            self._server.close()
+            try:
+                os.unlink(self.socket_path)
+            except OSError:
+                pass
+
+    def _handle(self, conn: socket.socket) -> None:
+        try:
+            with conn, conn.makefile("rb") as reader:
+                line = reader.readline(MAX_REQUEST_BYTES)
+                try:
+                    request = json.loads(line)
+                    response = self._dispatch(request)
+                except Exception as e:
+                    response = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+                conn.sendall(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+        except OSError:
+            pass  # 客户端提前断开
+        finally:
+            self._last_activity = time.monotonic()
+
+    def _dispatch(self, request: dict) -> dict:
+        op = request.get("op")
+        if op == "ping":
+            return {"ok": True, "pid": os.getpid(), "analyzers": len(self.pool), "requests": self.requests}
+        if op == "shutdown":
+            self._stop.set()
+            return {"ok": True}
+        if op != "analyze":
+            return {"ok": False, "error": f"未知操作: {op}"}
+
+        from md_audit.reporter import MarkdownReporter
+
+        if request.get("env", self.env_digest) != self.env_digest:
+            return {"ok": False, "fallback": True, "error": "客户端的配置环境变量与守护进程不同"}
+        with self._requests_lock:
+            self.requests += 1
+        # 相对路径按客户端的当前目录解析（客户端通常已传入绝对路径）
+        cwd = request.get("cwd") or os.getcwd()
+        path = os.path.join(cwd, request["path"])
+        config_path = request.get("config")
+        if config_path:
+            config_path = os.path.join(cwd, config_path)
+        if not os.path.isfile(path):
+            return {"ok": False, "error": f"路径不存在 {request.get('display_path') or path}"}
+        analyzer = self.pool.get(config_path, bool(request.get("no_ai")))
+        report = analyzer.analyze(
+            path,
+            user_keywords=request.get("keywords"),
+            profile=bool(request.get("profile"))
+        )
+        # 报告中的文件路径与进程内分析一致（使用客户端传入的原始路径）
+        report.file_path = request.get("display_path") or path
+        return {
+            "ok": True,
+            "total_score": report.total_score,
+            "report_md": MarkdownReporter().generate(report),
+        }
+
+
+def _bind_socket(socket_path: str) -> socket.socket:
+    """绑定套接字；残留的套接字文件（进程已退出）会被清理，已有守护进程运行时报错"""
+    if os.path.exists(socket_path):
+        if send_request({"op": "ping"}, socket_path, timeout=CONNECT_TIMEOUT) is not None:
+            raise RuntimeError(f"守护进程已在运行: {socket_path}")
+        os.unlink(socket_path)
+    Path(socket_path).parent.mkdir(parents=True, exist_ok=True)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    old_umask = os.umask(0o177)  # 仅当前用户可连接
+    try:
+        server.bind(socket_path)
+    finally:
+        os.umask(old_umask)
+    server.listen(64)
+    return server
+
+
+def run_daemon(
+    socket_path: Optional[str] = None,
+    config_path: Optional[str] = None,
+    no_ai: bool = False,
+    idle_timeout: float = 0.0
+) -> int:
+    """启动守护进程（前台运行，Ctrl+C或 daemon --stop 停止）"""
+    if not HAS_UNIX_SOCKET:
+        print("错误：当前平台不支持Unix域套接字，无法启动守护进程")
+        return 1
+    path = socket_path or default_socket_path()
+    daemon = AnalysisDaemon(path, idle_timeout=idle_timeout)
+    try:
+        daemon.bind()
+    except RuntimeError as e:
+        print(f"错误：{e}")
+        return 1
+
+    start = time.perf_counter()
+    daemon.warm_up(os.path.abspath(config_path) if config_path else None, no_ai)
+    print(f"守护进程已就绪: {path}（预热 {(time.perf_counter() - start) * 1000:.0f}ms，PID {os.getpid()}）")
+    sys.stdout.flush()
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    print("守护进程已停止")
+    return 0
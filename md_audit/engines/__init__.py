@@ -1,9 +1,48 @@
-from .rules_engine import RulesEngine
-from .ai_engine import AIEngine
-from .schema_detector import SchemaMarkupDetector
-from .cwv_analyzer import CoreWebVitalsAnalyzer
-from .content_depth import ContentDepthAnalyzer
-from .eeat_analyzer import EEATAnalyzer
-from .ai_search_optimizer import AISearchOptimizer
-from .link_analyzer import LinkAnalyzer
-from .intent_analyzer import IntentAnalyzer
+"""
+分析引擎
+
+各引擎按需导入（PEP 562 模块级 __getattr__）：导入本包不会加载任何引擎模块，
+首次访问 md_audit.engines.AIEngine 等名称时才导入对应子模块，
+避免 CLI 在 --no-ai 或未提供 CWV URL 时加载 openai 等重型依赖。
+"""
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+# 公开名称 -> 所在子模块
+_ENGINE_MODULES = {
+    "RulesEngine": ".rules_engine",
+    "AIEngine": ".ai_engine",
+    "SchemaMarkupDetector": ".schema_detector",
+    "CoreWebVitalsAnalyzer": ".cwv_analyzer",
+    "ContentDepthAnalyzer": ".content_depth",
+    "EEATAnalyzer": ".eeat_analyzer",
+    "AISearchOptimizer": ".ai_search_optimizer",
+    "LinkAnalyzer": ".link_analyzer",
+    "IntentAnalyzer": ".intent_analyzer",
+}
+
+__all__ = list(_ENGINE_MODULES)
+
+if TYPE_CHECKING:
+    from .rules_engine import RulesEngine
+    from .ai_engine import AIEngine
+    from .schema_detector import SchemaMarkupDetector
+    from .cwv_analyzer import CoreWebVitalsAnalyzer
+    from .content_depth import ContentDepthAnalyzer
+    from .eeat_analyzer import EEATAnalyzer
+    from .ai_search_optimizer import AISearchOptimizer
+    from .link_analyzer import LinkAnalyzer
+    from .intent_analyzer import IntentAnalyzer
+
+
+def __getattr__(name: str):
+    module_name = _ENGINE_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value  # 缓存，后续访问不再经过 __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -16,6 +16,7 @@ from typing import Optional
 from openai import OpenAI, APIError, RateLimitError, APITimeoutError, APIConnectionError
 from md_audit.models.data_models import AIAnalysisResult, EEATDetails, ParsedMarkdown
 from md_audit.config import MarkdownSEOConfig
+from md_audit.utils.metrics import LLM_REQUESTS, LLM_RETRIES
 
 
 class AIEngine:
@@ -154,7 +155,7 @@ class AIEngine:
                     )
 
                 # 验证并返回（2025 SEO标准）
-                return AIAnalysisResult(
+                result = AIAnalysisResult(
                     eeat_score=float(result_data.get('eeat_score', 0)),
                     depth_score=float(result_data.get('depth_score', 0)),
                     readability_score=float(result_data.get('readability_score', 0)),
@@ -165,45 +166,54 @@ class AIEngine:
                     improvement_suggestions=result_data.get('improvement_suggestions', []),
                     eeat_details=eeat_details
                 )
+                LLM_REQUESTS.inc(outcome="success")
+                return result
 
             except json.JSONDecodeError as e:
                 print(f"[警告] AI返回结果解析失败（尝试 {attempt+1}/{self.config.llm_max_retries}）：{e}")
                 if attempt < self.config.llm_max_retries - 1:
+                    LLM_RETRIES.inc(reason="invalid_json")
                     time.sleep(2 ** attempt)  # 指数退避
                 continue
 
             except RateLimitError as e:
                 print(f"[警告] API限流（尝试 {attempt+1}/{self.config.llm_max_retries}）：{e}")
                 if attempt < self.config.llm_max_retries - 1:
+                    LLM_RETRIES.inc(reason="rate_limit")
                     time.sleep(5 * (2 ** attempt))  # 限流时更长等待
                 continue
 
             except APITimeoutError as e:
                 print(f"[警告] API超时（尝试 {attempt+1}/{self.config.llm_max_retries}）：{e}")
                 if attempt < self.config.llm_max_retries - 1:
+                    LLM_RETRIES.inc(reason="timeout")
                     time.sleep(2 ** attempt)
                 continue
 
             except APIConnectionError as e:
                 print(f"[警告] API连接失败（尝试 {attempt+1}/{self.config.llm_max_retries}）：{e}")
                 if attempt < self.config.llm_max_retries - 1:
+                    LLM_RETRIES.inc(reason="connection")
                     time.sleep(2 ** attempt)
                 continue
 
             except APIError as e:
                 print(f"[警告] API错误（尝试 {attempt+1}/{self.config.llm_max_retries}）：{e}")
                 if attempt < self.config.llm_max_retries - 1:
+                    LLM_RETRIES.inc(reason="api_error")
                     time.sleep(2 ** attempt)
                 continue
 
             except Exception as e:
                 print(f"[错误] 未知异常（尝试 {attempt+1}/{self.config.llm_max_retries}）：{type(e).__name__}: {e}")
                 if attempt < self.config.llm_max_retries - 1:
+                    LLM_RETRIES.inc(reason="unknown")
                     time.sleep(2 ** attempt)
                 continue
 
         # 所有重试都失败
         print("[错误] AI分析失败，已达到最大重试次数，将跳过AI评分")
+        LLM_REQUESTS.inc(outcome="failure")
         return None
 
     def calculate_ai_score(self, ai_result: Optional[AIAnalysisResult]) -> float:
@@ -4,18 +4,20 @@ AI 搜索优化检测器（Google AI Overview / GEO）
 from __future__ import annotations
 
 import re
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple, Union
 
-from md_audit.config import MarkdownSEOConfig
+from md_audit.config import CompiledConfig, MarkdownSEOConfig, compile_config
 from md_audit.models.data_models import DiagnosticItem, SeverityLevel, ParsedMarkdown
+from md_audit.parsers.source_map import SourceMap
 
 
 class AISearchOptimizer:
     """输出0-10分的AI搜索优化分"""
 
-    def __init__(self, config: MarkdownSEOConfig):
-        self.config = config
-        self.rules = config.ai_search
+    def __init__(self, config: Union[MarkdownSEOConfig, CompiledConfig]):
+        self.plan = compile_config(config)
+        self.config = self.plan.config
+        self.rules = self.config.ai_search
         self.weights = {
             "direct_answer": 3,
             "faq": 3,
@@ -36,7 +38,8 @@ class AISearchOptimizer:
 
         diagnostics.append(self._build_diag(
             "ai_search", "direct_answer", direct_score, self.weights["direct_answer"],
-            "首段直接答案检测完成", "首段50-120词内回答核心问题，并出现核心关键词。"
+            "首段直接答案检测完成", "首段50-120词内回答核心问题，并出现核心关键词。",
+            location=(parsed.source_map or SourceMap()).paragraph(0)
         ))
         diagnostics.append(self._build_diag(
             "ai_search", "summary", summary_score, self.weights["summary"],
@@ -87,8 +90,8 @@ class AISearchOptimizer:
     def _check_summaries(self, content: str) -> float:
         """总结/要点，满分2"""
         lines = content.splitlines()
-        summary_patterns = [p for p in self.rules.summary_keywords]
-        has_summary = any(re.search(p, line, re.IGNORECASE) for line in lines for p in summary_patterns)
+        summary_pattern = self.plan.summary_pattern
+        has_summary = summary_pattern is not None and any(summary_pattern.search(line) for line in lines)
         bullet_summary = re.search(r'^[-*+]\s+.+', content, re.MULTILINE) is not None
         score = 0.0
         if has_summary:
@@ -152,15 +155,17 @@ class AISearchOptimizer:
             return SeverityLevel.WARNING
         return SeverityLevel.CRITICAL
 
-    def _build_diag(self, category: str, name: str, score: float, max_score: float, message: str, suggestion: str) -> DiagnosticItem:
-        return DiagnosticItem(
+    def _build_diag(self, category: str, name: str, score: float, max_score: float, message: str, suggestion: str,
+                    location: Optional[Tuple[int, int]] = None) -> DiagnosticItem:
+        return DiagnosticItem.trusted(
             category=category,
             check_name=name,
             severity=self._severity_from_score(score, max_score),
             score=round(score, 2),
             message=message,
             suggestion=suggestion,
-            expected_value=str(max_score)
+            expected_value=str(max_score),
+            location=location
         )
 
     def _tips(self, diags: List[DiagnosticItem]) -> List[str]:
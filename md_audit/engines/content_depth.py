@@ -4,18 +4,20 @@
 from __future__ import annotations
 
 import re
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple, Union
 
 from md_audit.models.data_models import DiagnosticItem, SeverityLevel, ParsedMarkdown
-from md_audit.config import MarkdownSEOConfig
+from md_audit.parsers.source_map import SourceMap
+from md_audit.config import CompiledConfig, MarkdownSEOConfig, compile_config
 
 
 class ContentDepthAnalyzer:
     """内容深度分析器，输出0-20分"""
 
-    def __init__(self, config: MarkdownSEOConfig):
-        self.config = config
-        self.rules = config.content_depth
+    def __init__(self, config: Union[MarkdownSEOConfig, CompiledConfig]):
+        self.plan = compile_config(config)
+        self.config = self.plan.config
+        self.rules = self.config.content_depth
         self.weights = {
             "word_count": 6,
             "sections": 5,
@@ -25,7 +27,7 @@ class ContentDepthAnalyzer:
 
     def analyze(self, parsed: ParsedMarkdown) -> Dict[str, object]:
         paragraphs = self._split_paragraphs(parsed.raw_content)
-        h3_tags = self._extract_h3(parsed.html_content)
+        h3_tags = parsed.h3_tags
         details = {}
         diagnostics: List[DiagnosticItem] = []
         suggestions: List[str] = []
@@ -63,7 +65,9 @@ class ContentDepthAnalyzer:
             max_score=self.weights["readability"],
             message="段落长度检测完成",
             suggestion="每段100-200词最优，过长可拆分小节，过短补充细节",
-            severity=self._severity_from_score(readability_score, self.weights["readability"])
+            severity=self._severity_from_score(readability_score, self.weights["readability"]),
+            location=self._first_uneven_paragraph(parsed, paragraphs)
+            if readability_score < self.weights["readability"] else None
         ))
 
         evidence_score = self._score_evidence(parsed.raw_content, parsed.links)
@@ -181,20 +185,18 @@ class ContentDepthAnalyzer:
 
         return round(min(score, self.weights["evidence"]), 2)
 
+    def _first_uneven_paragraph(self, parsed: ParsedMarkdown, paragraphs: List[str]) -> Optional[Tuple[int, int]]:
+        """第一个长度不在最优区间的段落位置"""
+        for index, paragraph in enumerate(paragraphs):
+            if not self.rules.paragraph_min_words <= len(paragraph.split()) <= self.rules.paragraph_max_words:
+                return (parsed.source_map or SourceMap()).paragraph(index)
+        return None
+
     def _split_paragraphs(self, content: str) -> List[str]:
         """按空行切分段落"""
         parts = [p.strip() for p in content.split("\n\n") if p.strip()]
         return parts
 
-    def _extract_h3(self, html: str) -> List[str]:
-        """从HTML中提取H3文本"""
-        try:
-            from bs4 import BeautifulSoup
-        except ImportError:
-            return []
-        soup = BeautifulSoup(html, "html.parser")
-        return [h3.get_text(strip=True) for h3 in soup.find_all("h3")]
-
     def _word_suggestion(self, count: int) -> str:
         """生成针对词数的建议"""
         if count < self.rules.optimal_min_words:
@@ -224,14 +226,16 @@ class ContentDepthAnalyzer:
         message: str,
         suggestion: str,
         severity: SeverityLevel,
+        location: Optional[Tuple[int, int]] = None,
     ) -> DiagnosticItem:
         """构建诊断项（关键逻辑保持中文注释）"""
-        return DiagnosticItem(
+        return DiagnosticItem.trusted(
             category=category,
             check_name=name,
             severity=severity,
             score=round(score, 2),
             message=message,
             suggestion=suggestion,
-            expected_value=str(max_score)
+            expected_value=str(max_score),
+            location=location
         )
@@ -66,7 +66,7 @@ class CoreWebVitalsAnalyzer:
             if not result:
                 # 执行失败，降级
                 diagnostics.append(
-                    DiagnosticItem(
+                    DiagnosticItem.trusted(
                         category="core_web_vitals",
                         check_name="cwv_execution_failed",
                         severity=SeverityLevel.WARNING,
@@ -108,7 +108,7 @@ class CoreWebVitalsAnalyzer:
         except subprocess.TimeoutExpired:
             # 超时降级
             diagnostics.append(
-                DiagnosticItem(
+                DiagnosticItem.trusted(
                     category="core_web_vitals",
                     check_name="cwv_timeout",
                     severity=SeverityLevel.WARNING,
@@ -124,7 +124,7 @@ class CoreWebVitalsAnalyzer:
         except Exception as e:
             # 其他异常降级
             diagnostics.append(
-                DiagnosticItem(
+                DiagnosticItem.trusted(
                     category="core_web_vitals",
                     check_name="cwv_error",
                     severity=SeverityLevel.WARNING,
@@ -328,7 +328,7 @@ class CoreWebVitalsAnalyzer:
                 )
             )
             diagnostics.append(
-                DiagnosticItem(
+                DiagnosticItem.trusted(
                     category="core_web_vitals",
                     check_name="lcp",
                     severity=severity,
@@ -352,7 +352,7 @@ class CoreWebVitalsAnalyzer:
                 )
             )
             diagnostics.append(
-                DiagnosticItem(
+                DiagnosticItem.trusted(
                     category="core_web_vitals",
                     check_name="tbt",
                     severity=severity,
@@ -376,7 +376,7 @@ class CoreWebVitalsAnalyzer:
                 )
             )
             diagnostics.append(
-                DiagnosticItem(
+                DiagnosticItem.trusted(
                     category="core_web_vitals",
                     check_name="cls",
                     severity=severity,
@@ -4,18 +4,19 @@ E-E-A-T 信号分析器
 from __future__ import annotations
 
 import re
-from typing import Dict, List
+from typing import Dict, List, Union
 
-from md_audit.config import MarkdownSEOConfig
+from md_audit.config import CompiledConfig, MarkdownSEOConfig, compile_config
 from md_audit.models.data_models import DiagnosticItem, SeverityLevel, ParsedMarkdown
 
 
 class EEATAnalyzer:
     """输出0-15分的E-E-A-T评估"""
 
-    def __init__(self, config: MarkdownSEOConfig):
-        self.config = config
-        self.rules = config.eeat
+    def __init__(self, config: Union[MarkdownSEOConfig, CompiledConfig]):
+        self.plan = compile_config(config)
+        self.config = self.plan.config
+        self.rules = self.config.eeat
         self.weights = {
             "experience": 4,
             "expertise": 4,
@@ -141,7 +142,7 @@ class EEATAnalyzer:
 
     def _is_high_authority(self, url: str) -> bool:
         """判断是否为高权威域名"""
-        return any(domain in url for domain in self.rules.high_authority_domains)
+        return any(domain in url for domain in self.plan.high_authority_domains)
 
     def _is_low_quality(self, url: str) -> bool:
         """简单判断低质量域名"""
@@ -166,7 +167,7 @@ class EEATAnalyzer:
         message: str,
         suggestion: str,
     ) -> DiagnosticItem:
-        return DiagnosticItem(
+        return DiagnosticItem.trusted(
             category=category,
             check_name=name,
             severity=self._severity_from_score(score, max_score),
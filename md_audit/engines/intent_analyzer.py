@@ -3,28 +3,30 @@
 """
 from __future__ import annotations
 
-import re
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple, Union
 
-from md_audit.config import MarkdownSEOConfig
+from md_audit.config import CompiledConfig, MarkdownSEOConfig, compile_config
 from md_audit.models.data_models import DiagnosticItem, SeverityLevel, ParsedMarkdown
+from md_audit.parsers.source_map import SourceMap
 
 
 class IntentAnalyzer:
     """搜索意图匹配 - 最高5分"""
 
-    def __init__(self, config: MarkdownSEOConfig):
-        self.config = config
-        self.rules = config.intent
-        self.weight = config.score_weights.intent
+    def __init__(self, config: Union[MarkdownSEOConfig, CompiledConfig]):
+        self.plan = compile_config(config)
+        self.config = self.plan.config
+        self.rules = self.config.intent
+        self.weight = self.plan.score_weights["intent"]
 
     def analyze(self, parsed: ParsedMarkdown) -> Dict[str, object]:
         content = parsed.raw_content
         paragraphs = [p.strip() for p in content.split("\n\n") if p.strip()]
         intro = paragraphs[0] if paragraphs else ""
+        locations = parsed.source_map or SourceMap()
 
-        intent_score, intent_diag = self._check_intent(parsed.title, intro)
-        intro_score, intro_diag = self._check_intro(intro)
+        intent_score, intent_diag = self._check_intent(parsed.title, intro, locations.title())
+        intro_score, intro_diag = self._check_intro(intro, locations.paragraph(0))
         conclusion_score, conclusion_diag = self._check_conclusion(content)
 
         total = round(intent_score + intro_score + conclusion_score, 2)
@@ -43,12 +45,11 @@ class IntentAnalyzer:
             "suggestions": suggestions,
         }
 
-    def _check_intent(self, title: str, intro: str):
+    def _check_intent(self, title: str, intro: str, location: Optional[Tuple[int, int]] = None):
         """检测意图词出现，满分2分"""
-        intent_words = self.rules.intent_keywords
-        pattern = "|".join(re.escape(w) for w in intent_words)
-        found_in_title = re.search(pattern, title, re.IGNORECASE)
-        found_in_intro = re.search(pattern, intro, re.IGNORECASE)
+        pattern = self.plan.intent_pattern
+        found_in_title = pattern.search(title)
+        found_in_intro = pattern.search(intro)
 
         score = 0.0
         if found_in_title:
@@ -58,18 +59,19 @@ class IntentAnalyzer:
         score = min(2.0, score)
 
         severity = self._severity(score, 2.0)
-        diag = DiagnosticItem(
+        diag = DiagnosticItem.trusted(
             category="intent",
             check_name="intent_keywords",
             severity=severity,
             score=round(score, 2),
             message="检测标题/引言意图词",
             suggestion="在标题或首段添加‘指南/如何/Top 10/最佳’等意图词，明确读者预期。",
-            expected_value=">=1个意图词"
+            expected_value=">=1个意图词",
+            location=location
         )
         return score, diag
 
-    def _check_intro(self, intro: str):
+    def _check_intro(self, intro: str, location: Optional[Tuple[int, int]] = None):
         """检测引言是否简短直陈，满分2分"""
         words = len(intro.split())
         if words == 0:
@@ -80,25 +82,24 @@ class IntentAnalyzer:
             score = 1.0
 
         severity = self._severity(score, 2.0)
-        diag = DiagnosticItem(
+        diag = DiagnosticItem.trusted(
             category="intent",
             check_name="intro_clarity",
             severity=severity,
             score=round(score, 2),
             message=f"引言长度 {words} 词",
             suggestion=f"引言建议 {self.rules.intro_min_words}-{self.rules.intro_max_words} 词，直接给出阅读收获。",
-            expected_value=f"{self.rules.intro_min_words}-{self.rules.intro_max_words}词"
+            expected_value=f"{self.rules.intro_min_words}-{self.rules.intro_max_words}词",
+            location=location
         )
         return score, diag
 
     def _check_conclusion(self, content: str):
         """检测是否存在结论/总结段，满分1分"""
-        headings = self.rules.conclusion_headings
-        pattern = r'^#+\s*(%s)' % "|".join(re.escape(h) for h in headings)
-        has_conclusion = re.search(pattern, content, re.IGNORECASE | re.MULTILINE)
+        has_conclusion = self.plan.conclusion_pattern.search(content)
         score = 1.0 if has_conclusion else 0.0
         severity = self._severity(score, 1.0)
-        diag = DiagnosticItem(
+        diag = DiagnosticItem.trusted(
             category="intent",
             check_name="conclusion_presence",
             severity=severity,
@@ -3,20 +3,23 @@
 """
 from __future__ import annotations
 
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple, Union
 
-from md_audit.config import MarkdownSEOConfig
+from md_audit.config import CompiledConfig, MarkdownSEOConfig, compile_config
 from md_audit.models.data_models import DiagnosticItem, SeverityLevel
+from md_audit.parsers.source_map import SourceMap
 
 
 class LinkAnalyzer:
     """链接质量分析，输出0-3分（结构子维度）"""
 
-    def __init__(self, config: MarkdownSEOConfig):
-        self.config = config
-        self.rules = config.links
+    def __init__(self, config: Union[MarkdownSEOConfig, CompiledConfig]):
+        self.plan = compile_config(config)
+        self.config = self.plan.config
+        self.rules = self.config.links
 
-    def analyze(self, links: List[dict], word_count: int) -> Dict[str, object]:
+    def analyze(self, links: List[dict], word_count: int,
+                source_map: Optional[SourceMap] = None) -> Dict[str, object]:
         internal_links = [l for l in links if not l.get("href", "").startswith(("http://", "https://"))]
         external_links = [l for l in links if l.get("href", "").startswith(("http://", "https://"))]
 
@@ -24,7 +27,7 @@ class LinkAnalyzer:
 
         internal_score = self._score_internal_links(internal_links, word_count)
         external_score = self._score_external_links(external_links)
-        anchor_score = self._score_anchor_texts(links)
+        anchor_score, poor_link = self._score_anchor_texts(links)
 
         total = round(internal_score + external_score + anchor_score, 2)
 
@@ -41,7 +44,8 @@ class LinkAnalyzer:
         diagnostics.append(self._diag(
             "links", "anchor_text", anchor_score, 0.5,
             "锚文本质量检测完成",
-            "使用描述性锚文本，避免“点击这里”“link”等泛化用语。"
+            "使用描述性锚文本，避免“点击这里”“link”等泛化用语。",
+            location=source_map.link(poor_link["href"]) if poor_link and source_map else None
         ))
 
         return {
@@ -74,29 +78,32 @@ class LinkAnalyzer:
             return 0.0
         return 0.6  # 数量不足或超标
 
-    def _score_anchor_texts(self, links: List[dict]) -> float:
-        """锚文本质量评分，满分0.5"""
+    def _score_anchor_texts(self, links: List[dict]) -> Tuple[float, Optional[dict]]:
+        """锚文本质量评分，满分0.5；同时返回第一个锚文本不合格的链接"""
         if not links:
-            return 0.3
+            return 0.3, None
         poor = 0
         bare = 0
+        first_bad = None
         for link in links:
             text = (link.get("text") or "").strip().lower()
             href = link.get("href", "")
             if not text:
                 bare += 1
-            if any(p in text for p in self.rules.poor_anchor_texts):
+            if any(p in text for p in self.plan.poor_anchor_texts):
                 poor += 1
             if href and href == text:
                 bare += 1
+            if first_bad is None and poor + bare:
+                first_bad = link
         ratio_bad = (poor + bare) / len(links)
         if ratio_bad == 0:
-            return 0.5
+            return 0.5, None
         if ratio_bad <= 0.3:
-            return 0.35
+            return 0.35, first_bad
         if ratio_bad <= 0.6:
-            return 0.2
-        return 0.1
+            return 0.2, first_bad
+        return 0.1, first_bad
 
     def _severity_from_score(self, score: float, max_score: float) -> SeverityLevel:
         ratio = score / max_score if max_score else 0
@@ -108,13 +115,15 @@ class LinkAnalyzer:
             return SeverityLevel.WARNING
         return SeverityLevel.CRITICAL
 
-    def _diag(self, category: str, name: str, score: float, max_score: float, message: str, suggestion: str) -> DiagnosticItem:
-        return DiagnosticItem(
+    def _diag(self, category: str, name: str, score: float, max_score: float, message: str, suggestion: str,
+              location: Optional[Tuple[int, int]] = None) -> DiagnosticItem:
+        return DiagnosticItem.trusted(
             category=category,
             check_name=name,
             severity=self._severity_from_score(score, max_score),
             score=round(score, 2),
             message=message,
             suggestion=suggestion,
-            expected_value=str(max_score)
+            expected_value=str(max_score),
+            location=location
         )
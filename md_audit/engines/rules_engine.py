@@ -24,17 +24,63 @@
 - E-E-A-T: 作者信息、发布日期、引用来源
 """
 
+import heapq
 import re
-from typing import List, Tuple, Dict, Any
+from collections import Counter
+from itertools import islice
+from operator import methodcaller
+from typing import List, Pattern, Tuple, Dict, Any, Union
 from md_audit.models.data_models import ParsedMarkdown, DiagnosticItem, SeverityLevel
-from md_audit.config import MarkdownSEOConfig
+from md_audit.config import CompiledConfig, MarkdownSEOConfig, compile_config
+from md_audit.parsers.source_map import SourceMap
+from md_audit.utils.keyword_index import KeywordIndex, KeywordOccurrences, build_keyword_index
+
+# 实体提取：引号术语模式及其权重（"..." 原为重复模式，保留其双倍计数）
+QUOTED_ENTITY_PATTERNS = [
+    (re.compile(r'"([^"]{2,30})"'), 2),
+    (re.compile(r"'([^']{2,30})'"), 1),
+    (re.compile(r'「([^」]{2,30})」'), 1),
+    (re.compile(r'【([^】]{2,30})】'), 1),
+]
+# 专有名词（如 "Google Analytics"）| 全大写缩写（如 SEO、API）| 中文实体（连续中文+可选数字）
+# 首字符前瞻让正则引擎按字符集快速跳过不可能的位置
+ENTITY_TOKEN_RE = re.compile(
+    r'(?=[A-Z\u4e00-\u9fa5])(?:'
+    r'\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\b'
+    r'|\b([A-Z]{2,6})\b'
+    r'|([\u4e00-\u9fa5]{2,8}(?:\d+(?:\.\d+)?)?)'
+    r')'
+)
+# 实体候选预算：每种模式最多取前 N 个匹配；普通文档远低于此值，只有MB级的输入才会截断候选
+ENTITY_TOKEN_BUDGET = 100_000
+# 常见的非实体词
+COMMON_ENTITY_WORDS = frozenset({
+    'The', 'This', 'That', 'These', 'Those', 'Here', 'There',
+    'What', 'When', 'Where', 'Why', 'How', 'Which', 'Who',
+    'First', 'Second', 'Third', 'Next', 'Last', 'Final',
+    'Table', 'Figure', 'Image', 'Chapter', 'Section', 'Part',
+    'January', 'February', 'March', 'April', 'May', 'June',
+    'July', 'August', 'September', 'October', 'November', 'December',
+    'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday',
+})
+# 常见非术语缩写
+COMMON_ACRONYMS = frozenset({'OK', 'OR', 'AND', 'NOT', 'THE', 'FOR', 'BUT', 'SO', 'IF'})
+# 常见中文词（非实体）
+COMMON_CHINESE_WORDS = frozenset({
+    '的', '是', '在', '有', '和', '与', '或', '但', '因为', '所以',
+    '这个', '那个', '如果', '可以', '需要', '应该', '可能', '已经',
+    '文章', '内容', '页面', '网站', '用户', '我们', '他们', '这些',
+    '一个', '两个', '一些', '很多', '所有', '每个', '任何', '其他',
+    '非常', '比较', '更加', '最好', '更好', '最佳', '最优',
+})
 
 
 class RulesEngine:
     """规则检查引擎（2025 SEO Standards）"""
 
-    def __init__(self, config: MarkdownSEOConfig):
-        self.config = config
+    def __init__(self, config: Union[MarkdownSEOConfig, CompiledConfig]):
+        self.plan = compile_config(config)
+        self.config = self.plan.config
 
     # 新增公开方法，便于独立维度评分
     def run_metadata(self, parsed: ParsedMarkdown):
@@ -111,9 +157,11 @@ class RulesEngine:
         title = parsed.title
         title_len = len(title)
         rules = self.config.title
+        locations = parsed.source_map or SourceMap()
+        title_location = locations.title()
 
         if not title:
-            diagnostics.append(DiagnosticItem(
+            diagnostics.append(DiagnosticItem.trusted(
                 category="metadata",
                 check_name="title_exists",
                 severity=SeverityLevel.CRITICAL,
@@ -126,7 +174,7 @@ class RulesEngine:
         elif title_len < rules.min_length:
             # 标题过短（<50字符）
             partial_score = 7
-            diagnostics.append(DiagnosticItem(
+            diagnostics.append(DiagnosticItem.trusted(
                 category="metadata",
                 check_name="title_length",
                 severity=SeverityLevel.WARNING,
@@ -134,13 +182,14 @@ class RulesEngine:
                 message=f"标题过短（{title_len}字符）",
                 suggestion=f"2025标准：50-60字符最优。过短的标题难以充分描述页面内容，影响点击率",
                 current_value=str(title_len),
-                expected_value=f"{rules.min_length}-{rules.max_length}"
+                expected_value=f"{rules.min_length}-{rules.max_length}",
+                location=title_location
             ))
             score += partial_score
         elif title_len > rules.max_length:
             # 标题过长（>60字符）会被SERP截断
             partial_score = 10
-            diagnostics.append(DiagnosticItem(
+            diagnostics.append(DiagnosticItem.trusted(
                 category="metadata",
                 check_name="title_length",
                 severity=SeverityLevel.INFO,
@@ -148,18 +197,20 @@ class RulesEngine:
                 message=f"标题略长（{title_len}字符）",
                 suggestion=f"超过{rules.max_length}字符会被Google截断（600px限制）。建议精简至50-60字符",
                 current_value=str(title_len),
-                expected_value=f"{rules.min_length}-{rules.max_length}"
+                expected_value=f"{rules.min_length}-{rules.max_length}",
+                location=title_location
             ))
             score += partial_score
         else:
-            diagnostics.append(DiagnosticItem(
+            diagnostics.append(DiagnosticItem.trusted(
                 category="metadata",
                 check_name="title_length",
                 severity=SeverityLevel.SUCCESS,
                 score=15,
                 message=f"标题长度最优（{title_len}字符）",
                 current_value=str(title_len),
-                expected_value=f"{rules.min_length}-{rules.max_length}"
+                expected_value=f"{rules.min_length}-{rules.max_length}",
+                location=title_location
             ))
             score += 15
 
@@ -167,9 +218,11 @@ class RulesEngine:
         desc = parsed.description
         desc_len = len(desc)
         desc_rules = self.config.description
+        # 未填写描述时取正文摘要，定位到首段
+        desc_location = locations.frontmatter_key('description', 'excerpt') or locations.paragraph(0)
 
         if not desc:
-            diagnostics.append(DiagnosticItem(
+            diagnostics.append(DiagnosticItem.trusted(
                 category="metadata",
                 check_name="description_exists",
                 severity=SeverityLevel.WARNING,
@@ -181,7 +234,7 @@ class RulesEngine:
             ))
         elif desc_len < desc_rules.min_length:
             partial_score = 4
-            diagnostics.append(DiagnosticItem(
+            diagnostics.append(DiagnosticItem.trusted(
                 category="metadata",
                 check_name="description_length",
                 severity=SeverityLevel.WARNING,
@@ -189,12 +242,13 @@ class RulesEngine:
                 message=f"描述过短（{desc_len}字符）",
                 suggestion=f"2025标准：150-160字符（920px）。移动端建议120字符内。当前描述难以充分传达内容价值",
                 current_value=str(desc_len),
-                expected_value=f"{desc_rules.min_length}-{desc_rules.max_length}"
+                expected_value=f"{desc_rules.min_length}-{desc_rules.max_length}",
+                location=desc_location
             ))
             score += partial_score
         elif desc_len > desc_rules.max_length:
             partial_score = 7
-            diagnostics.append(DiagnosticItem(
+            diagnostics.append(DiagnosticItem.trusted(
                 category="metadata",
                 check_name="description_length",
                 severity=SeverityLevel.INFO,
@@ -202,18 +256,20 @@ class RulesEngine:
                 message=f"描述略长（{desc_len}字符）",
                 suggestion=f"超过{desc_rules.max_length}字符会被截断。移动端仅显示约120字符，确保关键信息在前半部分",
                 current_value=str(desc_len),
-                expected_value=f"{desc_rules.min_length}-{desc_rules.max_length}"
+                expected_value=f"{desc_rules.min_length}-{desc_rules.max_length}",
+                location=desc_location
             ))
             score += partial_score
         else:
-            diagnostics.append(DiagnosticItem(
+            diagnostics.append(DiagnosticItem.trusted(
                 category="metadata",
                 check_name="description_length",
                 severity=SeverityLevel.SUCCESS,
                 score=10,
                 message=f"描述长度合适（{desc_len}字符）",
                 current_value=str(desc_len),
-                expected_value=f"{desc_rules.min_length}-{desc_rules.max_length}"
+                expected_value=f"{desc_rules.min_length}-{desc_rules.max_length}",
+                location=desc_location
             ))
             score += 10
 
@@ -231,6 +287,7 @@ class RulesEngine:
         """
         score = 0.0
         word_count = parsed.word_count
+        locations = parsed.source_map or SourceMap()
 
         # 标题层级检查（6分）- H1唯一性 + 足够的H2 + 层级规范
         h1_count = len(parsed.h1_tags)
@@ -259,7 +316,7 @@ class RulesEngine:
             heading_issues.append("缺少H2章节标题")
 
         if heading_score == 6:
-            diagnostics.append(DiagnosticItem(
+            diagnostics.append(DiagnosticItem.trusted(
                 category="structure",
                 check_name="heading_hierarchy",
                 severity=SeverityLevel.SUCCESS,
@@ -268,7 +325,7 @@ class RulesEngine:
                 current_value=f"H1:{h1_count}, H2:{h2_count}"
             ))
         else:
-            diagnostics.append(DiagnosticItem(
+            diagnostics.append(DiagnosticItem.trusted(
                 category="structure",
                 check_name="heading_hierarchy",
                 severity=SeverityLevel.WARNING if heading_score < 3 else SeverityLevel.INFO,
@@ -276,7 +333,9 @@ class RulesEngine:
                 message="标题结构需优化",
                 suggestion=f"问题：{'; '.join(heading_issues)}。2025标准：1个H1 + 至少{min_h2}个H2构建清晰内容结构",
                 current_value=f"H1:{h1_count}, H2:{h2_count}",
-                expected_value=f"H1:1, H2:>={min_h2}"
+                expected_value=f"H1:1, H2:>={min_h2}",
+                # 多个H1时定位到第二个H1
+                location=locations.heading(1, 1) if h1_count > 1 else None
             ))
         score += heading_score
 
@@ -286,7 +345,7 @@ class RulesEngine:
         alt_ratio = images_with_alt / total_images if total_images > 0 else 1.0
 
         if total_images == 0:
-            diagnostics.append(DiagnosticItem(
+            diagnostics.append(DiagnosticItem.trusted(
                 category="structure",
                 check_name="image_alt",
                 severity=SeverityLevel.INFO,
@@ -296,7 +355,7 @@ class RulesEngine:
             ))
             score += 3
         elif alt_ratio >= 0.8:
-            diagnostics.append(DiagnosticItem(
+            diagnostics.append(DiagnosticItem.trusted(
                 category="structure",
                 check_name="image_alt",
                 severity=SeverityLevel.SUCCESS,
@@ -307,7 +366,7 @@ class RulesEngine:
             score += 5
         else:
             alt_score = round(5 * alt_ratio, 1)
-            diagnostics.append(DiagnosticItem(
+            diagnostics.append(DiagnosticItem.trusted(
                 category="structure",
                 check_name="image_alt",
                 severity=SeverityLevel.WARNING,
@@ -315,7 +374,8 @@ class RulesEngine:
                 message=f"图片Alt覆盖不足（{images_with_alt}/{total_images}）",
                 suggestion=f"2025标准：至少80%图片需要Alt文本。Alt应描述图片内容（80-125字符），包含相关关键词",
                 current_value=f"{alt_ratio:.0%}",
-                expected_value=">=80%"
+                expected_value=">=80%",
+                location=locations.image_without_alt()
             ))
             score += alt_score
 
@@ -396,7 +456,7 @@ class RulesEngine:
             link_score = max(0, link_score - 1)
             link_severity = SeverityLevel.WARNING
 
-        diagnostics.append(DiagnosticItem(
+        diagnostics.append(DiagnosticItem.trusted(
             category="structure",
             check_name="link_density",
             severity=link_severity,
@@ -465,7 +525,7 @@ class RulesEngine:
             findings.append("有结构化答案")
 
         if struct_score >= 4.5:
-            diagnostics.append(DiagnosticItem(
+            diagnostics.append(DiagnosticItem.trusted(
                 category="structure",
                 check_name="structured_content",
                 severity=SeverityLevel.SUCCESS,
@@ -475,7 +535,7 @@ class RulesEngine:
             ))
             return 6
         elif struct_score > 0:
-            diagnostics.append(DiagnosticItem(
+            diagnostics.append(DiagnosticItem.trusted(
                 category="structure",
                 check_name="structured_content",
                 severity=SeverityLevel.INFO,
@@ -486,7 +546,7 @@ class RulesEngine:
             ))
             return struct_score
         else:
-            diagnostics.append(DiagnosticItem(
+            diagnostics.append(DiagnosticItem.trusted(
                 category="structure",
                 check_name="structured_content",
                 severity=SeverityLevel.INFO,
@@ -514,7 +574,7 @@ class RulesEngine:
         max_length = self.config.content.max_length  # 3500
 
         if optimal_length <= word_count <= max_length:
-            diagnostics.append(DiagnosticItem(
+            diagnostics.append(DiagnosticItem.trusted(
                 category="relevance",
                 check_name="content_length",
                 severity=SeverityLevel.SUCCESS,
@@ -526,7 +586,7 @@ class RulesEngine:
             ))
             score += 5
         elif min_length <= word_count < optimal_length:
-            diagnostics.append(DiagnosticItem(
+            diagnostics.append(DiagnosticItem.trusted(
                 category="relevance",
                 check_name="content_length",
                 severity=SeverityLevel.INFO,
@@ -538,7 +598,7 @@ class RulesEngine:
             ))
             score += 4
         elif word_count > max_length:
-            diagnostics.append(DiagnosticItem(
+            diagnostics.append(DiagnosticItem.trusted(
                 category="relevance",
                 check_name="content_length",
                 severity=SeverityLevel.INFO,
@@ -550,7 +610,7 @@ class RulesEngine:
             score += 4
         elif word_count >= min_length * 0.5:  # 750词
             partial = 2
-            diagnostics.append(DiagnosticItem(
+            diagnostics.append(DiagnosticItem.trusted(
                 category="relevance",
                 check_name="content_length",
                 severity=SeverityLevel.WARNING,
@@ -562,7 +622,7 @@ class RulesEngine:
             ))
             score += partial
         else:
-            diagnostics.append(DiagnosticItem(
+            diagnostics.append(DiagnosticItem.trusted(
                 category="relevance",
                 check_name="content_length",
                 severity=SeverityLevel.CRITICAL,
@@ -594,10 +654,11 @@ class RulesEngine:
         - 位置分布: 2分（Title/首段/尾段）
         """
         content = parsed.raw_content.lower()
-        word_count = parsed.word_count
+        # 抽样正文上的出现次数需以抽样字数为分母，否则密度被低估
+        word_count = parsed.sample_word_count if parsed.sampled else parsed.word_count
 
         if not keywords:
-            diagnostics.append(DiagnosticItem(
+            diagnostics.append(DiagnosticItem.trusted(
                 category="relevance",
                 check_name="keyword_coverage",
                 severity=SeverityLevel.INFO,
@@ -608,8 +669,12 @@ class RulesEngine:
 
         total_score = 0.0
 
+        # 每个关键词在正文中查找一遍并记录出现位置，覆盖率/密度/位置检查共用同一份结果
+        index = build_keyword_index(tuple(kw.lower() for kw in keywords))
+        occurrences = index.scan(content)
+
         # 1. 关键词覆盖率检查（2分）
-        keywords_found = [kw for kw in keywords if kw.lower() in content]
+        keywords_found = [kw for kw in keywords if occurrences.contains(kw.lower())]
         coverage = len(keywords_found) / len(keywords) if keywords else 0
 
         if coverage >= 0.6:
@@ -618,15 +683,15 @@ class RulesEngine:
             total_score += 1
 
         # 2. 关键词密度检查（2分）- 0.5%-2.5%为适中范围
-        density_score, density_details = self._calculate_keyword_density(content, keywords, word_count)
+        density_score, density_details = self._calculate_keyword_density(occurrences, keywords, word_count)
         total_score += density_score
 
         # 3. H标签关键词检查（2分）
-        h_tag_score, h_tag_details = self._check_keywords_in_headings(parsed, keywords)
+        h_tag_score, h_tag_details = self._check_keywords_in_headings(parsed, keywords, index)
         total_score += h_tag_score
 
         # 4. 位置分布检查（2分）- Title/首段/尾段
-        position_score, position_details = self._check_keyword_positions(parsed, keywords, content)
+        position_score, position_details = self._check_keyword_positions(parsed, keywords, occurrences, index)
         total_score += position_score
 
         # 生成综合诊断信息
@@ -637,7 +702,7 @@ class RulesEngine:
         all_details.append(position_details)
 
         if total_score >= 6:
-            diagnostics.append(DiagnosticItem(
+            diagnostics.append(DiagnosticItem.trusted(
                 category="relevance",
                 check_name="keyword_coverage",
                 severity=SeverityLevel.SUCCESS,
@@ -647,7 +712,7 @@ class RulesEngine:
                 current_value=", ".join(keywords_found[:5])
             ))
         elif total_score >= 3:
-            diagnostics.append(DiagnosticItem(
+            diagnostics.append(DiagnosticItem.trusted(
                 category="relevance",
                 check_name="keyword_coverage",
                 severity=SeverityLevel.INFO,
@@ -657,7 +722,7 @@ class RulesEngine:
                 current_value=", ".join(keywords_found[:5])
             ))
         else:
-            diagnostics.append(DiagnosticItem(
+            diagnostics.append(DiagnosticItem.trusted(
                 category="relevance",
                 check_name="keyword_coverage",
                 severity=SeverityLevel.WARNING,
@@ -668,7 +733,7 @@ class RulesEngine:
 
         return total_score
 
-    def _calculate_keyword_density(self, content: str, keywords: List[str], word_count: int) -> Tuple[float, str]:
+    def _calculate_keyword_density(self, occurrences: KeywordOccurrences, keywords: List[str], word_count: int) -> Tuple[float, str]:
         """
         计算关键词密度
 
@@ -684,8 +749,8 @@ class RulesEngine:
 
         for kw in keywords:
             kw_lower = kw.lower()
-            # 计算关键词出现次数
-            count = content.count(kw_lower)
+            # 计算关键词出现次数（非重叠计数，与str.count一致）
+            count = occurrences.count(kw_lower)
             total_keyword_count += count
             if count > 0:
                 kw_density = (count * len(kw_lower.split())) / word_count * 100
@@ -717,7 +782,12 @@ class RulesEngine:
 
         return score, detail_str
 
-    def _check_keywords_in_headings(self, parsed: ParsedMarkdown, keywords: List[str]) -> Tuple[float, str]:
+    def _check_keywords_in_headings(
+        self,
+        parsed: ParsedMarkdown,
+        keywords: List[str],
+        index: KeywordIndex
+    ) -> Tuple[float, str]:
         """
         检查关键词、变体(Variants)和实体(Entities)在H标签中的出现
 
@@ -737,17 +807,20 @@ class RulesEngine:
         all_h_text = h1_text + " " + h2_text
 
         # 1. 检查关键词
+        h1_hits = index.scan(h1_text)
+        h2_hits = index.scan(h2_text)
         for kw in keywords:
             kw_lower = kw.lower()
-            if kw_lower in h1_text:
+            if h1_hits.contains(kw_lower):
                 h1_keywords.append(kw)
-            if kw_lower in h2_text:
+            if h2_hits.contains(kw_lower):
                 h2_keywords.append(kw)
 
         # 2. 提取并检查变体(Variants)
         variants = self._extract_keyword_variants(keywords)
+        all_h_hits = build_keyword_index(tuple(var.lower() for var in variants)).scan(all_h_text)
         for var in variants:
-            if var.lower() in all_h_text:
+            if all_h_hits.contains(var.lower()):
                 h_variants.append(var)
 
         # 3. 从内容中提取实体并检查H标签
@@ -837,6 +910,18 @@ class RulesEngine:
 
         return unique_variants[:20]  # 限制最多20个变体
 
+    @staticmethod
+    def _count_matches(pattern: Pattern, content: str, extract) -> Counter:
+        """
+        统计模式匹配（与 findall 结果相同），最多取 ENTITY_TOKEN_BUDGET 个匹配
+
+        实体模式的每个匹配至少2个字符且互不重叠，文本不超过预算两倍时不可能超出预算，
+        直接 findall；更长的文本逐个产出匹配交给 Counter 计数，不生成完整匹配列表
+        """
+        if len(content) <= 2 * ENTITY_TOKEN_BUDGET:
+            return Counter(pattern.findall(content))
+        return Counter(map(extract, islice(pattern.finditer(content), ENTITY_TOKEN_BUDGET)))
+
     def _extract_entities(self, content: str) -> List[str]:
         """
         从内容中提取命名实体(Entities)
@@ -846,92 +931,65 @@ class RulesEngine:
         - 专有名词
         - 技术术语
         - 引号内的术语
+
+        专有名词、缩写、中文实体三类字符集互不相交，合并为一次分词扫描；
+        计数在C层完成（Counter），每种模式最多取 ENTITY_TOKEN_BUDGET 个匹配；
+        过滤只对去重后的候选执行。
         """
-        entities = []
-
-        # 1. 提取引号内的术语（通常是专有名词或重要术语）
-        quoted_patterns = [
-            r'"([^"]{2,30})"',
-            r"'([^']{2,30})'",
-            r'"([^"]{2,30})"',
-            r'「([^」]{2,30})」',
-            r'【([^】]{2,30})】',
-        ]
-        for pattern in quoted_patterns:
-            matches = re.findall(pattern, content)
-            entities.extend(matches)
-
-        # 2. 提取大写开头的专有名词（英文品牌名、产品名）
-        # 匹配连续的大写开头单词（如 "Google Analytics", "Meta Description"）
-        proper_noun_pattern = r'\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\b'
-        proper_nouns = re.findall(proper_noun_pattern, content)
-
-        # 过滤常见的非实体词
-        common_words = {
-            'The', 'This', 'That', 'These', 'Those', 'Here', 'There',
-            'What', 'When', 'Where', 'Why', 'How', 'Which', 'Who',
-            'First', 'Second', 'Third', 'Next', 'Last', 'Final',
-            'Table', 'Figure', 'Image', 'Chapter', 'Section', 'Part',
-            'January', 'February', 'March', 'April', 'May', 'June',
-            'July', 'August', 'September', 'October', 'November', 'December',
-            'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday',
-        }
-        for noun in proper_nouns:
-            if noun not in common_words and len(noun) >= 3:
-                entities.append(noun)
-
-        # 3. 提取技术术语（全大写缩写，如SEO, API, HTML）
-        acronym_pattern = r'\b([A-Z]{2,6})\b'
-        acronyms = re.findall(acronym_pattern, content)
-        # 过滤常见非术语缩写
-        common_acronyms = {'OK', 'OR', 'AND', 'NOT', 'THE', 'FOR', 'BUT', 'SO', 'IF'}
-        for acr in acronyms:
-            if acr not in common_acronyms:
-                entities.append(acr)
-
-        # 4. 提取中文专有名词（连续的中文词+数字组合）
-        chinese_entity_pattern = r'[\u4e00-\u9fa5]{2,8}(?:\d+(?:\.\d+)?)?'
-        chinese_entities = re.findall(chinese_entity_pattern, content)
-        # 过滤太常见的词
-        for ce in chinese_entities:
-            if len(ce) >= 3 and not self._is_common_chinese_word(ce):
-                entities.append(ce)
-
-        # 去重并按出现频率排序
-        entity_count = {}
-        for e in entities:
-            e_lower = e.lower() if e.isascii() else e
-            entity_count[e_lower] = entity_count.get(e_lower, 0) + 1
+        # 1. 引号内的术语（彼此可能重叠，逐个模式扫描；"..." 模式在原列表中出现两次，计两次）
+        quoted = Counter()
+        for pattern, weight in QUOTED_ENTITY_PATTERNS:
+            for term, times in self._count_matches(pattern, content, methodcaller('group', 1)).items():
+                quoted[term] += times * weight
+
+        # 2-4. 专有名词 / 缩写 / 中文实体：一次扫描
+        proper_nouns: Dict[str, int] = {}
+        acronyms: Dict[str, int] = {}
+        chinese_entities: Dict[str, int] = {}
+        tokens = self._count_matches(ENTITY_TOKEN_RE, content, methodcaller('groups', ''))
+        for (noun, acr, ce), times in tokens.items():
+            if noun:
+                if len(noun) >= 3 and noun not in COMMON_ENTITY_WORDS:
+                    proper_nouns[noun] = times
+            elif acr:
+                if acr not in COMMON_ACRONYMS:
+                    acronyms[acr] = times
+            elif len(ce) >= 3 and ce not in COMMON_CHINESE_WORDS:
+                chinese_entities[ce] = times
+
+        # 合并计数（按类别顺序合并，保持首次出现顺序，频率相同时排序结果不变）
+        entity_count: Dict[str, int] = {}
+        for group in (quoted, proper_nouns, acronyms, chinese_entities):
+            for e, times in group.items():
+                e_lower = e.lower() if e.isascii() else e
+                entity_count[e_lower] = entity_count.get(e_lower, 0) + times
 
         # 按频率排序，返回最常出现的实体
-        sorted_entities = sorted(entity_count.keys(), key=lambda x: entity_count[x], reverse=True)
-
-        return sorted_entities[:15]  # 返回前15个最重要的实体
+        return heapq.nlargest(15, entity_count, key=entity_count.__getitem__)  # 返回前15个最重要的实体
 
     def _is_common_chinese_word(self, word: str) -> bool:
         """判断是否为常见中文词（非实体）"""
-        common_words = {
-            '的', '是', '在', '有', '和', '与', '或', '但', '因为', '所以',
-            '这个', '那个', '如果', '可以', '需要', '应该', '可能', '已经',
-            '文章', '内容', '页面', '网站', '用户', '我们', '他们', '这些',
-            '一个', '两个', '一些', '很多', '所有', '每个', '任何', '其他',
-            '非常', '比较', '更加', '最好', '更好', '最佳', '最优',
-        }
-        return word in common_words
-
-    def _check_keyword_positions(self, parsed: ParsedMarkdown, keywords: List[str], content: str) -> Tuple[float, str]:
+        return word in COMMON_CHINESE_WORDS
+
+    def _check_keyword_positions(
+        self,
+        parsed: ParsedMarkdown,
+        keywords: List[str],
+        occurrences: KeywordOccurrences,
+        index: KeywordIndex
+    ) -> Tuple[float, str]:
         """
         检查关键词位置分布
 
-        重要位置：Title, 首段(前200字), 尾段(后200字)
+        重要位置：Title, 首段(前500字符), 尾段(后500字符)
         """
-        title = parsed.title.lower()
-        first_para = content[:500]
-        last_para = content[-500:] if len(content) > 500 else content
+        title_hits = index.scan(parsed.title.lower())
+        length = occurrences.text_length
+        last_start = length - 500 if length > 500 else 0
 
-        title_kw = [kw for kw in keywords if kw.lower() in title]
-        first_kw = [kw for kw in keywords if kw.lower() in first_para]
-        last_kw = [kw for kw in keywords if kw.lower() in last_para]
+        title_kw = [kw for kw in keywords if title_hits.contains(kw.lower())]
+        first_kw = [kw for kw in keywords if occurrences.contains_within(kw.lower(), 0, 500)]
+        last_kw = [kw for kw in keywords if occurrences.contains_within(kw.lower(), last_start, length)]
 
         # 评分（2分）
         score = 0
@@ -1037,7 +1095,7 @@ class RulesEngine:
 
         # 生成诊断信息
         if eeat_score >= 4.5:
-            diagnostics.append(DiagnosticItem(
+            diagnostics.append(DiagnosticItem.trusted(
                 category="relevance",
                 check_name="eeat_signals",
                 severity=SeverityLevel.SUCCESS,
@@ -1046,7 +1104,7 @@ class RulesEngine:
                 current_value=f"{eeat_score}/6"
             ))
         elif eeat_score > 0:
-            diagnostics.append(DiagnosticItem(
+            diagnostics.append(DiagnosticItem.trusted(
                 category="relevance",
                 check_name="eeat_signals",
                 severity=SeverityLevel.INFO,
@@ -1056,7 +1114,7 @@ class RulesEngine:
                 current_value=f"{eeat_score}/6"
             ))
         else:
-            diagnostics.append(DiagnosticItem(
+            diagnostics.append(DiagnosticItem.trusted(
                 category="relevance",
                 check_name="eeat_signals",
                 severity=SeverityLevel.WARNING,
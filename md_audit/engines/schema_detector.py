@@ -69,7 +69,7 @@ class SchemaMarkupDetector:
         if not schemas:
             # 无Schema - 0分
             diagnostics.append(
-                DiagnosticItem(
+                DiagnosticItem.trusted(
                     category="schema",
                     check_name="schema_markup_presence",
                     severity=SeverityLevel.WARNING,
@@ -103,7 +103,7 @@ class SchemaMarkupDetector:
         if not valid_schemas:
             # 有Schema但全部格式错误 - 3分
             diagnostics.append(
-                DiagnosticItem(
+                DiagnosticItem.trusted(
                     category="schema",
                     check_name="schema_markup_validity",
                     severity=SeverityLevel.CRITICAL,
@@ -141,7 +141,7 @@ class SchemaMarkupDetector:
                 for item in missing_fields_issues
             )
             diagnostics.append(
-                DiagnosticItem(
+                DiagnosticItem.trusted(
                     category="schema",
                     check_name="schema_required_fields",
                     severity=SeverityLevel.CRITICAL,
@@ -167,7 +167,7 @@ class SchemaMarkupDetector:
         # Schema完整且格式正确 - 10分
         schema_types = [s["type"] for s in complete_schemas]
         diagnostics.append(
-            DiagnosticItem(
+            DiagnosticItem.trusted(
                 category="schema",
                 check_name="schema_markup_complete",
                 severity=SeverityLevel.SUCCESS,
@@ -0,0 +1,216 @@
+"""
+批量结果列式导出（md-audit analyze <目录> -o <输出目录> --format parquet|arrow|csv）
+
+输出两张表，便于直接载入分析系统（DuckDB、pandas、数据仓库等）：
+- documents：每个文档一行，SEOReport 全部得分字段、各严重程度诊断数与关键词
+- diagnostics：每条诊断一行（含源码行列号），以 file_path 与 documents 关联
+
+报告在每个文件分析完成时即加入（按完成顺序），站点级逐页诊断（标题/描述重复等）
+在全部文件分析完成后追加到 diagnostics 表末尾，不计入 documents 表的诊断数。
+行以元组缓冲，满 BATCH_ROWS 行时整批写出：Parquet/Arrow 先整批转置为列
+（每批一个 row group / record batch），CSV 一次 writerows。内存只与批大小有关。
+
+pyarrow 为可选依赖（pip install pyarrow），未安装时 parquet/arrow 回退为CSV
+（列表列以JSON数组文本写入）。
+"""
+import csv
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+from md_audit.models.data_models import DiagnosticItem, SEOReport, SeverityLevel
+from md_audit.utils import fast_json
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+# 支持的列式格式
+COLUMNAR_FORMATS = ("parquet", "arrow", "csv")
+
+# 每批写出的行数
+BATCH_ROWS = 8192
+
+# 文件扩展名
+EXTENSIONS = {"parquet": ".parquet", "arrow": ".arrow", "csv": ".csv"}
+
+# 列类型：string / float / int / list（字符串列表）
+SCORE_FIELDS = (
+    "total_score", "metadata_score", "intent_score", "content_depth_score", "eeat_score",
+    "structure_score", "ai_search_score", "keyword_score", "schema_score", "ai_score",
+    "relevance_score", "cwv_score",
+)
+SEVERITIES = tuple(level.value for level in SeverityLevel)
+
+DOCUMENT_COLUMNS: Tuple[Tuple[str, str], ...] = (
+    ("file_path", "string"),
+    *((name, "float") for name in SCORE_FIELDS),
+    *((f"{severity}_count", "int") for severity in SEVERITIES),
+    ("diagnostic_count", "int"),
+    ("extracted_keywords", "list"),
+    ("user_keywords", "list"),
+    ("sampled_checks", "list"),
+    ("cwv_url", "string"),
+    ("ai_analyzed", "bool"),
+)
+
+DIAGNOSTIC_COLUMNS: Tuple[Tuple[str, str], ...] = (
+    ("file_path", "string"),
+    ("category", "string"),
+    ("check_name", "string"),
+    ("severity", "string"),
+    ("score", "float"),
+    ("message", "string"),
+    ("suggestion", "string"),
+    ("current_value", "string"),
+    ("expected_value", "string"),
+    ("line", "int"),
+    ("column", "int"),
+)
+
+
+def _arrow_schema(columns: Sequence[Tuple[str, str]]) -> 'pa.Schema':
+    types = {"string": pa.string(), "float": pa.float64(), "int": pa.int32(),
+             "bool": pa.bool_(), "list": pa.list_(pa.string())}
+    return pa.schema([(name, types[kind]) for name, kind in columns])
+
+
+class ColumnarTableWriter:
+    """
+    单张表的批量列式写入器
+
+    Args:
+        path: 输出文件路径（不含扩展名）
+        columns: (列名, 类型) 列表
+        fmt: parquet / arrow / csv
+    """
+
+    def __init__(self, path: Path, columns: Sequence[Tuple[str, str]], fmt: str):
+        self.fmt = fmt
+        self.columns = tuple(columns)
+        self.path = path.with_suffix(EXTENSIONS[fmt])
+        self.rows = 0
+        self._buffer: List[tuple] = []
+        self._list_columns = [i for i, (_, kind) in enumerate(self.columns) if kind == "list"]
+        self._file = None
+        self._writer = None
+        if fmt == "csv":
+            self._file = open(self.path, "w", encoding="utf-8", newline="")
+            self._writer = csv.writer(self._file)
+            self._writer.writerow([name for name, _ in self.columns])
+        else:
+            self._schema = _arrow_schema(self.columns)
+            if fmt == "parquet":
+                self._writer = pq.ParquetWriter(str(self.path), self._schema)
+            else:
+                self._file = pa.OSFile(str(self.path), "wb")
+                self._writer = pa.ipc.new_file(self._file, self._schema)
+
+    def append(self, row: tuple) -> None:
+        self._buffer.append(row)
+        if len(self._buffer) >= BATCH_ROWS:
+            self.flush()
+
+    def flush(self) -> None:
+        rows = self._buffer
+        if not rows:
+            return
+        if self.fmt == "csv":
+            if self._list_columns:
+                # 列表列写为JSON数组文本
+                rows = [list(row) for row in rows]
+                for row in rows:
+                    for i in self._list_columns:
+                        row[i] = fast_json.dumps(row[i]).decode("utf-8")
+            self._writer.writerows(rows)
+        else:
+            batch = pa.record_batch([list(column) for column in zip(*rows)], schema=self._schema)
+            if self.fmt == "parquet":
+                self._writer.write_table(pa.Table.from_batches([batch]))
+            else:
+                self._writer.write_batch(batch)
+        self.rows += len(self._buffer)
+        self._buffer = []
+
+    def close(self) -> None:
+        self.flush()
+        if self._writer is not None and self.fmt != "csv":
+            self._writer.close()
+        if self._file is not None:
+            self._file.close()
+
+
+class ColumnarExporter:
+    """
+    批量结果导出（documents 与 diagnostics 两张表）
+
+    Args:
+        output_dir: 输出目录
+        base_dir: 分析目录（file_path 列为相对路径）
+        fmt: parquet / arrow / csv；未安装pyarrow时 parquet/arrow 回退为csv
+    """
+
+    def __init__(self, output_dir: str, base_dir: str, fmt: str = "parquet"):
+        if fmt not in COLUMNAR_FORMATS:
+            raise ValueError(f"不支持的导出格式: {fmt}")
+        if fmt != "csv" and not HAS_PYARROW:
+            print(f"[警告] pyarrow未安装，无法导出{fmt}，改为CSV（pip install pyarrow）")
+            fmt = "csv"
+        self.fmt = fmt
+        self.base_dir = Path(base_dir)
+        output = Path(output_dir)
+        output.mkdir(parents=True, exist_ok=True)
+        self.documents = ColumnarTableWriter(output / "documents", DOCUMENT_COLUMNS, fmt)
+        self.diagnostics = ColumnarTableWriter(output / "diagnostics", DIAGNOSTIC_COLUMNS, fmt)
+
+    def _rel_path(self, report: SEOReport) -> str:
+        try:
+            return Path(report.file_path).relative_to(self.base_dir).as_posix()
+        except ValueError:
+            return report.file_path
+
+    def _add_diagnostic(self, file_path: str, item: DiagnosticItem) -> None:
+        self.diagnostics.append((
+            file_path, item.category, item.check_name, item.severity.value, item.score,
+            item.message, item.suggestion, item.current_value, item.expected_value,
+            item.line, item.column,
+        ))
+
+    def add(self, report: SEOReport) -> None:
+        file_path = self._rel_path(report)
+        counts = dict.fromkeys(SEVERITIES, 0)
+        for item in report.diagnostics:
+            counts[item.severity.value] += 1
+            self._add_diagnostic(file_path, item)
+        self.documents.append((
+            file_path,
+            *(float(getattr(report, name)) for name in SCORE_FIELDS),
+            *(counts[severity] for severity in SEVERITIES),
+            len(report.diagnostics),
+            list(report.extracted_keywords),
+            list(report.user_keywords),
+            list(report.sampled_checks),
+            report.cwv_url,
+            report.ai_analysis is not None,
+        ))
+
+    def add_diagnostics(self, rel_path: str, diagnostics: Sequence[DiagnosticItem]) -> None:
+        """追加一个文件的站点级诊断行（rel_path 相对分析目录，不计入 documents 表）"""
+        for item in diagnostics:
+            self._add_diagnostic(rel_path, item)
+
+    def close(self) -> List[Path]:
+        """写出剩余批次并关闭文件，返回输出文件路径"""
+        self.documents.close()
+        self.diagnostics.close()
+        return [self.documents.path, self.diagnostics.path]
+
+    def __enter__(self) -> 'ColumnarExporter':
+        return self
+
+    def __exit__(self, *exc) -> Optional[bool]:
+        self.close()
+        return None
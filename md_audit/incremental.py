@@ -0,0 +1,284 @@
+"""
+基于 git 的增量分析（md-audit analyze <目录> --since <git-ref>）
+
+只重新分析相对 <git-ref> 新增或修改的 Markdown 文件，其余文件复用报告缓存，
+汇总仍覆盖整个目录：
+- 变更文件：git diff --name-only <ref>（含工作区修改）与未跟踪文件
+- 缓存有效性：配置指纹 + 用户关键词；每条报告记录所分析内容的 git blob 哈希，
+  未变更文件与 <ref> 中的 blob（git ls-tree）一致时才复用，
+  缓存生成于其他提交时不会误用过期报告
+- 无可用缓存时回退为完整分析并写入缓存
+- 缓存默认写在仓库的git目录下（.git/md-audit/），不出现在工作区的未跟踪文件中
+
+git 列表操作均由本地 git 完成，不读取未变更文件，耗时与变更规模成正比。
+"""
+import hashlib
+import os
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from md_audit.corpus.features import DocumentFeatures
+from md_audit.models.data_models import SEOReport
+from md_audit.utils import fast_json
+from md_audit.utils.file_walker import FileWalker
+
+# 缓存文件格式版本（结构变化时递增，旧缓存自动失效）
+CACHE_VERSION = 5
+
+# --since 未指定 --cache 时，缓存文件所在目录（相对仓库的git目录）
+DEFAULT_CACHE_DIR = "md-audit"
+
+
+class GitError(RuntimeError):
+    """git 不可用、目录不在仓库中或引用无效"""
+
+
+def _git(root: str, *args: str) -> str:
+    try:
+        result = subprocess.run(
+            ["git", "-C", root, *args],
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=False
+        )
+    except FileNotFoundError:
+        raise GitError("未找到git可执行文件")
+    if result.returncode != 0:
+        message = result.stderr.decode("utf-8", errors="replace").strip()
+        raise GitError(message or f"git {args[0]} 失败（退出码 {result.returncode}）")
+    return result.stdout.decode("utf-8", errors="surrogateescape")
+
+
+def _split_z(output: str) -> List[str]:
+    return [item for item in output.split("\0") if item]
+
+
+def git_changed_files(root: str, since: str, walker: Optional[FileWalker] = None) -> Tuple[Set[str], Dict[str, str]]:
+    """
+    列出目录下相对 since 变更的 Markdown 文件
+
+    Args:
+        root: 分析目录（需位于git工作区内）
+        since: git引用（分支、标签、提交）
+        walker: 文件过滤规则（与目录遍历一致，默认 FileWalker(root)）
+
+    Returns:
+        (新增、修改或删除的文件相对路径集合, {未变更文件相对路径: since中的blob哈希})，
+        路径均相对 root，使用 "/" 分隔
+    """
+    walker = walker or FileWalker(root)
+    # 路径相对当前目录（-C root）输出，并限定在 root 之内；含已删除文件（由调用方按存在性区分）
+    changed = {
+        p for p in _split_z(_git(root, "diff", "--name-only", "--relative", "-z", since, "--", "."))
+        if walker.matches(p)
+    }
+    changed.update(
+        p for p in _split_z(_git(root, "ls-files", "--others", "--exclude-standard", "-z", "--", "."))
+        if walker.matches(p)
+    )
+
+    # ls-tree 每行：<mode> <type> <blob>\t<path>
+    unchanged: Dict[str, str] = {}
+    for entry in _split_z(_git(root, "ls-tree", "-r", "-z", since, "--", ".")):
+        meta, _, path = entry.partition("\t")
+        if path not in changed and walker.matches(path):
+            unchanged[path] = meta.split()[2]
+    return changed, unchanged
+
+
+def default_cache_path(root: str) -> str:
+    """
+    --since 的默认报告缓存路径：<git目录>/md-audit/report-cache-<目录哈希>.json
+
+    放在git目录下不会被 git ls-files --others 列为未跟踪文件；
+    文件名按分析目录在仓库中的相对位置区分，同一仓库的不同目录各自缓存
+
+    Raises:
+        GitError: git不可用或目录不在仓库中
+    """
+    git_dir, prefix = _git(root, "rev-parse", "--absolute-git-dir", "--show-prefix").splitlines()[:2]
+    name = hashlib.sha1(prefix.encode("utf-8", errors="surrogateescape")).hexdigest()[:12]
+    return str(Path(git_dir) / DEFAULT_CACHE_DIR / f"report-cache-{name}.json")
+
+
+def git_blob_hash(data: bytes) -> str:
+    """与 git hash-object 一致的blob哈希（用于与 ls-tree 结果比对）"""
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+class ReportCache:
+    """
+    报告缓存（单个JSON文件）
+
+    键为相对分析目录的文件路径，值为报告与所分析内容的blob哈希；
+    配置指纹、关键词或格式版本不一致时整体视为空
+    """
+
+    def __init__(self, path: str, fingerprint: str, user_keywords: Optional[List[str]] = None):
+        self.path = Path(path)
+        self.fingerprint = fingerprint
+        self.user_keywords = list(user_keywords or [])
+        self.entries: Dict[str, dict] = {}
+
+    def load(self) -> bool:
+        """读取缓存；文件不存在、损坏或与当前配置不匹配时返回False"""
+        try:
+            data = fast_json.loads(self.path.read_bytes())
+        except (OSError, ValueError):
+            return False
+        if (not isinstance(data, dict)
+                or data.get("version") != CACHE_VERSION
+                or data.get("fingerprint") != self.fingerprint
+                or data.get("keywords") != self.user_keywords):
+            return False
+        self.entries = data.get("files") or {}
+        return True
+
+    def get(self, rel_path: str, blob: str, file_path: str,
+            require_features: bool = False) -> Optional[SEOReport]:
+        """
+        blob哈希一致时返回缓存的报告（文件路径替换为本次调用的路径）
+
+        require_features=True 时，未缓存文档特征的条目视为未命中
+        """
+        entry = self.entries.get(rel_path)
+        if entry is None or entry.get("blob") != blob:
+            return None
+        features = entry.get("features")
+        if require_features and features is None:
+            return None
+        try:
+            report = SEOReport.model_validate(entry["report"])
+        except (KeyError, ValueError):
+            return None
+        report.file_path = file_path
+        if features is not None:
+            report.corpus_features = DocumentFeatures.from_dict(features)
+        return report
+
+    def put(self, rel_path: str, report: SEOReport, blob: str) -> None:
+        entry = {"blob": blob, "report": report.model_dump(mode="json")}
+        if report.corpus_features is not None:
+            entry["features"] = report.corpus_features.to_dict()
+        self.entries[rel_path] = entry
+
+    def prune(self, keep: Set[str]) -> None:
+        """只保留 keep 中的条目（调用方传入仍存在的文件，已删除文件的条目随之移除）"""
+        for rel_path in [p for p in self.entries if p not in keep]:
+            del self.entries[rel_path]
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        tmp_path.write_bytes(fast_json.dumps({
+            "version": CACHE_VERSION,
+            "fingerprint": self.fingerprint,
+            "keywords": self.user_keywords,
+            "files": self.entries,
+        }))
+        os.replace(tmp_path, self.path)  # 原子替换，中断时不留下半截缓存
+
+
+def report_fingerprint(analyzer, document_frequency=None) -> str:
+    """缓存指纹：配置指纹，TF-IDF关键词模式单独区分（两种模式的报告不能互相复用）"""
+    fingerprint = analyzer.compiled.fingerprint
+    return fingerprint + "+tfidf" if document_frequency is not None else fingerprint
+
+
+def _rel_key(report: SEOReport, root: Path) -> str:
+    return Path(report.file_path).relative_to(root).as_posix()
+
+
+def _store(cache: ReportCache, reports: List[SEOReport], root: Path) -> None:
+    for report in reports:
+        try:
+            data = Path(report.file_path).read_bytes()
+        except OSError:
+            continue
+        cache.put(_rel_key(report, root), report, git_blob_hash(data))
+
+
+def save_report_cache(
+    reports: List[SEOReport],
+    directory: str,
+    cache_path: str,
+    fingerprint: str,
+    user_keywords: Optional[List[str]] = None
+) -> None:
+    """以完整分析的结果写入报告缓存（供后续 --since 复用）"""
+    cache = ReportCache(cache_path, fingerprint, user_keywords)
+    _store(cache, reports, Path(directory))
+    cache.save()
+
+
+def analyze_since(
+    analyzer,
+    directory: str,
+    since: str,
+    cache_path: str,
+    user_keywords: Optional[List[str]] = None,
+    max_workers: int = 4,
+    profile: bool = False,
+    walk_options: Optional[dict] = None,
+    corpus=None,
+    document_frequency=None,
+    on_report=None
+) -> List[SEOReport]:
+    """
+    增量分析目录：只分析相对 since 变更的文件，其余复用缓存报告
+
+    corpus 为站点级检查（CorpusAuditor）时，缓存的报告连同文档特征一并加入；
+    document_frequency 为语料文档频率表时（TF-IDF关键词模式）只复用同模式的缓存，
+    未变更文件的关键词沿用生成缓存时的文档频率。
+    on_report 在每个报告可用时调用（缓存报告读取时、新报告完成时，流式输出边分析边写出），
+    返回值写入缓存与结果列表，因此应返回完整报告
+
+    Returns:
+        整个目录的报告列表（变更文件为新报告，其余来自缓存）
+
+    Raises:
+        GitError: git不可用、目录不在仓库中或引用无效
+    """
+    root = Path(directory)
+    walk_options = walk_options or {}
+    changed, unchanged = git_changed_files(str(root), since, FileWalker(str(root), **walk_options))
+    cache = ReportCache(cache_path, report_fingerprint(analyzer, document_frequency), user_keywords)
+
+    if not cache.load():
+        print(f"[警告] 报告缓存不可用（{cache_path}），本次完整分析目录并写入缓存")
+        reports = analyzer.analyze_directory(
+            str(root), user_keywords=user_keywords, max_workers=max_workers, profile=profile,
+            corpus=corpus, document_frequency=document_frequency, on_report=on_report, **walk_options
+        )
+        save_report_cache(reports, str(root), cache_path, cache.fingerprint, user_keywords)
+        return reports
+
+    reports: List[SEOReport] = []
+    targets = {p for p in changed if (root / p).is_file()}
+    for rel_path, blob in unchanged.items():
+        report = cache.get(rel_path, blob, str(root / rel_path), require_features=corpus is not None)
+        if report is not None:
+            if corpus is not None:
+                corpus.add(report)
+            reports.append(on_report(report) if on_report is not None else report)
+        elif (root / rel_path).is_file():
+            targets.add(rel_path)  # 缓存缺失或生成于其他内容：补充分析
+
+    print(f"相对 {since} 变更 {len(changed)} 个文件，复用缓存 {len(reports)} 个，"
+          f"需分析 {len(targets)} 个")
+    results = analyzer.analyze_files(
+        [str(root / p) for p in sorted(targets)],
+        user_keywords=user_keywords, max_workers=max_workers, profile=profile, corpus=corpus,
+        document_frequency=document_frequency, on_report=on_report
+    )
+    fresh = [report for report in results.values() if report is not None]
+    failed = [path for path, report in results.items() if report is None]
+    if failed:
+        print(f"❌ 失败: {len(failed)} 个文件")
+
+    _store(cache, fresh, root)
+    # 已删除的文件只出现在 changed 中且不在 targets 里
+    cache.prune(targets | set(unchanged))
+    cache.save()
+    reports.extend(fresh)
+    reports.sort(key=lambda r: r.file_path)
+    return reports
@@ -0,0 +1,385 @@
+"""
+语言服务器（md-audit lsp）
+
+通过标准输入输出提供 Language Server Protocol（JSON-RPC 2.0，Content-Length 分帧），
+编辑器（VS Code、Neovim 等）在作者输入时显示SEO诊断：
+- 文档同步为增量模式：didChange 只发送编辑的范围，服务端维护文档全文
+- 每个打开的文档持有一个分段缓存（SectionCache），只重新解析内容变化的章节，
+  文档级评分由缓存的章节结果汇总后重新计算
+- 分析在主循环中串行进行，分析期间到达的编辑在下一轮合并，只分析最新版本
+- 诊断位置按 UTF-16 代码单元计列（LSP 默认位置编码）
+
+AI语义分析每次都需调用LLM，无法跟上逐键编辑，LSP模式下始终禁用。
+标准输出专用于协议消息，分析过程中的打印重定向到标准错误。
+"""
+import json
+import queue
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import IO, Dict, List, Optional
+from urllib.parse import unquote, urlparse
+
+from md_audit.models.data_models import SeverityLevel
+from md_audit.parsers.section_cache import SectionCache
+
+SERVER_NAME = "md-audit"
+SERVER_VERSION = "1.0.0"
+
+# 文档同步方式：2 = Incremental
+TEXT_DOCUMENT_SYNC_INCREMENTAL = 2
+
+# JSON-RPC 错误码
+PARSE_ERROR = -32700
+METHOD_NOT_FOUND = -32601
+SERVER_NOT_INITIALIZED = -32002
+
+# 诊断严重程度（critical/warning/info -> Error/Warning/Information；success 为通过项，不发布）
+LSP_SEVERITIES = {
+    SeverityLevel.CRITICAL: 1,
+    SeverityLevel.WARNING: 2,
+    SeverityLevel.INFO: 3,
+}
+
+# window/logMessage 类型
+LOG_ERROR = 1
+LOG_DEBUG = 4
+
+
+@dataclass
+class OpenDocument:
+    """编辑器中打开的文档"""
+    uri: str
+    text: str
+    version: Optional[int]
+    sections: SectionCache
+    dirty: bool = True
+
+
+def uri_to_path(uri: str) -> str:
+    """file:// URI -> 本地路径（其他scheme原样返回，仅用作报告中的路径）"""
+    parsed = urlparse(uri)
+    if parsed.scheme != "file":
+        return uri
+    path = unquote(parsed.path)
+    # Windows: file:///C:/docs/a.md
+    if len(path) > 2 and path[0] == "/" and path[2] == ":":
+        path = path[1:]
+    return path
+
+
+def utf16_length(text: str) -> int:
+    """文本的UTF-16代码单元数"""
+    if text.isascii():
+        return len(text)
+    return len(text.encode("utf-16-le")) // 2
+
+
+def _utf16_index(line: str, units: int) -> int:
+    """行内UTF-16列号 -> 字符下标（超出行尾时为行尾）"""
+    if line.isascii():
+        return min(units, len(line))
+    count = 0
+    for index, char in enumerate(line):
+        if count >= units:
+            return index
+        count += 2 if ord(char) > 0xFFFF else 1
+    return len(line)
+
+
+def _offset(text: str, position: dict) -> int:
+    """LSP位置 {line, character} -> 文本下标"""
+    line = position["line"]
+    start = 0
+    for _ in range(line):
+        start = text.find("\n", start) + 1
+        if start == 0:
+            return len(text)
+    end = text.find("\n", start)
+    if end == -1:
+        end = len(text)
+    return start + _utf16_index(text[start:end], position["character"])
+
+
+def apply_changes(text: str, changes: List[dict]) -> str:
+    """按顺序应用 didChange 的 contentChanges（带range为增量编辑，否则为全文替换）"""
+    for change in changes:
+        edit_range = change.get("range")
+        if edit_range is None:
+            text = change["text"]
+        else:
+            start = _offset(text, edit_range["start"])
+            end = _offset(text, edit_range["end"])
+            text = text[:start] + change["text"] + text[end:]
+    return text
+
+
+def to_lsp_diagnostics(diagnostics, text: str) -> List[dict]:
+    """
+    报告诊断项 -> LSP Diagnostic
+
+    带行列号的诊断从所在列标注到行尾；文档级诊断标注在首行
+    """
+    lines = text.split("\n")
+    result = []
+    for item in diagnostics:
+        severity = LSP_SEVERITIES.get(item.severity)
+        if severity is None:
+            continue
+        line = item.line - 1 if item.line is not None and item.line <= len(lines) else 0
+        line_text = lines[line].rstrip("\r") if lines else ""
+        start = utf16_length(line_text[:(item.column or 1) - 1]) if item.line is not None else 0
+        message = item.message if not item.suggestion else f"{item.message}。建议：{item.suggestion}"
+        result.append({
+            "range": {
+                "start": {"line": line, "character": start},
+                "end": {"line": line, "character": max(start, utf16_length(line_text))},
+            },
+            "severity": severity,
+            "code": f"{item.category}/{item.check_name}",
+            "source": SERVER_NAME,
+            "message": message,
+        })
+    return result
+
+
+# ===== 传输层 =====
+
+def read_message(reader: IO[bytes]) -> Optional[dict]:
+    """
+    读取一条消息
+
+    Returns:
+        消息对象；输入结束时返回None
+
+    Raises:
+        ValueError: 头部缺少 Content-Length 或消息体不是合法JSON
+    """
+    length = None
+    while True:
+        line = reader.readline()
+        if not line:
+            return None
+        line = line.strip()
+        if not line:
+            if length is None:
+                continue  # 消息之间多余的空行
+            break
+        name, _, value = line.decode("ascii", "replace").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value.strip())
+    body = reader.read(length)
+    if len(body) < length:
+        return None
+    return json.loads(body)
+
+
+class MessageWriter:
+    """写出消息（主循环与读取线程都可能发送，加锁保证分帧完整）"""
+
+    def __init__(self, writer: IO[bytes]):
+        self._writer = writer
+        self._lock = threading.Lock()
+
+    def send(self, payload: dict) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        with self._lock:
+            self._writer.write(b"Content-Length: %d\r\n\r\n" % len(body) + body)
+            self._writer.flush()
+
+
+# ===== 服务端 =====
+
+class LanguageServer:
+    """
+    md-audit 语言服务器
+
+    Args:
+        analyzer: 已预热的 MarkdownSEOAnalyzer（应已禁用AI）
+        reader: 协议输入（二进制流）
+        writer: 协议输出（二进制流）
+        keywords: 用户关键词（应用于所有文档，为空时自动提取）
+    """
+
+    def __init__(self, analyzer, reader: IO[bytes], writer: IO[bytes],
+                 keywords: Optional[List[str]] = None):
+        self.analyzer = analyzer
+        self.keywords = keywords or []
+        self.documents: Dict[str, OpenDocument] = {}
+        self._reader = reader
+        self._out = MessageWriter(writer)
+        self._inbox: "queue.Queue[Optional[dict]]" = queue.Queue()
+        self._initialized = False
+        self._shutdown = False
+
+    # ----- 主循环 -----
+
+    def serve(self) -> int:
+        """处理消息直至收到 exit（返回进程退出码）或输入结束"""
+        threading.Thread(target=self._read_loop, daemon=True).start()
+        while True:
+            message = self._inbox.get()
+            while True:
+                if message is None:
+                    return 0 if self._shutdown else 1
+                if message.get("method") == "exit":
+                    return 0 if self._shutdown else 1
+                self._dispatch(message)
+                # 合并已到达的消息，连续编辑只分析最终文本
+                try:
+                    message = self._inbox.get_nowait()
+                except queue.Empty:
+                    break
+            self._analyze_dirty()
+
+    def _read_loop(self) -> None:
+        try:
+            while True:
+                try:
+                    message = read_message(self._reader)
+                except (ValueError, UnicodeDecodeError) as e:
+                    self._out.send({"jsonrpc": "2.0", "id": None,
+                                    "error": {"code": PARSE_ERROR, "message": str(e)}})
+                    continue
+                self._inbox.put(message)
+                if message is None:
+                    return
+        except OSError:
+            self._inbox.put(None)
+
+    # ----- 消息分发 -----
+
+    def _dispatch(self, message: dict) -> None:
+        method = message.get("method")
+        msg_id = message.get("id")
+        params = message.get("params") or {}
+        if method is None:
+            return  # 客户端对服务端请求的响应（本服务不发请求）
+
+        if method == "initialize":
+            self._initialized = True
+            self._respond(msg_id, {
+                "capabilities": {
+                    "positionEncoding": "utf-16",
+                    "textDocumentSync": {
+                        "openClose": True,
+                        "change": TEXT_DOCUMENT_SYNC_INCREMENTAL,
+                        "save": {"includeText": False},
+                    },
+                },
+                "serverInfo": {"name": SERVER_NAME, "version": SERVER_VERSION},
+            })
+            return
+        if not self._initialized:
+            if msg_id is not None:
+                self._error(msg_id, SERVER_NOT_INITIALIZED, "服务未初始化")
+            return
+        if method == "shutdown":
+            self._shutdown = True
+            self._respond(msg_id, None)
+            return
+
+        handler = self._notifications.get(method)
+        if handler is not None:
+            handler(self, params)
+        elif msg_id is not None:
+            self._error(msg_id, METHOD_NOT_FOUND, f"不支持的方法: {method}")
+
+    def _did_open(self, params: dict) -> None:
+        doc = params["textDocument"]
+        self.documents[doc["uri"]] = OpenDocument(
+            uri=doc["uri"],
+            text=doc["text"],
+            version=doc.get("version"),
+            sections=SectionCache(self.analyzer.parser),
+        )
+
+    def _did_change(self, params: dict) -> None:
+        doc = params["textDocument"]
+        document = self.documents.get(doc["uri"])
+        if document is None:
+            return
+        document.text = apply_changes(document.text, params.get("contentChanges") or [])
+        document.version = doc.get("version")
+        document.dirty = True
+
+    def _did_close(self, params: dict) -> None:
+        uri = params["textDocument"]["uri"]
+        if self.documents.pop(uri, None) is not None:
+            self._notify("textDocument/publishDiagnostics", {"uri": uri, "diagnostics": []})
+
+    _notifications = {
+        "initialized": lambda self, params: None,
+        "textDocument/didOpen": _did_open,
+        "textDocument/didChange": _did_change,
+        "textDocument/didSave": lambda self, params: None,  # 内容已随 didChange 同步
+        "textDocument/didClose": _did_close,
+    }
+
+    # ----- 分析 -----
+
+    def _analyze_dirty(self) -> None:
+        for document in list(self.documents.values()):
+            if document.dirty:
+                document.dirty = False
+                self._publish(document)
+
+    def _publish(self, document: OpenDocument) -> None:
+        start = time.perf_counter()
+        try:
+            report = self.analyzer.analyze(
+                uri_to_path(document.uri),
+                user_keywords=self.keywords,
+                text=document.text,
+                sections=document.sections,
+            )
+        except Exception as e:
+            self._log(LOG_ERROR, f"分析失败 {document.uri}: {type(e).__name__}: {e}")
+            return
+        self._notify("textDocument/publishDiagnostics", {
+            "uri": document.uri,
+            "version": document.version,
+            "diagnostics": to_lsp_diagnostics(report.diagnostics, document.text),
+        })
+        elapsed = (time.perf_counter() - start) * 1000
+        self._log(LOG_DEBUG, f"{document.uri} 总分 {report.total_score:.1f}（分析 {elapsed:.1f}ms）")
+
+    # ----- 输出 -----
+
+    def _respond(self, msg_id, result) -> None:
+        self._out.send({"jsonrpc": "2.0", "id": msg_id, "result": result})
+
+    def _error(self, msg_id, code: int, message: str) -> None:
+        self._out.send({"jsonrpc": "2.0", "id": msg_id, "error": {"code": code, "message": message}})
+
+    def _notify(self, method: str, params: dict) -> None:
+        self._out.send({"jsonrpc": "2.0", "method": method, "params": params})
+
+    def _log(self, level: int, message: str) -> None:
+        self._notify("window/logMessage", {"type": level, "message": message})
+
+
+def run_server(config_path: Optional[str] = None, keywords: Optional[List[str]] = None) -> int:
+    """在标准输入输出上运行语言服务器"""
+    from md_audit.analyzer import MarkdownSEOAnalyzer
+    from md_audit.config import load_config
+
+    # 读取线程阻塞在readline时持有缓冲区锁；使用独立的读取对象，
+    # 避免解释器退出时清理 sys.stdin 等待该锁而无法退出
+    reader = open(sys.stdin.fileno(), "rb", closefd=False)
+    writer = sys.stdout.buffer
+    # 分析栈的提示信息（[警告]等）不能混入协议输出
+    sys.stdout = sys.stderr
+
+    config = load_config(config_path)
+    config.enable_ai_analysis = False
+    analyzer = MarkdownSEOAnalyzer(config)
+    # 预热jieba词典，首次编辑不承担加载耗时
+    analyzer.parser.extract_keywords("预热 warm up", max_keywords=1)
+
+    server = LanguageServer(analyzer, reader, writer, keywords)
+    try:
+        return server.serve()
+    except KeyboardInterrupt:
+        return 1
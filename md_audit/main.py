@@ -1,10 +1,15 @@
+from __future__ import annotations
+
 import argparse
+import sys
 from pathlib import Path
-from typing import List
-from md_audit.config import load_config
-from md_audit.analyzer import MarkdownSEOAnalyzer
-from md_audit.reporter import MarkdownReporter
-from md_audit.models.data_models import SEOReport
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+# 分析器、解析器依赖（markdown/bs4/jieba/pydantic等）在执行analyze时才导入，
+# --help、serve 与 --startup-profile 不加载
+if TYPE_CHECKING:
+    from md_audit.corpus import CorpusAuditor
+    from md_audit.models.data_models import SEOReport
 
 
 def main():
@@ -19,6 +24,9 @@ def main():
         """
     )
 
+    parser.add_argument('--startup-profile', action='store_true',
+                        help='以 -X importtime 重新执行命令，输出首次输出耗时与导入耗时分解')
+
     subparsers = parser.add_subparsers(dest='command', help='子命令')
 
     # analyze子命令
@@ -29,6 +37,60 @@ def main():
     analyze_parser.add_argument('-o', '--output', type=str, help='输出报告路径（文件或目录）')
     analyze_parser.add_argument('--no-ai', action='store_true', help='禁用AI分析')
     analyze_parser.add_argument('--workers', type=int, default=4, help='批量分析时的并发工作线程数（默认4）')
+    analyze_parser.add_argument('--profile', action='store_true', help='记录各分析阶段的墙钟/CPU耗时并写入报告')
+    analyze_parser.add_argument('--no-daemon', action='store_true', help='单文件分析时不转发给守护进程，直接在进程内分析')
+    analyze_parser.add_argument('--since', type=str, metavar='GIT_REF',
+                                help='目录模式：只分析相对该git引用变更的文件，其余复用报告缓存')
+    analyze_parser.add_argument('--cache', type=str,
+                                help='报告缓存文件（目录模式下写入；--since 时默认写在仓库的 .git/md-audit/ 下）')
+    _add_walk_arguments(analyze_parser)
+    analyze_parser.add_argument('--no-corpus', action='store_true',
+                                help='目录模式下不做站点级检查（站内链接等）')
+    analyze_parser.add_argument('--index-page', type=str,
+                                help='站点首页（相对目录，默认自动查找index.md/README.md），用于计算链接深度')
+    analyze_parser.add_argument('--format', choices=['markdown', 'parquet', 'arrow', 'csv', 'jsonl', 'sarif'],
+                                default='markdown',
+                                help='目录模式的输出格式：markdown（每文件一个报告，按源目录结构存放，默认）、'
+                                     '列式表（documents/diagnostics 两张表，parquet/arrow 需 pyarrow，未安装时回退CSV）、'
+                                     'jsonl（reports.jsonl，每行一个报告）或 sarif（md-audit.sarif，供CI显示内联标注）；'
+                                     '非markdown格式在每个文件分析完成时即写出')
+    analyze_parser.add_argument('--tfidf', action='store_true',
+                                help='目录模式：先统计全目录文档频率，自动提取的关键词按TF-IDF排序')
+    analyze_parser.add_argument('--df-cache', type=str,
+                                help='文档频率表文件（--tfidf 时读写，默认 <目录>/.md-audit-df.json）')
+
+    # watch子命令（监听目录，增量分析）
+    watch_parser = subparsers.add_parser('watch', help='监听目录，仅重新分析变更的Markdown文件')
+    watch_parser.add_argument('path', type=str, help='监听的目录路径')
+    watch_parser.add_argument('-k', '--keywords', nargs='+', help='目标关键词（可选）')
+    watch_parser.add_argument('--config', type=str, help='配置文件路径（可选）')
+    watch_parser.add_argument('-o', '--output', type=str, help='报告输出目录（单文件报告与SUMMARY.md增量更新）')
+    watch_parser.add_argument('--no-ai', action='store_true', help='禁用AI分析')
+    watch_parser.add_argument('--workers', type=int, default=4, help='并发工作线程数（默认4）')
+    watch_parser.add_argument('--debounce', type=float, default=0.3, help='合并连续保存的静默时间（秒，默认0.3）')
+    watch_parser.add_argument('--interval', type=float, default=1.0, help='轮询模式的扫描间隔（秒，默认1）')
+    watch_parser.add_argument('--polling', action='store_true', help='强制使用轮询（不使用inotify）')
+    _add_walk_arguments(watch_parser)
+    watch_parser.add_argument('--no-corpus', action='store_true',
+                              help='不做站点级检查（站内链接等），SUMMARY.md 只含得分汇总')
+    watch_parser.add_argument('--index-page', type=str,
+                              help='站点首页（相对目录，默认自动查找index.md/README.md），用于计算链接深度')
+
+    # daemon子命令（常驻预热分析器）
+    daemon_parser = subparsers.add_parser('daemon', help='启动常驻分析守护进程（Unix域套接字）')
+    daemon_parser.add_argument('--socket', type=str, help='套接字路径（默认$MD_AUDIT_DAEMON_SOCKET或运行时目录）')
+    daemon_parser.add_argument('--config', type=str, help='预热时使用的配置文件路径（可选）')
+    daemon_parser.add_argument('--no-ai', action='store_true', help='预热禁用AI的分析器')
+    daemon_parser.add_argument('--idle-timeout', type=float, default=0, help='空闲多少秒后自动退出（默认0，不退出）')
+    daemon_parser.add_argument('--status', action='store_true', help='查询守护进程状态')
+    daemon_parser.add_argument('--stop', action='store_true', help='停止守护进程')
+
+    # lsp子命令（语言服务器）
+    lsp_parser = subparsers.add_parser('lsp', help='以语言服务器（LSP，标准输入输出）模式运行，编辑时实时诊断')
+    lsp_parser.add_argument('-k', '--keywords', nargs='+', help='目标关键词（可选，应用于所有文档）')
+    lsp_parser.add_argument('--config', type=str, help='配置文件路径（可选）')
+    lsp_parser.add_argument('--stdio', action='store_true',
+                            help='通过标准输入输出通信（默认方式，兼容编辑器客户端传入的参数）')
 
     # serve子命令（Web服务）
     serve_parser = subparsers.add_parser('serve', help='启动Web服务')
@@ -38,7 +100,20 @@ def main():
 
     args = parser.parse_args()
 
+    if args.startup_profile:
+        from md_audit.utils.startup_profile import run as run_startup_profile
+        return run_startup_profile([a for a in sys.argv[1:] if a != '--startup-profile'])
+
     if args.command == 'analyze':
+        # 单文件优先转发给守护进程（未运行时回退到进程内分析）
+        if not args.no_daemon and Path(args.path).is_file():
+            exit_code = _analyze_via_daemon(args)
+            if exit_code is not None:
+                return exit_code
+
+        from md_audit.config import load_config
+        from md_audit.analyzer import MarkdownSEOAnalyzer
+
         # 加载配置
         config = load_config(args.config)
 
@@ -52,18 +127,18 @@ def main():
             print(f"错误：路径不存在 {args.path}")
             return 1
 
-        # 初始化分析器和报告器
+        # 初始化分析器（报告器在生成报告时才导入，进度输出先于pydantic模型的导入）
         analyzer = MarkdownSEOAnalyzer(config)
-        reporter = MarkdownReporter()
 
         # 判断是文件还是目录
         if target_path.is_file():
             # 单文件模式
             print(f"正在分析 {args.path} ...")
-            report = analyzer.analyze(str(target_path), user_keywords=args.keywords)
+            report = analyzer.analyze(str(target_path), user_keywords=args.keywords, profile=args.profile)
 
             # 生成报告
-            report_md = reporter.generate(report)
+            from md_audit.reporter import MarkdownReporter
+            report_md = MarkdownReporter().generate(report)
 
             # 输出
             if args.output:
@@ -80,36 +155,104 @@ def main():
 
         elif target_path.is_dir():
             # 批量目录模式
+            if args.format != 'markdown' and not args.output:
+                print(f"错误：--format {args.format} 需要用 -o 指定输出目录")
+                return 1
             print(f"批量分析目录: {args.path}")
-            reports = analyzer.analyze_directory(
-                str(target_path),
-                user_keywords=args.keywords,
-                max_workers=args.workers
-            )
+            stream = _open_stream_writer(args, target_path)
+            on_report = None
+            if stream is not None:
+                def on_report(report: SEOReport) -> SEOReport:
+                    stream.add(report)
+                    # 已写出的报告只保留汇总所需字段（--cache / --since 写入缓存需要完整报告）
+                    if args.cache or args.since:
+                        return report
+                    return report.model_copy(update={"diagnostics": [], "corpus_features": None})
+            corpus = None
+            if not args.no_corpus:
+                from md_audit.corpus import CorpusAuditor
+                corpus = CorpusAuditor(str(target_path), args.index_page, extensions=tuple(args.ext))
+            document_frequency = _build_document_frequency(analyzer, target_path, args) if args.tfidf else None
+            if args.since:
+                from md_audit.incremental import GitError, analyze_since, default_cache_path
+
+                try:
+                    reports = analyze_since(
+                        analyzer,
+                        str(target_path),
+                        args.since,
+                        args.cache or default_cache_path(str(target_path)),
+                        user_keywords=args.keywords,
+                        max_workers=args.workers,
+                        profile=args.profile,
+                        walk_options=_walk_options(args),
+                        corpus=corpus,
+                        document_frequency=document_frequency,
+                        on_report=on_report
+                    )
+                except GitError as e:
+                    print(f"错误：无法获取相对 {args.since} 的变更：{e}")
+                    if stream is not None:
+                        stream.close()
+                    return 1
+            else:
+                reports = analyzer.analyze_directory(
+                    str(target_path),
+                    user_keywords=args.keywords,
+                    max_workers=args.workers,
+                    profile=args.profile,
+                    corpus=corpus,
+                    document_frequency=document_frequency,
+                    on_report=on_report,
+                    **_walk_options(args)
+                )
+                if args.cache:
+                    from md_audit.incremental import report_fingerprint, save_report_cache
+                    save_report_cache(reports, str(target_path), args.cache,
+                                      report_fingerprint(analyzer, document_frequency), args.keywords)
 
             if not reports:
+                if stream is not None:
+                    stream.close()
                 print("未生成任何报告")
                 return 1
+            if corpus is not None:
+                corpus.finalize()
+                if stream is None:
+                    corpus.annotate(reports)
+                else:
+                    # 站点级逐页诊断（标题/描述重复）在全部文件分析完成后追加
+                    for rel_path, items in corpus.document_diagnostics():
+                        stream.add_diagnostics(rel_path, items)
+            if stream is not None:
+                stream.close()
+                if args.format in ('jsonl', 'sarif'):
+                    print(f"✅ 已写出 {stream.count} 条{'报告' if args.format == 'jsonl' else '诊断结果'}到 {stream.path}")
+                else:
+                    print(f"✅ 已导出 {stream.documents.rows} 个文档、{stream.diagnostics.rows} 条诊断到 "
+                          f"{stream.documents.path}、{stream.diagnostics.path}")
 
             # 输出批量报告
             if args.output:
                 output_dir = Path(args.output)
                 output_dir.mkdir(parents=True, exist_ok=True)
 
-                # 为每个文件生成独立报告
-                for report in reports:
-                    rel_path = Path(report.file_path).relative_to(target_path)
-                    report_filename = rel_path.with_suffix('.report.md').name
-                    report_path = output_dir / report_filename
+                if args.format == 'markdown':
+                    # 为每个文件生成独立报告
+                    from md_audit.reporter import MarkdownReporter
+                    reporter = MarkdownReporter()
+                    for report in reports:
+                        report_path = _report_output_path(report.file_path, target_path, output_dir)
+                        report_path.parent.mkdir(parents=True, exist_ok=True)
 
-                    report_md = reporter.generate(report)
-                    with open(report_path, 'w', encoding='utf-8') as f:
-                        f.write(report_md)
+                        report_md = reporter.generate(report)
+                        with open(report_path, 'w', encoding='utf-8') as f:
+                            f.write(report_md)
 
-                print(f"✅ 已保存 {len(reports)} 个报告到 {args.output}/")
+                    print(f"✅ 已保存 {len(reports)} 个报告到 {args.output}/")
 
                 # 生成汇总报告
-                summary_md = _generate_summary(reports, str(target_path))
+                summary_md = _generate_summary(reports, str(target_path), corpus)
                 summary_path = output_dir / "SUMMARY.md"
                 with open(summary_path, 'w', encoding='utf-8') as f:
                     f.write(summary_md)
@@ -117,7 +260,7 @@ def main():
 
             else:
                 # 终端输出汇总
-                summary_md = _generate_summary(reports, str(target_path))
+                summary_md = _generate_summary(reports, str(target_path), corpus)
                 print("\n" + summary_md)
 
             # 返回状态码（批量模式：平均分>=70为成功）
@@ -128,6 +271,30 @@ def main():
             print(f"错误：路径既不是文件也不是目录 {args.path}")
             return 1
 
+    elif args.command == 'watch':
+        return _run_watch(args)
+
+    elif args.command == 'daemon':
+        from md_audit import daemon
+
+        if args.status or args.stop:
+            response = daemon.send_request({"op": "shutdown" if args.stop else "ping"},
+                                           args.socket, timeout=5)
+            if response is None:
+                print("守护进程未运行")
+                return 1
+            if args.stop:
+                print("守护进程已停止")
+            else:
+                print(f"守护进程运行中：PID {response['pid']}，分析器 {response['analyzers']} 个，"
+                      f"已处理 {response['requests']} 次分析")
+            return 0
+        return daemon.run_daemon(args.socket, args.config, args.no_ai, args.idle_timeout)
+
+    elif args.command == 'lsp':
+        from md_audit.lsp import run_server
+        return run_server(args.config, args.keywords)
+
     elif args.command == 'serve':
         # 启动Web服务
         try:
@@ -162,13 +329,187 @@ def main():
         return 0
 
 
-def _generate_summary(reports: List[SEOReport], base_dir: str) -> str:
+def _add_walk_arguments(parser: argparse.ArgumentParser) -> None:
+    """目录遍历的文件过滤参数（analyze 目录模式与 watch 共用）"""
+    parser.add_argument('--ext', nargs='+', default=['.md', '.markdown'],
+                        help='分析的文件扩展名（默认 .md .markdown）')
+    parser.add_argument('--include', nargs='+', default=[], metavar='GLOB',
+                        help='只分析匹配的文件（gitignore语法，相对目录）')
+    parser.add_argument('--exclude', nargs='+', default=[], metavar='GLOB',
+                        help='排除匹配的文件或目录（gitignore语法，优先于.gitignore）')
+    parser.add_argument('--no-gitignore', action='store_true', help='不遵循目录中的.gitignore')
+
+
+def _walk_options(args) -> dict:
+    return {
+        'extensions': tuple(args.ext),
+        'include': tuple(args.include),
+        'exclude': tuple(args.exclude),
+        'use_gitignore': not args.no_gitignore,
+    }
+
+
+def _build_document_frequency(analyzer, target_path: Path, args):
+    """--tfidf 第一遍：统计目录的文档频率（复用并更新持久化的文档频率表）"""
+    import time
+    from md_audit.corpus.tfidf import DEFAULT_DF_NAME, DocumentFrequency, build_document_frequency
+    from md_audit.utils.file_walker import FileWalker
+
+    df_path = args.df_cache or str(target_path / DEFAULT_DF_NAME)
+    table = DocumentFrequency()
+    if not table.load(df_path) and Path(df_path).exists():
+        print(f"[警告] 文档频率表不可用（{df_path}），重新统计")
+    start = time.perf_counter()
+    table, computed = build_document_frequency(
+        analyzer.parser, str(target_path), FileWalker(str(target_path), **_walk_options(args)),
+        table, max_workers=args.workers
+    )
+    table.save(df_path)
+    print(f"文档频率：{len(table)} 个文件（重新统计 {computed} 个），词表 {table.vocabulary_size} 项，"
+          f"耗时 {time.perf_counter() - start:.2f}s")
+    return table
+
+
+def _report_output_path(file_path: str, base_dir: Path, output_dir: Path) -> Path:
+    """批量模式下单文件报告的输出路径（输出目录下与源文件相同的相对位置，<文件名>.report.md）"""
+    rel_path = Path(file_path).relative_to(base_dir)
+    return output_dir / rel_path.with_suffix('.report.md')
+
+
+def _open_stream_writer(args, target_path: Path):
+    """--format jsonl/sarif/parquet/arrow/csv：创建流式写入器（markdown返回None）"""
+    if args.format in ('parquet', 'arrow', 'csv'):
+        from md_audit.export import ColumnarExporter
+        return ColumnarExporter(args.output, str(target_path), args.format)
+    if args.format == 'jsonl':
+        from md_audit.stream_output import JsonLinesWriter
+        return JsonLinesWriter(args.output)
+    if args.format == 'sarif':
+        from md_audit.stream_output import SarifWriter
+        return SarifWriter(args.output, str(target_path))
+    return None
+
+
+def _run_watch(args) -> int:
+    """监听目录：首轮完整分析后，只重新分析变更的文件并增量更新输出"""
+    from md_audit.config import load_config
+    from md_audit.analyzer import MarkdownSEOAnalyzer
+    from md_audit.reporter import MarkdownReporter
+    from md_audit.watcher import WatchSession
+
+    target_path = Path(args.path)  # 规范化（如 ./docs/ -> docs），与报告中的路径前缀一致
+    if not target_path.is_dir():
+        print(f"错误：路径不是目录 {args.path}")
+        return 1
+
+    config = load_config(args.config)
+    if args.no_ai:
+        config.enable_ai_analysis = False
+    analyzer = MarkdownSEOAnalyzer(config)
+    reporter = MarkdownReporter()
+    output_dir = Path(args.output) if args.output else None
+    last_summary = [None]
+    # 已写出的单文件报告中附带的站点级逐页诊断（其他页面变更也可能使其变化，变化时重写）
+    written_page_items: Dict[str, list] = {}
+
+    corpus_factory = None
+    if not args.no_corpus:
+        from md_audit.corpus import CorpusAuditor
+
+        def corpus_factory() -> CorpusAuditor:
+            return CorpusAuditor(str(target_path), args.index_page, extensions=tuple(args.ext))
+
+    def write_outputs(updated: List[SEOReport], removed: List[str], reports: List[SEOReport],
+                      corpus: Optional[CorpusAuditor]):
+        if output_dir is None:
+            if reports:
+                avg_score = sum(r.total_score for r in reports) / len(reports)
+                print(f"📊 平均分 {avg_score:.1f}/100（{len(reports)} 个文件）")
+            return
+        output_dir.mkdir(parents=True, exist_ok=True)
+        updated_paths = {report.file_path for report in updated}
+        for report in reports:
+            page_items = corpus.page_diagnostics(report) if corpus is not None else []
+            if report.file_path not in updated_paths and page_items == written_page_items.get(report.file_path, []):
+                continue
+            written_page_items[report.file_path] = page_items
+            if page_items:
+                # 内存中的报告保持不含站点级诊断，每批变更后按最新检查结果重新附加
+                report = report.model_copy(update={"diagnostics": report.diagnostics + page_items})
+            report_path = _report_output_path(report.file_path, target_path, output_dir)
+            report_path.parent.mkdir(parents=True, exist_ok=True)
+            report_path.write_text(reporter.generate(report), encoding='utf-8')
+        for path in removed:
+            written_page_items.pop(path, None)
+            _report_output_path(path, target_path, output_dir).unlink(missing_ok=True)
+        # 汇总由内存中的报告生成，内容不变时不重写文件
+        summary_md = _generate_summary(reports, str(target_path), corpus) if reports else ""
+        if summary_md != last_summary[0]:
+            last_summary[0] = summary_md
+            (output_dir / "SUMMARY.md").write_text(summary_md, encoding='utf-8')
+
+    session = WatchSession(
+        analyzer, str(target_path),
+        user_keywords=args.keywords,
+        max_workers=args.workers,
+        write_outputs=write_outputs,
+        walk_options=_walk_options(args),
+        corpus_factory=corpus_factory
+    )
+    session.initial_scan()
+
+    watcher = session.create_watcher(interval=args.interval, force_polling=args.polling)
+    print(f"👀 正在监听 {target_path}（{watcher.backend}），按Ctrl+C退出")
+    try:
+        session.run(watcher, debounce=args.debounce)
+    except KeyboardInterrupt:
+        print("\n已停止监听")
+    return 0
+
+
+def _analyze_via_daemon(args) -> Optional[int]:
+    """
+    将单文件分析转发给守护进程
+
+    Returns:
+        退出码；守护进程未运行时返回None
+    """
+    from md_audit.daemon import analyze_via_daemon
+
+    response = analyze_via_daemon(
+        args.path,
+        keywords=args.keywords,
+        config_path=args.config,
+        no_ai=args.no_ai,
+        profile=args.profile
+    )
+    if response is None:
+        return None
+    print(f"正在分析 {args.path} ...")
+    if not response.get("ok"):
+        print(f"错误：{response.get('error')}")
+        return 1
+
+    report_md = response["report_md"]
+    if args.output:
+        output_path = Path(args.output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(report_md)
+        print(f"✅ 报告已保存到 {args.output}")
+    else:
+        print("\n" + report_md)
+    return 0 if response["total_score"] >= 70 else 1
+
+
+def _generate_summary(reports: List[SEOReport], base_dir: str, corpus: Optional[CorpusAuditor] = None) -> str:
     """
     生成批量分析汇总报告
 
     Args:
         reports: 所有报告列表
         base_dir: 基础目录路径
+        corpus: 已完成的站点级检查（可选）
 
     Returns:
         Markdown格式的汇总报告
@@ -217,8 +558,91 @@ def _generate_summary(reports: List[SEOReport], base_dir: str) -> str:
             f"{report.relevance_score:.1f} | {report.ai_score:.1f} |"
         )
 
+    # 性能剖析（--profile模式）
+    profiled = [r for r in reports if r.profile]
+    if profiled:
+        lines.extend([""] + _generate_profile_section(profiled, base_dir))
+
+    # 站点级检查
+    if corpus is not None:
+        corpus_lines = corpus.summary_lines()
+        if corpus_lines:
+            lines.extend([""] + corpus_lines)
+
     return "\n".join(lines)
 
 
+def _percentile(values: List[float], pct: float) -> float:
+    """最近秩法百分位数（values需已排序）"""
+    if not values:
+        return 0.0
+    rank = max(1, -(-len(values) * pct // 100))  # ceil(n * pct / 100)
+    return values[int(rank) - 1]
+
+
+def _generate_profile_section(reports: List[SEOReport], base_dir: str, top_n: int = 10) -> List[str]:
+    """
+    生成各阶段耗时统计（p50/p95/max）和最慢文件列表
+
+    Args:
+        reports: 带profile的报告列表
+        base_dir: 基础目录路径
+        top_n: 最慢文件数量
+
+    Returns:
+        Markdown行列表
+    """
+    wall_by_stage: Dict[str, List[float]] = {}
+    cpu_by_stage: Dict[str, List[float]] = {}
+    for report in reports:
+        for timing in report.profile:
+            wall_by_stage.setdefault(timing.stage, []).append(timing.wall_ms)
+            cpu_by_stage.setdefault(timing.stage, []).append(timing.cpu_ms)
+
+    lines = [
+        "## 性能剖析",
+        "",
+        f"共 {len(reports)} 个文件记录了阶段耗时（单位：毫秒）",
+        "",
+        "| 阶段 | p50 | p95 | max | CPU p50 | CPU max | 合计 |",
+        "|------|-----|-----|-----|---------|---------|------|",
+    ]
+    # 按合计耗时降序，便于定位主导阶段（total置于末尾）
+    stages = sorted(
+        (s for s in wall_by_stage if s != "total"),
+        key=lambda s: sum(wall_by_stage[s]),
+        reverse=True
+    )
+    if "total" in wall_by_stage:
+        stages.append("total")
+    for stage in stages:
+        wall = sorted(wall_by_stage[stage])
+        cpu = sorted(cpu_by_stage[stage])
+        lines.append(
+            f"| `{stage}` | {_percentile(wall, 50):.1f} | {_percentile(wall, 95):.1f} | {wall[-1]:.1f} | "
+            f"{_percentile(cpu, 50):.1f} | {cpu[-1]:.1f} | {sum(wall):.1f} |"
+        )
+
+    def total_wall(report: SEOReport) -> float:
+        return next((t.wall_ms for t in report.profile if t.stage == "total"), 0.0)
+
+    slowest = sorted(reports, key=total_wall, reverse=True)[:top_n]
+    lines.extend([
+        "",
+        "### 最慢文件",
+        "",
+        "| 文件 | 总耗时 | 最慢阶段 |",
+        "|------|--------|----------|",
+    ])
+    for report in slowest:
+        rel_path = Path(report.file_path).relative_to(base_dir)
+        stage_timings = [t for t in report.profile if t.stage != "total"]
+        worst = max(stage_timings, key=lambda t: t.wall_ms) if stage_timings else None
+        worst_str = f"`{worst.stage}` ({worst.wall_ms:.1f})" if worst else "-"
+        lines.append(f"| `{rel_path}` | {total_wall(report):.1f} | {worst_str} |")
+
+    return lines
+
+
 if __name__ == '__main__':
     exit(main())
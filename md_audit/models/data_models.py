@@ -1,5 +1,5 @@
-from typing import List, Optional, Dict, Any
-from pydantic import BaseModel, Field
+from typing import List, Optional, Dict, Any, Tuple
+from pydantic import BaseModel, Field, PrivateAttr
 from enum import Enum
 from datetime import datetime
 
@@ -22,6 +22,64 @@ class DiagnosticItem(BaseModel):
     suggestion: str = Field(default="", description="改进建议")
     current_value: Optional[str] = Field(default=None, description="当前值")
     expected_value: Optional[str] = Field(default=None, description="期望值")
+    line: Optional[int] = Field(default=None, ge=1, description="问题所在行（从1开始，含frontmatter），无具体位置时为None")
+    column: Optional[int] = Field(default=None, ge=1, description="问题所在列（从1开始，按字符计）")
+
+    @classmethod
+    def trusted(
+        cls,
+        category: str,
+        check_name: str,
+        severity: SeverityLevel,
+        score: float,
+        message: str,
+        suggestion: str = "",
+        current_value: Optional[str] = None,
+        expected_value: Optional[str] = None,
+        location: Optional[Tuple[int, int]] = None,
+    ) -> "DiagnosticItem":
+        """
+        引擎内部构造诊断项（跳过字段校验）
+
+        引擎传入的字段类型由代码保证，逐条校验是分析热路径上的固定开销；
+        直接写入实例字段，字段值与校验构造相同（score 统一为 float）。
+        外部输入（如Web接口请求体）仍使用 DiagnosticItem(...) 校验构造。
+        model_construct 逐字段处理默认值，在 Pydantic v2 中反而慢于校验构造，因此不使用。
+
+        Args:
+            location: SourceMap 查询到的 (行, 列)，拆分为 line/column 字段
+        """
+        if location is None:
+            line = column = None
+        else:
+            line, column = location
+        item = _new_object(cls)
+        _set_dict(item, {
+            "category": category,
+            "check_name": check_name,
+            "severity": severity,
+            "score": float(score),
+            "message": message,
+            "suggestion": suggestion,
+            "current_value": current_value,
+            "expected_value": expected_value,
+            "line": line,
+            "column": column,
+        })
+        # 全部字段均已显式给出；该集合只会被加入已有字段名（赋值时），可由所有实例共享
+        _set_fields_set(item, _TRUSTED_FIELDS_SET)
+        _set_extra(item, None)
+        _set_private(item, None)
+        return item
+
+
+# DiagnosticItem.trusted 直接写入 BaseModel 的实例槽位（C实现的描述符，避免逐次属性查找）
+_new_object = object.__new__
+_set_dict = BaseModel.__dict__["__dict__"].__set__
+_set_fields_set = BaseModel.__dict__["__pydantic_fields_set__"].__set__
+_set_extra = BaseModel.__dict__["__pydantic_extra__"].__set__
+_set_private = BaseModel.__dict__["__pydantic_private__"].__set__
+_TRUSTED_FIELDS_SET = set(DiagnosticItem.model_fields)
 
 
 class EEATDetails(BaseModel):
@@ -51,6 +109,13 @@ class AIAnalysisResult(BaseModel):
     eeat_details: Optional[EEATDetails] = Field(default=None, description="E-E-A-T各维度详细评价")
 
 
+class StageTiming(BaseModel):
+    """单个分析阶段耗时（--profile模式）"""
+    stage: str = Field(..., description="阶段名称，如'parse'、'rules.keyword'")
+    wall_ms: float = Field(..., ge=0, description="墙钟耗时（毫秒）")
+    cpu_ms: float = Field(..., ge=0, description="当前线程CPU耗时（毫秒）")
+
+
 class SEOReport(BaseModel):
     """完整SEO诊断报告（2025 SEO标准）"""
     file_path: str
@@ -82,6 +147,24 @@ class SEOReport(BaseModel):
     # CWV评估URL（可选）
     cwv_url: Optional[str] = Field(default=None, description="Core Web Vitals评估的目标URL")
 
+    # 超大文件抽样（为空表示所有检查基于完整正文）
+    sampled_checks: List[str] = Field(default_factory=list, description="基于抽样正文执行的检查阶段")
+
+    # 性能剖析（可选，仅--profile模式）
+    profile: Optional[List[StageTiming]] = Field(default=None, description="各分析阶段的墙钟/CPU耗时")
+
+    # 站点级（语料）分析使用的文档特征，不参与序列化（仅批量分析启用语料检查时填充）
+    _corpus_features: Any = PrivateAttr(default=None)
+
+    @property
+    def corpus_features(self) -> Any:
+        """文档特征（md_audit.corpus.DocumentFeatures），未采集时为None"""
+        return self._corpus_features
+
+    @corpus_features.setter
+    def corpus_features(self, value: Any) -> None:
+        self._corpus_features = value
+
     @property
     def emoji_badge(self) -> str:
         """总分对应的emoji徽章"""
@@ -107,4 +190,14 @@ class ParsedMarkdown(BaseModel):
     h3_tags: List[str] = Field(default_factory=list, description="所有H3标签内容")
     images: List[Dict[str, str]] = Field(default_factory=list, description="图片列表，格式：[{'src': '...', 'alt': '...'}]")
     links: List[Dict[str, str]] = Field(default_factory=list, description="链接列表，格式：[{'href': '...', 'text': '...'}]")
+    anchors: List[str] = Field(default_factory=list, description="页面锚点（标题slug与显式id），供站内链接校验")
     word_count: int = Field(default=0, description="正文字数")
+
+    # 超大文件流式解析（sampled=True时raw_content/html_content仅为抽样正文）
+    sampled: bool = Field(default=False, description="正文是否为抽样")
+    source_bytes: int = Field(default=0, description="源文件字节数（仅流式解析时记录）")
+    sampled_bytes: int = Field(default=0, description="抽样正文字节数")
+    sample_word_count: int = Field(default=0, description="抽样正文字数（密度类比值以此为分母）")
+
+    # 源码位置映射（md_audit.parsers.source_map.SourceMap），供诊断定位，不参与序列化
+    source_map: Any = Field(default=None, exclude=True, description="标题/链接/图片/段落的行列位置")
@@ -0,0 +1,258 @@
+"""
+Markdown逐行扫描
+
+不构建语法树，按行识别围栏代码块、ATX/Setext标题、行内链接与图片，
+每行携带行号与字节偏移。供超大文件流式解析等无需完整HTML的场景使用。
+"""
+import html
+import re
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+FENCE_RE = re.compile(r'^ {0,3}(`{3,}|~{3,})')
+ATX_HEADING_RE = re.compile(r'^ {0,3}(#{1,6})(?:[ \t]+(.*?))?(?:[ \t]+#+)?[ \t]*$')
+HTML_HEADING_RE = re.compile(r'^\s*<h([1-6])\b[^>]*>(.*?)</h\1>', re.IGNORECASE)
+SETEXT_UNDERLINE_RE = re.compile(r'^ {0,3}(=+|-+)[ \t]*$')
+# 与 MarkdownParser._normalize_headings 一致："1. ### Title" 视为H2
+LIST_H3_RE = re.compile(r'^\s*\d+\.\s+###\s+(.*)$')
+# Setext标题的上一行不能是列表/引用/表格/HTML块等结构行
+NON_PARAGRAPH_RE = re.compile(r'^\s*([-*+>|<]|\d+\.\s|#)')
+REF_DEFINITION_RE = re.compile(r'^ {0,3}\[[^\]]+\]:\s+\S+')
+
+_TITLE = r'(?:\s+(?:"[^"]*"|\'[^\']*\'))?'
+IMAGE_RE = re.compile(r'!\[([^\]]*)\]\(\s*<?([^)\s>]*)>?' + _TITLE + r'\s*\)')
+# 链接文字允许一层嵌套方括号（如徽章 [![alt](img)](url)）
+LINK_RE = re.compile(r'(?<!!)\[((?:[^\[\]]|\[[^\]]*\])*)\]\(\s*<?([^)\s>]*)>?' + _TITLE + r'\s*\)')
+AUTOLINK_RE = re.compile(r'<((?:https?|ftp)://[^>\s]+)>')
+EMAIL_AUTOLINK_RE = re.compile(r'<(?:mailto:)?([^@\s<>]+@[^@\s<>]+)>')
+HTML_IMG_RE = re.compile(r'<img\b[^>]*>', re.IGNORECASE)
+HTML_A_RE = re.compile(r'<a\b([^>]*)>(.*?)</a>', re.IGNORECASE)
+HTML_ATTR_RE = re.compile(r'(\w+)\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s>]+))')
+HTML_TAG_RE = re.compile(r'<[^>]+>')
+# 不含以下字符的行无需逐个匹配行内元素
+INLINE_MARKERS_RE = re.compile(r'[`\[<*_\\&]')
+ESCAPE_RE = re.compile(r'\\([\\`*_{}\[\]()#+\-.!|])')
+
+
+class ScannedLine(NamedTuple):
+    """单行扫描结果"""
+    lineno: int                            # 行号（从1开始，相对扫描起点）
+    offset: int                            # 行首字节偏移
+    size: int                              # 行字节数（含换行符）
+    text: str                              # 行内容（不含换行符）
+    in_code: bool                          # 是否位于围栏代码块内（含围栏行）
+    is_fence: bool                         # 是否为围栏行本身
+    heading: Optional[Tuple[int, str]]     # 标题 (级别, 原始文本)，非标题为None
+
+
+def _html_attrs(tag: str) -> dict:
+    return {m.group(1).lower(): next(g for g in m.groups()[1:] if g is not None)
+            for m in HTML_ATTR_RE.finditer(tag)}
+
+
+# 行内元素：代码片段 | 图片 | 链接 | 自动链接 | 邮件自动链接 | HTML标签 | 强调
+# 组合后数字反向引用会错位，代码片段与强调改用命名分组；下划线强调不能出现在词内（如 SEO_RULES_CONFIG）
+INLINE_TOKEN_RE = re.compile(
+    r'(?P<code>(?P<ticks>`+)(?P<code_body>.+?)(?P=ticks))'
+    rf'|(?P<image>{IMAGE_RE.pattern})'
+    rf'|(?P<link>{LINK_RE.pattern})'
+    rf'|(?P<autolink>{AUTOLINK_RE.pattern})'
+    rf'|(?P<email>{EMAIL_AUTOLINK_RE.pattern})'
+    rf'|(?P<tag>{HTML_TAG_RE.pattern})'
+    r'|(?P<emphasis>(?P<star>\*{1,3})(?P<star_body>\S(?:.*?\S)?)(?P=star)'
+    r'|(?<!\w)(?P<under>_{1,3})(?P<under_body>\S(?:.*?\S)?)(?P=under)(?!\w))'
+)
+
+
+def _inline_segments(text: str) -> List[str]:
+    """
+    按行内元素边界切分渲染后的文本片段
+
+    与HTML中各文本节点一一对应：get_text() 为片段直接拼接，
+    get_text(strip=True) 为各片段去除首尾空白后拼接。
+    """
+    if not INLINE_MARKERS_RE.search(text):
+        return [text]
+    segments: List[str] = []
+    last = 0
+    for m in INLINE_TOKEN_RE.finditer(text):
+        if m.start() > last:
+            segments.append(html.unescape(ESCAPE_RE.sub(r'\1', text[last:m.start()])))
+        kind = m.lastgroup
+        token = m.group(0)
+        if kind == 'code':
+            segments.append(m.group('code_body').strip())
+        elif kind == 'link':
+            segments.extend(_inline_segments(LINK_RE.match(token).group(1)))
+        elif kind == 'autolink':
+            segments.append(AUTOLINK_RE.match(token).group(1))
+        elif kind == 'email':
+            segments.append(EMAIL_AUTOLINK_RE.match(token).group(1))
+        elif kind == 'emphasis':
+            segments.extend(_inline_segments(m.group('star_body') or m.group('under_body')))
+        # image / tag：不产生文本
+        last = m.end()
+    if last < len(text):
+        segments.append(html.unescape(ESCAPE_RE.sub(r'\1', text[last:])))
+    return segments
+
+
+def strip_inline(text: str, strip: bool = False) -> str:
+    """
+    去除行内Markdown/HTML标记，近似渲染后的纯文本
+
+    strip=False 等价于 get_text()，strip=True 等价于 get_text(strip=True)。
+    图片不产生文本（alt不属于文本），链接保留文字，代码片段原样保留内容。
+    """
+    segments = _inline_segments(text)
+    if strip:
+        return ''.join(s.strip() for s in segments)
+    return ''.join(segments)
+
+
+def extract_links(text: str) -> List[dict]:
+    """提取单行中的链接（Markdown行内链接、自动链接、<a>标签），按出现顺序"""
+    if '[' not in text and '<' not in text:
+        return []
+    found = []
+    for m in LINK_RE.finditer(text):
+        found.append((m.start(), {'href': m.group(2), 'text': strip_inline(m.group(1), strip=True)}))
+    for m in AUTOLINK_RE.finditer(text):
+        found.append((m.start(), {'href': m.group(1), 'text': m.group(1)}))
+    for m in EMAIL_AUTOLINK_RE.finditer(text):
+        found.append((m.start(), {'href': f'mailto:{m.group(1)}', 'text': m.group(1)}))
+    for m in HTML_A_RE.finditer(text):
+        attrs = _html_attrs(m.group(1))
+        found.append((m.start(), {'href': attrs.get('href', ''), 'text': strip_inline(m.group(2), strip=True)}))
+    found.sort(key=lambda item: item[0])
+    return [link for _, link in found]
+
+
+def extract_images(text: str) -> List[dict]:
+    """提取单行中的图片（Markdown图片与<img>标签），按出现顺序"""
+    if '![' not in text and '<' not in text:
+        return []
+    found = []
+    for m in IMAGE_RE.finditer(text):
+        found.append((m.start(), {'src': m.group(2), 'alt': m.group(1)}))
+    for m in HTML_IMG_RE.finditer(text):
+        attrs = _html_attrs(m.group(0))
+        found.append((m.start(), {'src': attrs.get('src', ''), 'alt': attrs.get('alt', '')}))
+    found.sort(key=lambda item: item[0])
+    return [image for _, image in found]
+
+
+# 标题末尾的 attr_list 显式id：{#id} 或 {: #id .class}
+HEADING_ID_RE = re.compile(r'\s*\{:?\s*#([^\s}]+)[^}]*\}\s*$')
+SLUG_STRIP_RE = re.compile(r'[^\w\- ]')
+
+
+def heading_slug(text: str) -> str:
+    """标题文本 -> GitHub风格锚点（小写、去标点、空格转-；中文等Unicode字符保留）"""
+    return SLUG_STRIP_RE.sub('', text.strip().lower()).replace(' ', '-')
+
+
+class AnchorCollector:
+    """按出现顺序收集页面锚点；同名标题按GitHub规则追加 -1、-2"""
+
+    def __init__(self):
+        self.anchors: List[str] = []
+        self._seen: dict = {}
+
+    def add_heading(self, text: str, explicit_id: Optional[str] = None) -> None:
+        if explicit_id:
+            self.add_id(explicit_id)
+            return
+        slug = heading_slug(text)
+        count = self._seen.get(slug)
+        self._seen[slug] = 0 if count is None else count + 1
+        self.anchors.append(slug if count is None else f"{slug}-{count + 1}")
+
+    def add_id(self, anchor_id: str) -> None:
+        self.anchors.append(anchor_id)
+
+
+def split_heading_id(text: str) -> Tuple[str, Optional[str]]:
+    """分离标题原文末尾的 {#id}，返回 (标题文本, 显式id)"""
+    m = HEADING_ID_RE.search(text)
+    if not m:
+        return text, None
+    return text[:m.start()], m.group(1)
+
+
+def text_for_count(line: ScannedLine) -> str:
+    """行的可计数文本：代码块内保留原文，围栏行与链接定义行不计"""
+    if line.is_fence or (not line.in_code and REF_DEFINITION_RE.match(line.text)):
+        return ''
+    if line.in_code:
+        return line.text
+    if line.heading:
+        return strip_inline(line.heading[1])
+    return strip_inline(line.text)
+
+
+def scan_lines(
+    lines: Iterable[Tuple[str, int]],
+    start_lineno: int = 1,
+    start_offset: int = 0,
+) -> Iterator[ScannedLine]:
+    """
+    逐行扫描
+
+    Args:
+        lines: (行文本（不含换行符）, 该行原始字节数（含换行符）) 序列
+        start_lineno: 首行行号
+        start_offset: 首行字节偏移
+
+    Yields:
+        ScannedLine。Setext标题需要看到下一行才能确定，因此输出滞后一行。
+    """
+    in_code = False
+    fence = ''
+    pending: Optional[ScannedLine] = None
+    lineno = start_lineno
+    offset = start_offset
+
+    for text, size in lines:
+        fence_match = FENCE_RE.match(text)
+        if in_code:
+            is_fence = bool(fence_match) and fence_match.group(1)[0] == fence[0] \
+                and len(fence_match.group(1)) >= len(fence) and not text.strip()[len(fence_match.group(1)):].strip()
+            current = ScannedLine(lineno, offset, size, text, True, is_fence, None)
+            if is_fence:
+                in_code = False
+        elif fence_match:
+            in_code = True
+            fence = fence_match.group(1)
+            current = ScannedLine(lineno, offset, size, text, True, True, None)
+        else:
+            heading = None
+            atx = ATX_HEADING_RE.match(text)
+            html_heading = HTML_HEADING_RE.match(text) if not atx else None
+            if atx:
+                heading = (len(atx.group(1)), (atx.group(2) or '').strip())
+            elif html_heading:
+                heading = (int(html_heading.group(1)), html_heading.group(2).strip())
+            else:
+                list_h3 = LIST_H3_RE.match(text)
+                if list_h3:
+                    heading = (2, list_h3.group(1).strip())
+                elif (
+                    pending is not None
+                    and SETEXT_UNDERLINE_RE.match(text)
+                    and not pending.in_code
+                    and pending.heading is None
+                    and pending.text.strip()
+                    and not NON_PARAGRAPH_RE.match(pending.text)
+                ):
+                    level = 1 if text.strip()[0] == '=' else 2
+                    pending = pending._replace(heading=(level, pending.text.strip()))
+            current = ScannedLine(lineno, offset, size, text, False, False, heading)
+
+        if pending is not None:
+            yield pending
+        pending = current
+        lineno += 1
+        offset += size
+
+    if pending is not None:
+        yield pending
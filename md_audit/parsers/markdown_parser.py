@@ -1,18 +1,58 @@
+from __future__ import annotations
+
+import os
 import re
-from typing import List, Dict
+import threading
+import importlib.util
+from typing import TYPE_CHECKING, Callable, List, Dict, NamedTuple, Optional, Sequence, Tuple
 from pathlib import Path
 from collections import Counter
-import frontmatter
-import markdown
-from bs4 import BeautifulSoup
-from md_audit.models.data_models import ParsedMarkdown
-
-# 中文分词支持
-try:
-    import jieba
-    HAS_JIEBA = True
-except ImportError:
-    HAS_JIEBA = False
+from md_audit.config import LargeFileRules
+from md_audit.parsers.line_scanner import AnchorCollector, scan_lines
+from md_audit.parsers.source_map import SourceMap, SourceMapBuilder, frontmatter_key_locations
+
+# frontmatter(yaml)、markdown、bs4 与 pydantic 模型在首次解析时才导入，
+# CLI在这些导入之前即可输出进度
+if TYPE_CHECKING:
+    import markdown
+    from md_audit.models.data_models import ParsedMarkdown
+
+# 中文分词支持（jieba导入与词典加载约1秒，推迟到首次遇到需要分词的文本）
+HAS_JIEBA = importlib.util.find_spec("jieba") is not None
+_jieba = None
+
+# 出现这些字符时才需要jieba：中文（jieba的汉字范围），以及影响其英文切分的 . % + # &
+# （数字小数/百分比整体成词，词典中的 C++ / C# / AT&T）
+JIEBA_REQUIRED_RE = re.compile(r'[\u4e00-\u9fd5.%+#&]')
+# 不含上述字符时，jieba精确模式的结果等价于：连续字母数字成词，连续的 _ / - 成词，其余字符单独成词
+PLAIN_TOKEN_RE = re.compile(r'[a-zA-Z0-9]+|[_\-]+')
+
+# 参与锚点生成的标题标签
+HEADING_TAGS = ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']
+
+
+class ConvertedBlock(NamedTuple):
+    """一段Markdown的转换结果（整篇文档或其中一个章节）"""
+    html: str
+    text: str                                  # HTML的纯文本
+    h1_tags: List[str]
+    h2_tags: List[str]
+    h3_tags: List[str]
+    images: List[Dict[str, str]]
+    links: List[Dict[str, str]]
+    headings: List[Tuple[str, Optional[str]]]  # (标题文本, 显式id)
+    ids: List[str]                             # 标题以外元素的id
+    names: List[str]                           # <a name>
+    word_count: int
+
+
+def _load_jieba():
+    """首次需要中文分词时导入jieba"""
+    global _jieba
+    if _jieba is None:
+        import jieba
+        _jieba = jieba
+    return _jieba
 
 
 class MarkdownParser:
@@ -27,6 +67,7 @@ class MarkdownParser:
         r'^\d+$',              # 纯数字
         r'^[^a-zA-Z\u4e00-\u9fa5]+$',  # 非字母/汉字
     ]
+    LOW_QUALITY_RE = re.compile('|'.join(f'(?:{p})' for p in LOW_QUALITY_PATTERNS))
 
     # 停用词（简化版，生产环境需要更完整的停用词表）
     STOP_WORDS = {
@@ -37,8 +78,25 @@ class MarkdownParser:
         'can', 'have', 'has', 'had', 'if', 'when', 'where', 'which', 'who',
     }
 
-    def __init__(self):
-        self.md_parser = markdown.Markdown(extensions=['extra', 'codehilite', 'tables'])
+    MARKDOWN_EXTENSIONS = ['extra', 'codehilite', 'tables']
+
+    def __init__(self, large_file_rules: Optional[LargeFileRules] = None):
+        self.large_file_rules = large_file_rules
+        self._local = threading.local()
+
+    @property
+    def md_parser(self) -> markdown.Markdown:
+        """
+        当前线程的Markdown转换器
+
+        markdown.Markdown 实例在 convert/reset 之间持有内部状态，批量分析与守护进程
+        的工作线程共享同一个解析器时会相互污染，因此每个线程各自创建一个（首次使用时）
+        """
+        md = getattr(self._local, 'md', None)
+        if md is None:
+            import markdown
+            md = self._local.md = markdown.Markdown(extensions=self.MARKDOWN_EXTENSIONS)
+        return md
 
     def parse(self, file_path: str) -> ParsedMarkdown:
         """
@@ -55,9 +113,20 @@ class MarkdownParser:
             UnicodeDecodeError: 文件编码错误
             PermissionError: 无文件读取权限
         """
+        # 超过阈值的文件走流式解析（正文抽样，见 StreamingMarkdownParser）
+        rules = self.large_file_rules
+        if rules and rules.enabled:
+            try:
+                size = os.path.getsize(file_path)
+            except OSError:
+                size = 0  # 交由下方统一抛出对应异常
+            if size >= rules.streaming_threshold_bytes:
+                from md_audit.parsers.streaming_parser import StreamingMarkdownParser
+                return StreamingMarkdownParser(self, rules).parse(file_path)
+
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
-                post = frontmatter.load(f)
+                text = f.read()
         except FileNotFoundError:
             raise FileNotFoundError(f"文件不存在: {file_path}")
         except UnicodeDecodeError as e:
@@ -68,34 +137,53 @@ class MarkdownParser:
         except PermissionError:
             raise PermissionError(f"无权限读取文件: {file_path}")
 
-        # 提取frontmatter
-        fm = post.metadata
-        raw_content = post.content
+        return self.parse_text(text)
 
-        # 规范化标题（兼容部分导出场景，如"1. ### Title"被当作列表+H3）
-        raw_content = self._normalize_headings(raw_content)
+    def parse_text(self, text: str) -> ParsedMarkdown:
+        """
+        解析Markdown文本（编辑器缓冲区等未落盘的内容）
 
-        # 转换为HTML
-        html_content = self.md_parser.convert(raw_content)
-        soup = BeautifulSoup(html_content, 'html.parser')
+        Args:
+            text: 完整文档文本（含frontmatter）
 
-        # 提取标题（优先从frontmatter，否则从第一个H1）
-        title = fm.get('title', '')
-        if not title:
-            h1 = soup.find('h1')
-            title = h1.get_text(strip=True) if h1 else ''
+        Returns:
+            解析后的结构化数据
+        """
+        fm, content, source_map = self.split_text(text)
+        return self.assemble(fm, content, source_map, [self.convert_block(content)])
 
-        # 提取描述
-        description = fm.get('description', '') or fm.get('excerpt', '')
-        if not description:
-            # 如果没有描述，使用正文前160字符生成摘要，避免元数据得分为0
-            text_for_desc = soup.get_text().strip()
-            description = text_for_desc[:160]
+    def split_text(self, text: str) -> Tuple[dict, str, SourceMap]:
+        """
+        分离frontmatter与正文
+
+        Returns:
+            (frontmatter, 规范化标题后的正文, 源码位置映射)
+        """
+        import frontmatter
+
+        post = frontmatter.loads(text)
 
-        # 提取H1/H2/H3标签
-        h1_tags = [h1.get_text(strip=True) for h1 in soup.find_all('h1')]
-        h2_tags = [h2.get_text(strip=True) for h2 in soup.find_all('h2')]
-        h3_tags = [h3.get_text(strip=True) for h3 in soup.find_all('h3')]
+        # 源码位置映射（与正文逐行扫描同一遍完成，行号相对原文件）
+        source_map = self._build_source_map(text, post.content)
+
+        # 规范化标题（兼容部分导出场景，如"1. ### Title"被当作列表+H3）
+        return post.metadata, self._normalize_headings(post.content), source_map
+
+    def convert_block(self, content: str) -> ConvertedBlock:
+        """将一段Markdown转换为HTML并提取标题、图片、链接、锚点与字数"""
+        md = self.md_parser
+        html_content = md.convert(content)
+        # convert 会去除首尾空白：末尾为暂存的原始HTML（如代码高亮块）时其结尾换行也被去除，
+        # 补回后各段以换行拼接即与整篇转换一致（assemble 时再统一去除文档末尾空白）
+        for raw in reversed(md.htmlStash.rawHtmlBlocks):
+            stripped = raw.rstrip() if isinstance(raw, str) else ''
+            if stripped and html_content.endswith(stripped):
+                html_content += raw[len(stripped):]
+                break
+        # 重置解析器状态以避免状态污染
+        md.reset()
+        from bs4 import BeautifulSoup
+        soup = BeautifulSoup(html_content, 'html.parser')
 
         # 提取图片
         images = []
@@ -113,28 +201,115 @@ class MarkdownParser:
                 'text': a.get_text(strip=True)
             })
 
+        # 锚点来源：标题（文本, 显式id）按文档顺序，其余元素的id与<a name>
+        headings = [(tag.get_text(), tag.get('id')) for tag in soup.find_all(HEADING_TAGS)]
+        ids = [tag['id'] for tag in soup.find_all(attrs={'id': True}) if tag.name not in HEADING_TAGS]
+        names = [tag['name'] for tag in soup.find_all('a', attrs={'name': True})]
+
         # 计算字数（支持中英文混合）
         text_content = soup.get_text()
-        word_count = self._count_words(text_content)
 
-        # 重置解析器状态以避免状态污染
-        self.md_parser.reset()
+        return ConvertedBlock(
+            html=html_content,
+            text=text_content,
+            h1_tags=[h1.get_text(strip=True) for h1 in soup.find_all('h1')],
+            h2_tags=[h2.get_text(strip=True) for h2 in soup.find_all('h2')],
+            h3_tags=[h3.get_text(strip=True) for h3 in soup.find_all('h3')],
+            images=images,
+            links=links,
+            headings=headings,
+            ids=ids,
+            names=names,
+            word_count=self._count_words(text_content),
+        )
+
+    def assemble(self, fm: dict, content: str, source_map: Optional[SourceMap],
+                 blocks: Sequence[ConvertedBlock]) -> ParsedMarkdown:
+        """
+        由按文档顺序排列的转换结果组装 ParsedMarkdown
 
+        python-markdown 以换行连接顶层块，各段HTML、文本以换行拼接即与整篇转换一致
+        """
+        html_content = '\n'.join(block.html for block in blocks if block.html).rstrip()
+        h1_tags = [tag for block in blocks for tag in block.h1_tags]
+
+        # 提取标题（优先从frontmatter，否则从第一个H1）
+        title = fm.get('title', '')
+        if not title:
+            title = h1_tags[0] if h1_tags else ''
+
+        # 提取描述
+        description = fm.get('description', '') or fm.get('excerpt', '')
+        if not description:
+            # 如果没有描述，使用正文前160字符生成摘要，避免元数据得分为0
+            description = self._leading_text(blocks, 160)
+
+        # 提取锚点（标题按文档顺序；显式id优先，其余按GitHub规则生成slug）
+        anchors = AnchorCollector()
+        for block in blocks:
+            for text, explicit_id in block.headings:
+                anchors.add_heading(text, explicit_id)
+        for block in blocks:
+            for anchor_id in block.ids:
+                anchors.add_id(anchor_id)
+        for block in blocks:
+            for name in block.names:
+                anchors.add_id(name)
+
+        from md_audit.models.data_models import ParsedMarkdown
         return ParsedMarkdown(
             frontmatter=fm,
-            raw_content=raw_content,
+            raw_content=content,
             html_content=html_content,
             title=title,
             description=description,
             h1_tags=h1_tags,
-            h2_tags=h2_tags,
-            h3_tags=h3_tags,
-            images=images,
-            links=links,
-            word_count=word_count
+            h2_tags=[tag for block in blocks for tag in block.h2_tags],
+            h3_tags=[tag for block in blocks for tag in block.h3_tags],
+            images=[image for block in blocks for image in block.images],
+            links=[link for block in blocks for link in block.links],
+            anchors=anchors.anchors,
+            word_count=sum(block.word_count for block in blocks),
+            source_map=source_map
         )
 
-    def extract_keywords(self, content: str, max_keywords: int = 5) -> List[str]:
+    @staticmethod
+    def _leading_text(blocks: Sequence[ConvertedBlock], limit: int) -> str:
+        """
+        正文纯文本的前 limit 个字符
+
+        多段时块间空白的提取结果与整篇不同，由开头足够长的若干段HTML重新提取
+        """
+        if len(blocks) == 1:
+            return blocks[0].text.strip()[:limit]
+        count = size = 0
+        for block in blocks:
+            count += 1
+            size += len(block.text.strip())
+            if size > limit:
+                break
+        html = '\n'.join(block.html for block in blocks[:count] if block.html)
+        from bs4 import BeautifulSoup
+        return BeautifulSoup(html, 'html.parser').get_text().strip()[:limit]
+
+    @staticmethod
+    def _build_source_map(text: str, content: str) -> SourceMap:
+        """
+        python-frontmatter 去除了frontmatter与正文首尾空白，正文在原文中的起点由长度反推：
+        去除的前缀之后即为正文（正文是原文去除尾部空白后的后缀）
+        """
+        start = len(text.rstrip()) - len(content)
+        line_offset = text.count('\n', 0, start)
+        builder = SourceMapBuilder(first_column=start - (text.rfind('\n', 0, start) + 1))
+        for line in scan_lines(((line, 0) for line in content.split('\n')), start_lineno=line_offset + 1):
+            builder.feed(line)
+        if line_offset:
+            builder.map.frontmatter_keys = frontmatter_key_locations(text[:start].split('\n'))
+        return builder.map
+
+    def extract_keywords(self, content: str, max_keywords: int = 5,
+                         idf: Optional[Callable[[str], float]] = None,
+                         frequencies: Optional[Dict[str, int]] = None) -> List[str]:
         """
         自动提取关键词（基于n-gram + 质量过滤）
 
@@ -143,41 +318,67 @@ class MarkdownParser:
         Args:
             content: 文本内容
             max_keywords: 返回关键词数量
+            idf: 词项 -> 逆文档频率（语料TF-IDF模式，见 md_audit.corpus.tfidf）；
+                为None时按文档内词频排序
+            frequencies: 已统计的候选关键词词频（如分段缓存汇总的结果），给出时不再分词
 
         Returns:
-            关键词列表（按词频降序）
+            关键词列表（按词频或TF-IDF降序）
         """
+        keyword_freq = frequencies if frequencies is not None else self.keyword_frequencies(content)
+
+        # 按词频（或TF-IDF）排序
+        if idf is None:
+            sorted_keywords = sorted(keyword_freq.items(), key=lambda x: x[1], reverse=True)
+        else:
+            sorted_keywords = sorted(((kw, freq * idf(kw)) for kw, freq in keyword_freq.items()),
+                                     key=lambda x: x[1], reverse=True)
+        return [kw for kw, _ in sorted_keywords[:max_keywords]]
+
+    def keyword_frequencies(self, content: str) -> Dict[str, int]:
+        """候选关键词（单词与双词组合，已质量过滤）-> 文档内词频"""
         # 清理文本
         text = self._clean_text(content)
 
         # 分词（中文用jieba，英文用空格）
-        words = self._tokenize(text)
-
-        # 计算n-gram词频
-        keyword_freq: Dict[str, int] = {}
+        return self.token_frequencies(self._tokenize(text))
 
-        # Unigrams（单词）
-        for word in words:
-            if self._is_quality_keyword(word):
-                keyword_freq[word] = keyword_freq.get(word, 0) + 1
-
-        # Bigrams（双词组合）
-        for i in range(len(words) - 1):
-            bigram = f"{words[i]}{words[i+1]}"
-            if self._is_quality_keyword(bigram):
-                keyword_freq[bigram] = keyword_freq.get(bigram, 0) + 1
+    def token_frequencies(self, words: List[str],
+                          quality: Optional[Dict[str, bool]] = None) -> Dict[str, int]:
+        """
+        分词结果 -> 候选关键词词频
 
-        # 按词频排序
-        sorted_keywords = sorted(keyword_freq.items(), key=lambda x: x[1], reverse=True)
-        return [kw for kw, _ in sorted_keywords[:max_keywords]]
+        Args:
+            words: 分词结果
+            quality: 词项 -> 是否通过质量过滤的缓存（同一文档反复分析时传入，跨次复用判断结果）
+        """
+        # 计算n-gram词频：Unigrams（单词）+ Bigrams（双词组合）
+        counts = Counter(words)
+        counts.update(f"{a}{b}" for a, b in zip(words, words[1:]))
+
+        # 质量过滤只与词项本身有关，对去重后的词项各判断一次
+        is_quality = self._is_quality_keyword
+        if quality is None:
+            return {kw: freq for kw, freq in counts.items() if is_quality(kw)}
+        result = {}
+        for kw, freq in counts.items():
+            passed = quality.get(kw)
+            if passed is None:
+                passed = quality[kw] = is_quality(kw)
+            if passed:
+                result[kw] = freq
+        return result
 
     def _tokenize(self, text: str) -> List[str]:
         """
         分词：中文用jieba，英文用空格分割
         """
+        if HAS_JIEBA and not JIEBA_REQUIRED_RE.search(text):
+            # 无中文：与jieba精确模式分词结果一致，无需加载jieba词典
+            return [w for w in PLAIN_TOKEN_RE.findall(text) if len(w) > 1]
         if HAS_JIEBA:
             # 使用jieba分词（精确模式）
-            words = list(jieba.cut(text, cut_all=False))
+            words = list(_load_jieba().cut(text, cut_all=False))
             # 过滤空白和标点
             return [w.strip() for w in words if w.strip() and len(w.strip()) > 1]
         else:
@@ -239,10 +440,9 @@ class MarkdownParser:
         if word_count > 1 and stopword_count > word_count // 2:
             return False
 
-        # 模式匹配检查
-        for pattern in self.LOW_QUALITY_PATTERNS:
-            if re.search(pattern, keyword):
-                return False
+        # 模式匹配检查（各规则合并为一个预编译的正则）
+        if self.LOW_QUALITY_RE.search(keyword):
+            return False
 
         return True
 
@@ -0,0 +1,144 @@
+"""
+分段解析缓存（同一文档反复分析时只重新解析变化的章节）
+
+编辑器逐键修改文档时，绝大多数章节的内容不变。正文在顶层ATX标题行前切分为章节，
+每个章节的HTML转换结果（标题、图片、链接、锚点、字数）与关键词分词结果按章节文本缓存，
+文档级结构由各章节结果按顺序汇总（MarkdownParser.assemble），评分引擎在汇总结果上重新计算。
+
+切分点只选在 python-markdown 本身就会开始新块的位置，逐段转换与整篇转换结果一致：
+- 空行之后、行首（无缩进）的 # 标题，不在围栏代码块或块级HTML内
+  （紧接在列表、表格行之后的标题行可能被并入该列表或表格，不作为切分点）
+- 含引用式链接定义、脚注、缩写定义的文档不切分（定义作用于全文）
+"""
+import re
+from typing import Dict, List, Optional, Tuple
+
+from markdown.util import BLOCK_LEVEL_ELEMENTS
+
+from md_audit.models.data_models import ParsedMarkdown
+from md_audit.parsers.markdown_parser import ConvertedBlock, MarkdownParser
+
+# 章节起点：行首ATX标题（python-markdown 的标题块识别不要求#后有空格）
+SECTION_HEADING_RE = re.compile(r'^#{1,6}')
+# 围栏代码块（fenced_code 扩展只识别行首的围栏）
+FENCE_RE = re.compile(r'^(`{3,}|~{3,})')
+# 块级HTML起始标签与HTML注释（至闭合处前不切分）
+HTML_BLOCK_RE = re.compile(r'^<([a-zA-Z][a-zA-Z0-9-]*)[\s/>]')
+HTML_COMMENT_START = '<!--'
+# 作用于全文的定义：引用式链接/脚注 [id]: ...，缩写 *[abbr]: ...
+GLOBAL_DEFINITION_RE = re.compile(r'^ {0,3}\*?\[[^\]]+\]:', re.MULTILINE)
+
+
+def split_sections(content: str) -> List[str]:
+    """
+    将正文切分为章节（以换行连接各章节即为原文）
+
+    首个章节为第一个标题之前的导语（可能为空串）
+    """
+    if GLOBAL_DEFINITION_RE.search(content):
+        return [content]
+    lines = content.split('\n')
+    sections: List[str] = []
+    start = 0
+    fence = ''
+    html_close = ''
+    for i, line in enumerate(lines):
+        if fence:
+            if line.startswith(fence) and not line[len(fence):].strip(fence[0]).strip():
+                fence = ''
+            continue
+        if html_close:
+            if html_close in line.lower():
+                html_close = ''
+            continue
+        fence_match = FENCE_RE.match(line)
+        if fence_match:
+            fence = fence_match.group(1)
+            continue
+        if line.startswith(HTML_COMMENT_START):
+            if '-->' not in line:
+                html_close = '-->'
+            continue
+        html_match = HTML_BLOCK_RE.match(line)
+        if html_match and html_match.group(1).lower() in BLOCK_LEVEL_ELEMENTS:
+            close = f'</{html_match.group(1).lower()}'
+            if close not in line.lower() and not line.rstrip().endswith('/>'):
+                html_close = close
+            continue
+        if i > start and SECTION_HEADING_RE.match(line) and not lines[i - 1].strip(' '):
+            sections.append('\n'.join(lines[start:i]))
+            start = i
+    sections.append('\n'.join(lines[start:]))
+    return sections
+
+
+class SectionCache:
+    """
+    单个文档的分段解析缓存
+
+    只保留最近一次解析中出现的章节，内存占用与文档大小相当；
+    不同文档应各自使用一个实例（LSP 每个打开的文档一个）
+
+    Args:
+        parser: 执行转换与分词的解析器（共享分析器的解析器即可）
+    """
+
+    def __init__(self, parser: MarkdownParser):
+        self.parser = parser
+        self.hits = 0
+        self.misses = 0
+        self._blocks: Dict[str, ConvertedBlock] = {}
+        self._tokens: Dict[str, Tuple[str, List[str]]] = {}  # 章节 -> (清理后文本, 分词)
+        self._quality: Dict[str, bool] = {}  # 候选关键词 -> 是否通过质量过滤
+        self._content: Optional[str] = None
+        self._sections: List[str] = []
+
+    def parse(self, text: str) -> ParsedMarkdown:
+        """解析文档文本，未变化的章节复用上次的转换结果"""
+        fm, content, source_map = self.parser.split_text(text)
+        sections = split_sections(content)
+        previous = self._blocks
+        blocks: Dict[str, ConvertedBlock] = {}
+        for section in sections:
+            block = blocks.get(section) or previous.get(section)
+            if block is None:
+                block = self.parser.convert_block(section)
+                self.misses += 1
+            else:
+                self.hits += 1
+            blocks[section] = block
+        self._blocks = blocks
+        self._content = content
+        self._sections = sections
+        return self.parser.assemble(fm, content, source_map, [blocks[section] for section in sections])
+
+    def keyword_frequencies(self, content: str) -> Dict[str, int]:
+        """
+        候选关键词词频（同 MarkdownParser.keyword_frequencies），未变化的章节复用分词结果
+
+        文本清理后按空白分隔的片段独立分词，各章节清理结果以空格拼接等于整篇清理结果时，
+        整篇分词即各章节分词结果依次拼接；不等（如跨章节的 --- 分隔线被一并移除）时整篇分词
+        """
+        parser = self.parser
+        if content != self._content:
+            return parser.keyword_frequencies(content)
+        previous = self._tokens
+        tokens: Dict[str, Tuple[str, List[str]]] = {}
+        for section in self._sections:
+            if section not in tokens:
+                cached = previous.get(section)
+                if cached is None:
+                    cleaned = parser._clean_text(section)
+                    cached = (cleaned, parser._tokenize(cleaned) if cleaned else [])
+                tokens[section] = cached
+        self._tokens = tokens
+
+        whole = parser._clean_text(content)
+        if ' '.join(tokens[s][0] for s in self._sections if tokens[s][0]) != whole:
+            words = parser._tokenize(whole)
+        else:
+            words = [word for s in self._sections for word in tokens[s][1]]
+        # 逐键输入会不断产生新的词片段，判断缓存明显大于当前词项数时重建
+        if len(self._quality) > 4 * len(words) + 1024:
+            self._quality = {}
+        return parser.token_frequencies(words, self._quality)
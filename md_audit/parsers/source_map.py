@@ -0,0 +1,150 @@
+"""
+源码位置映射（标题、链接、图片、段落、frontmatter字段 -> 原文件行列号）
+
+python-markdown 转换HTML时不保留源位置，解析时由逐行扫描（line_scanner）
+顺带记录各元素的起始行列；引擎生成诊断时按元素查询，无需再搜索原文。
+
+行号、列号均从1开始，相对原始文件（含frontmatter），列号按字符计。
+"""
+import re
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from md_audit.parsers.line_scanner import (
+    AUTOLINK_RE,
+    EMAIL_AUTOLINK_RE,
+    HTML_A_RE,
+    HTML_IMG_RE,
+    IMAGE_RE,
+    LINK_RE,
+    ScannedLine,
+    _html_attrs,
+)
+
+# frontmatter 顶层字段行（YAML的 key: value）
+FRONTMATTER_KEY_RE = re.compile(r'^([A-Za-z_][\w-]*)\s*:')
+
+
+class SourceLocation(NamedTuple):
+    line: int
+    column: int
+
+
+class SourceMap:
+    """一个文件的源码位置映射（按文档顺序）"""
+
+    __slots__ = ('frontmatter_keys', 'headings', 'links', 'images', 'paragraphs')
+
+    def __init__(self):
+        self.frontmatter_keys: Dict[str, SourceLocation] = {}
+        self.headings: List[Tuple[int, SourceLocation]] = []        # (级别, 位置)
+        self.links: List[Tuple[str, SourceLocation]] = []           # (href, 位置)
+        self.images: List[Tuple[str, str, SourceLocation]] = []     # (src, alt, 位置)
+        # 与 content.split("\n\n") 后去除空白块的段落一一对应；流式解析（正文抽样）时为None
+        self.paragraphs: Optional[List[SourceLocation]] = []
+
+    def frontmatter_key(self, *keys: str) -> Optional[SourceLocation]:
+        """第一个存在的frontmatter字段位置"""
+        for key in keys:
+            location = self.frontmatter_keys.get(key)
+            if location is not None:
+                return location
+        return None
+
+    def heading(self, level: int, index: int = 0) -> Optional[SourceLocation]:
+        """第 index 个指定级别标题的位置（从0开始）"""
+        for heading_level, location in self.headings:
+            if heading_level == level:
+                if index == 0:
+                    return location
+                index -= 1
+        return None
+
+    def title(self) -> Optional[SourceLocation]:
+        """标题位置：frontmatter的title，否则第一个H1"""
+        return self.frontmatter_key('title') or self.heading(1)
+
+    def paragraph(self, index: int) -> Optional[SourceLocation]:
+        if self.paragraphs is None or index >= len(self.paragraphs):
+            return None
+        return self.paragraphs[index]
+
+    def link(self, href: str) -> Optional[SourceLocation]:
+        """第一个指向 href 的链接位置"""
+        return next((location for link_href, location in self.links if link_href == href), None)
+
+    def image_without_alt(self) -> Optional[SourceLocation]:
+        return next((location for _, alt, location in self.images if not alt), None)
+
+
+def frontmatter_key_locations(lines: Iterable[str], start_lineno: int = 1) -> Dict[str, SourceLocation]:
+    """frontmatter文本行中顶层字段的位置（同名字段取首次出现）"""
+    keys: Dict[str, SourceLocation] = {}
+    for lineno, text in enumerate(lines, start_lineno):
+        m = FRONTMATTER_KEY_RE.match(text)
+        if m and m.group(1) not in keys:
+            keys[m.group(1)] = SourceLocation(lineno, 1)
+    return keys
+
+
+class SourceMapBuilder:
+    """
+    按扫描行累积 SourceMap
+
+    Args:
+        first_column: 扫描起点所在行的列偏移（正文首行前的空白被frontmatter解析去除时）
+        paragraphs: 是否记录段落（仅当扫描的正文即引擎分析的正文时有意义）
+    """
+
+    def __init__(self, first_column: int = 0, paragraphs: bool = True):
+        self.map = SourceMap()
+        if not paragraphs:
+            self.map.paragraphs = None
+        self._first_lineno: Optional[int] = None
+        self._first_column = first_column
+        self._new_block = True
+
+    def feed(self, line: ScannedLine) -> None:
+        text = line.text
+        if self._first_lineno is None:
+            self._first_lineno = line.lineno
+        shift = self._first_column if line.lineno == self._first_lineno else 0
+        source_map = self.map
+
+        paragraphs = source_map.paragraphs
+        if paragraphs is not None:
+            if not text:
+                self._new_block = True
+            elif self._new_block and not text.isspace():
+                indent = len(text) - len(text.lstrip())
+                paragraphs.append(SourceLocation(line.lineno, indent + shift + 1))
+                self._new_block = False
+
+        if line.heading is not None:
+            indent = len(text) - len(text.lstrip())
+            source_map.headings.append((line.heading[0], SourceLocation(line.lineno, indent + shift + 1)))
+        if line.in_code:
+            return
+
+        if '[' in text or '<' in text:
+            found = []
+            for m in LINK_RE.finditer(text):
+                found.append((m.start(), m.group(2)))
+            if '<' in text:
+                for m in AUTOLINK_RE.finditer(text):
+                    found.append((m.start(), m.group(1)))
+                for m in EMAIL_AUTOLINK_RE.finditer(text):
+                    found.append((m.start(), f'mailto:{m.group(1)}'))
+                for m in HTML_A_RE.finditer(text):
+                    found.append((m.start(), _html_attrs(m.group(1)).get('href', '')))
+            found.sort(key=lambda item: item[0])
+            source_map.links.extend((href, SourceLocation(line.lineno, start + shift + 1))
+                                    for start, href in found)
+
+        if '![' in text or '<' in text:
+            found = [(m.start(), m.group(2), m.group(1)) for m in IMAGE_RE.finditer(text)]
+            for m in HTML_IMG_RE.finditer(text):
+                attrs = _html_attrs(m.group(0))
+                found.append((m.start(), attrs.get('src', ''), attrs.get('alt', '')))
+            found.sort(key=lambda item: item[0])
+            source_map.images.extend((src, alt, SourceLocation(line.lineno, start + shift + 1))
+                                     for start, src, alt in found)
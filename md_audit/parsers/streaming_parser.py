@@ -0,0 +1,244 @@
+"""
+超大Markdown文件流式解析
+
+单次顺序读取文件，内存占用与抽样预算而非文件大小成正比：
+- frontmatter、标题大纲、链接、图片：完整提取
+- 字数：逐行精确统计（与完整解析同一计数规则）
+- 正文：按章节切块抽样（开头 + 均匀分布的中间块 + 结尾），
+  仅抽样正文转换为HTML，供正文类检查使用
+"""
+import os
+from collections import deque
+from itertools import chain
+from typing import TYPE_CHECKING, Deque, Iterator, List, Optional, Tuple
+
+import frontmatter
+from bs4 import BeautifulSoup
+
+from md_audit.config import LargeFileRules
+from md_audit.models.data_models import ParsedMarkdown
+from md_audit.parsers.line_scanner import (
+    FENCE_RE,
+    AnchorCollector,
+    ScannedLine,
+    extract_images,
+    extract_links,
+    scan_lines,
+    split_heading_id,
+    strip_inline,
+    text_for_count,
+)
+from md_audit.parsers.source_map import SourceMapBuilder, frontmatter_key_locations
+
+if TYPE_CHECKING:
+    from md_audit.parsers.markdown_parser import MarkdownParser
+
+# frontmatter超过此大小仍未闭合时视为正文（与python-frontmatter行为一致：无闭合则无frontmatter）
+FRONTMATTER_MAX_BYTES = 1024 * 1024
+FRONTMATTER_DELIMITER = '---'
+
+
+class BodySampler:
+    """
+    正文切块抽样
+
+    以H1/H2或块大小为界切块；开头块填满head预算，之后按字节步长均匀抽取中间块，
+    结尾块用定长队列保留。文件总大小已知，因此单次遍历即可确定步长。
+    """
+
+    def __init__(self, total_bytes: int, rules: LargeFileRules):
+        budget = rules.sample_budget_bytes
+        self.chunk_bytes = max(1024, rules.sample_chunk_bytes)
+        self.head_budget = int(budget * rules.head_ratio)
+        self.tail_budget = int(budget * rules.tail_ratio)
+        self.middle_budget = max(0, budget - self.head_budget - self.tail_budget)
+        middle_slots = max(1, self.middle_budget // self.chunk_bytes)
+        self.stride = max(self.chunk_bytes, (total_bytes - self.head_budget - self.tail_budget) / middle_slots)
+
+        self.head: List[Tuple[int, str]] = []
+        self.middle: List[Tuple[int, str]] = []
+        self.tail: Deque[Tuple[int, str, int]] = deque()
+        self.head_used = self.middle_used = self.tail_used = 0
+        self.next_mark = None
+
+        self._lines: List[str] = []
+        self._start = 0
+        self._size = 0
+        self._reopen_fence = ''
+        # 当前打开的代码块：(围栏字符串如 ``` / ~~~~, 开始围栏行)；不在代码块内时为None
+        self._open_fence: Optional[Tuple[str, str]] = None
+
+    def feed(self, line: ScannedLine):
+        """追加一行；遇到H1/H2或块过大时切块"""
+        if self._lines and line.heading and line.heading[0] <= 2:
+            self._flush()
+        if not self._lines:
+            self._start = line.offset
+            if self._reopen_fence:
+                self._lines.append(self._reopen_fence)
+                self._reopen_fence = ''
+        self._lines.append(line.text)
+        self._size += line.size
+        if line.is_fence:
+            if self._open_fence is None:
+                self._open_fence = (FENCE_RE.match(line.text).group(1), line.text)
+            else:
+                self._open_fence = None
+
+        if self._size >= self.chunk_bytes and not line.in_code and not line.text.strip():
+            self._flush()
+        elif self._size >= self.chunk_bytes * 4 and self._open_fence is not None and not line.is_fence:
+            # 超长代码块强制切分：以打开时的围栏（~~~、更长的反引号）补齐并重新打开（保留语言标注），
+            # 保证抽样块各自可独立渲染
+            fence, opening = self._open_fence
+            self._lines.append(fence)
+            self._reopen_fence = opening
+            self._flush()
+
+    def _flush(self):
+        if not self._lines:
+            return
+        text = '\n'.join(self._lines).strip('\n')
+        offset, size = self._start, self._size
+        self._lines = []
+        self._size = 0
+        if not text.strip():
+            return
+
+        if self.head_used < self.head_budget:
+            self.head.append((offset, text))
+            self.head_used += size
+            return
+        if self.next_mark is None:
+            self.next_mark = offset + self.stride / 2
+        if offset >= self.next_mark and self.middle_used < self.middle_budget:
+            self.middle.append((offset, text))
+            self.middle_used += size
+            self.next_mark = offset + self.stride
+            return
+        self.tail.append((offset, text, size))
+        self.tail_used += size
+        while self.tail_used > self.tail_budget and len(self.tail) > 1:
+            self.tail_used -= self.tail.popleft()[2]
+
+    def finish(self) -> str:
+        """返回按原文顺序拼接的抽样正文"""
+        self._flush()
+        chunks = dict(self.head)
+        chunks.update(self.middle)
+        chunks.update((offset, text) for offset, text, _ in self.tail)
+        return '\n\n'.join(chunks[offset] for offset in sorted(chunks))
+
+
+class StreamingMarkdownParser:
+    """超大Markdown文件流式解析器（复用MarkdownParser的转换与计数规则）"""
+
+    def __init__(self, parser: 'MarkdownParser', rules: LargeFileRules):
+        self.parser = parser
+        self.rules = rules
+
+    def _read_lines(self, f) -> Iterator[Tuple[str, int]]:
+        for raw in f:
+            yield raw.decode('utf-8').rstrip('\r\n'), len(raw)
+
+    def _split_frontmatter(self, lines: Iterator[Tuple[str, int]]):
+        """
+        读取frontmatter
+
+        Returns:
+            (frontmatter字典, 正文行迭代器, 正文起始行号, 正文起始字节偏移, frontmatter字段位置)
+        """
+        first = next(lines, None)
+        if first is None:
+            return {}, iter(()), 1, 0, {}
+        if first[0].strip() != FRONTMATTER_DELIMITER:
+            return {}, chain([first], lines), 1, 0, {}
+
+        buffered = [first]
+        size = first[1]
+        for line in lines:
+            buffered.append(line)
+            size += line[1]
+            if line[0].strip() == FRONTMATTER_DELIMITER:
+                header = '\n'.join(text for text, _ in buffered)
+                metadata = frontmatter.loads(header).metadata
+                keys = frontmatter_key_locations((text for text, _ in buffered[1:-1]), start_lineno=2)
+                return metadata, lines, len(buffered) + 1, size, keys
+            if size > FRONTMATTER_MAX_BYTES:
+                break
+        return {}, chain(buffered, lines), 1, 0, {}
+
+    def parse(self, file_path: str) -> ParsedMarkdown:
+        """
+        流式解析超大Markdown文件
+
+        Raises:
+            FileNotFoundError: 文件不存在
+            UnicodeDecodeError: 文件编码错误
+            PermissionError: 无文件读取权限
+        """
+        total_bytes = os.path.getsize(file_path)
+        sampler = BodySampler(total_bytes, self.rules)
+        headings = {1: [], 2: [], 3: []}
+        links: List[dict] = []
+        images: List[dict] = []
+        anchors = AnchorCollector()
+        word_count = 0
+        # 抽样正文的段落与全文不对应，不记录段落位置
+        source_map = SourceMapBuilder(paragraphs=False)
+
+        try:
+            with open(file_path, 'rb') as f:
+                fm, body, lineno, offset, source_map.map.frontmatter_keys = \
+                    self._split_frontmatter(self._read_lines(f))
+                for line in scan_lines(body, start_lineno=lineno, start_offset=offset):
+                    source_map.feed(line)
+                    if line.heading:
+                        heading_text, heading_id = split_heading_id(line.heading[1])
+                        anchors.add_heading(strip_inline(heading_text), heading_id)
+                        if line.heading[0] in headings:
+                            headings[line.heading[0]].append(strip_inline(line.heading[1], strip=True))
+                    if not line.in_code:
+                        links.extend(extract_links(line.text))
+                        images.extend(extract_images(line.text))
+                    word_count += self.parser._count_words(text_for_count(line))
+                    sampler.feed(line)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"文件不存在: {file_path}")
+        except UnicodeDecodeError as e:
+            raise UnicodeDecodeError(
+                e.encoding, e.object, e.start, e.end,
+                f"文件编码错误（需要UTF-8编码）: {file_path}"
+            )
+        except PermissionError:
+            raise PermissionError(f"无权限读取文件: {file_path}")
+
+        raw_content = self.parser._normalize_headings(sampler.finish())
+        html_content = self.parser.md_parser.convert(raw_content)
+        self.parser.md_parser.reset()
+        sample_text = BeautifulSoup(html_content, 'html.parser').get_text()
+
+        title = fm.get('title', '') or (headings[1][0] if headings[1] else '')
+        description = fm.get('description', '') or fm.get('excerpt', '')
+        if not description:
+            description = sample_text.strip()[:160]
+
+        return ParsedMarkdown(
+            frontmatter=fm,
+            raw_content=raw_content,
+            html_content=html_content,
+            title=title,
+            description=description,
+            h1_tags=headings[1],
+            h2_tags=headings[2],
+            h3_tags=headings[3],
+            images=images,
+            links=links,
+            anchors=anchors.anchors,
+            word_count=word_count,
+            sampled=True,
+            source_bytes=total_bytes,
+            sampled_bytes=len(raw_content.encode('utf-8')),
+            sample_word_count=self.parser._count_words(sample_text),
+            source_map=source_map.map,
+        )
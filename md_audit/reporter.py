@@ -28,6 +28,12 @@ class MarkdownReporter:
         lines.append(f"**文件**: `{report.file_path}`\n")
         lines.append(f"**总分**: {report.total_score:.1f}/100 {report.emoji_badge}\n")
 
+        # 超大文件抽样说明
+        if report.sampled_checks:
+            checks = ", ".join(f"`{c}`" for c in report.sampled_checks)
+            lines.append(f"> ⚠️ 文件超过流式解析阈值：标题大纲、链接、图片与字数基于全文统计，"
+                         f"以下检查基于抽样正文：{checks}\n")
+
         # 分项得分（2025-11新版 100分体系）
         lines.append("## 评分详情\n")
         lines.append(f"- **元数据**: {report.metadata_score:.1f}/15")
@@ -64,7 +70,10 @@ class MarkdownReporter:
                 for item in category_items:
                     emoji = self.SEVERITY_EMOJI[item.severity]
                     lines.append(f"{emoji} **{item.check_name}** ({item.score:.1f}分)")
-                    lines.append(f"   - {item.message}")
+                    if item.line is not None and item.severity != SeverityLevel.SUCCESS:
+                        lines.append(f"   - {item.message}（第{item.line}行，第{item.column}列）")
+                    else:
+                        lines.append(f"   - {item.message}")
                     if item.suggestion:
                         lines.append(f"   - 💡 建议: {item.suggestion}")
                     if item.current_value and item.expected_value:
@@ -98,6 +107,15 @@ class MarkdownReporter:
                     lines.append(f"{i}. {suggestion}")
                 lines.append("")
 
+        # 性能剖析（--profile模式）
+        if report.profile:
+            lines.append("## 性能剖析\n")
+            lines.append("| 阶段 | 墙钟(ms) | CPU(ms) |")
+            lines.append("|------|----------|---------|")
+            for timing in report.profile:
+                lines.append(f"| `{timing.stage}` | {timing.wall_ms:.1f} | {timing.cpu_ms:.1f} |")
+            lines.append("")
+
         # 总结
         lines.append("## 总结\n")
         if report.total_score >= 90:
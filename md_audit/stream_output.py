@@ -0,0 +1,161 @@
+"""
+流式输出格式（md-audit analyze <目录> -o <输出目录> --format jsonl|sarif）
+
+报告在每个文件分析完成时立即写出，输出文件不需要在内存中保留全部报告：
+- JSON Lines：reports.jsonl，每行一个紧凑的完整报告（按完成顺序）；
+  站点级逐页诊断（标题/描述重复等）在全部文件分析完成后以
+  {"record": "corpus_diagnostics", "file_path": 相对路径, "diagnostics": [...]} 行追加在末尾
+- SARIF 2.1.0：md-audit.sarif，每条非 success 诊断为一个 result，CI 系统
+  （GitHub code scanning 等）可据此在文件上显示内联标注。
+  JSON 对象的键无顺序要求，results 数组边分析边写入，tool.driver.rules
+  （出现过的检查项）在关闭时写在其后
+
+文件位置均为相对分析目录的路径（SARIF 中相对 SRCROOT）。
+"""
+from pathlib import Path
+from typing import Dict, IO, List, Sequence
+
+from md_audit.models.data_models import DiagnosticItem, SEOReport, SeverityLevel
+from md_audit.utils import fast_json
+
+# 流式输出格式
+STREAM_FORMATS = ("jsonl", "sarif")
+
+# 输出文件名
+JSONL_NAME = "reports.jsonl"
+
+# JSON Lines 中站点级逐页诊断行的 record 值（报告行没有 record 字段）
+JSONL_CORPUS_RECORD = "corpus_diagnostics"
+SARIF_NAME = "md-audit.sarif"
+
+SARIF_VERSION = "2.1.0"
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+TOOL_NAME = "md-audit"
+TOOL_URI = "https://github.com/JasonRobertDestiny/MD_Audit"
+TOOL_VERSION = "1.0.0"
+
+# 严重程度 -> SARIF level（success 为通过项，不输出）
+SARIF_LEVELS = {
+    SeverityLevel.CRITICAL: "error",
+    SeverityLevel.WARNING: "warning",
+    SeverityLevel.INFO: "note",
+}
+
+
+def _rel_path(file_path: str, base_dir: Path) -> str:
+    try:
+        return Path(file_path).relative_to(base_dir).as_posix()
+    except ValueError:
+        return Path(file_path).as_posix()
+
+
+class JsonLinesWriter:
+    """逐行写出报告（每写一行即flush，可被下游边读边处理）"""
+
+    def __init__(self, output_dir: str):
+        output = Path(output_dir)
+        output.mkdir(parents=True, exist_ok=True)
+        self.path = output / JSONL_NAME
+        self.count = 0
+        self._file: IO[bytes] = open(self.path, "wb")
+
+    def add(self, report: SEOReport) -> None:
+        self._file.write(fast_json.dumps(report) + b"\n")
+        self._file.flush()
+        self.count += 1
+
+    def add_diagnostics(self, rel_path: str, diagnostics: Sequence[DiagnosticItem]) -> None:
+        """追加一个文件的站点级诊断行（rel_path 相对分析目录，不计入报告数）"""
+        if not diagnostics:
+            return
+        record = {"record": JSONL_CORPUS_RECORD, "file_path": rel_path, "diagnostics": list(diagnostics)}
+        self._file.write(fast_json.dumps(record) + b"\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class SarifWriter:
+    """
+    流式写出SARIF日志（单个run）
+
+    Args:
+        output_dir: 输出目录
+        base_dir: 分析目录（作为 SRCROOT，结果中的文件路径相对于它）
+        version: 工具版本
+    """
+
+    def __init__(self, output_dir: str, base_dir: str, version: str = TOOL_VERSION):
+        output = Path(output_dir)
+        output.mkdir(parents=True, exist_ok=True)
+        self.path = output / SARIF_NAME
+        self.base_dir = Path(base_dir)
+        self.version = version
+        self.count = 0
+        self._rules: Dict[str, int] = {}
+        self._rule_meta: List[dict] = []
+        self._file: IO[bytes] = open(self.path, "wb")
+        self._file.write(b'{"version":"' + SARIF_VERSION.encode() + b'","$schema":"'
+                         + SARIF_SCHEMA.encode() + b'","runs":[{"results":[')
+
+    def _rule_index(self, item: DiagnosticItem) -> int:
+        rule_id = f"{item.category}/{item.check_name}"
+        index = self._rules.get(rule_id)
+        if index is None:
+            index = self._rules[rule_id] = len(self._rule_meta)
+            self._rule_meta.append({
+                "id": rule_id,
+                "name": item.check_name,
+                "properties": {"category": item.category},
+            })
+        return index
+
+    def add_diagnostics(self, rel_path: str, diagnostics: Sequence[DiagnosticItem]) -> None:
+        """写出一个文件的诊断（rel_path 相对分析目录）"""
+        chunks = []
+        for item in diagnostics:
+            level = SARIF_LEVELS.get(item.severity)
+            if level is None:
+                continue
+            index = self._rule_index(item)
+            # 无具体位置的文档级诊断标注在首行
+            region = {"startLine": item.line or 1}
+            if item.column is not None:
+                region["startColumn"] = item.column
+            text = item.message if not item.suggestion else f"{item.message}。建议：{item.suggestion}"
+            result = {
+                "ruleId": self._rule_meta[index]["id"],
+                "ruleIndex": index,
+                "level": level,
+                "message": {"text": text},
+                "locations": [{"physicalLocation": {
+                    "artifactLocation": {"uri": rel_path, "uriBaseId": "SRCROOT"},
+                    "region": region,
+                }}],
+                "properties": {"score": item.score},
+            }
+            chunks.append(fast_json.dumps(result))
+        if not chunks:
+            return
+        prefix = b"," if self.count else b""
+        self._file.write(prefix + b",".join(chunks))
+        self.count += len(chunks)
+
+    def add(self, report: SEOReport) -> None:
+        self.add_diagnostics(_rel_path(report.file_path, self.base_dir), report.diagnostics)
+        self._file.flush()
+
+    def close(self) -> None:
+        tail = {
+            "tool": {"driver": {
+                "name": TOOL_NAME,
+                "informationUri": TOOL_URI,
+                "version": self.version,
+                "rules": self._rule_meta,
+            }},
+            "originalUriBaseIds": {"SRCROOT": {"uri": self.base_dir.resolve().as_uri() + "/"}},
+            "columnKind": "unicodeCodePoints",
+        }
+        self._file.write(b"]," + fast_json.dumps(tail)[1:] + b"]}")
+        self._file.close()
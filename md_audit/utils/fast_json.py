@@ -0,0 +1,40 @@
+"""
+快速JSON序列化
+
+报告、API响应与历史记录统一经此序列化为紧凑的UTF-8字节（不缩进）：
+- Pydantic模型（含嵌套模型的dict/list）：pydantic-core 直接输出字节，
+  不经过 model_dump 中间字典
+- 普通dict/list：安装了 orjson 时使用 orjson，否则由 pydantic-core 序列化
+
+orjson 为可选依赖（pip install orjson），未安装时行为一致，仅速度不同。
+"""
+from typing import Any, Union
+
+import pydantic_core
+from pydantic import BaseModel
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+    import json
+
+
+def dumps(obj: Any) -> bytes:
+    """序列化为紧凑的UTF-8 JSON字节（非ASCII字符不转义）"""
+    if isinstance(obj, BaseModel):
+        return obj.__pydantic_serializer__.to_json(obj)
+    if HAS_ORJSON:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass  # 含Pydantic模型等orjson不支持的类型，交给pydantic-core
+    return pydantic_core.to_json(obj)
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """解析JSON字节或字符串"""
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -0,0 +1,280 @@
+"""
+Markdown 文件遍历
+
+基于 os.scandir 的单线程深度优先遍历，边遍历边产出文件：遍历本身不并行，
+批量分析（MarkdownSEOAnalyzer.analyze_directory）在遍历的同时提交和收取分析任务，
+分析与遍历重叠，无需等待整棵目录树扫描完成：
+- 扩展名可配置，默认 .md 与 .markdown（与 Web 上传允许的扩展名一致）
+- 遵循各级 .gitignore，并默认跳过 node_modules、vendor、.git 等目录
+- include / exclude 使用 gitignore 语法（相对遍历根目录），exclude 优先级最高
+- 跟随符号链接时按 (st_dev, st_ino) 记录已访问目录，避免链接成环时无限递归、
+  同一目录经多个链接重复遍历
+
+注：gitignore 语法支持常用子集（通配符 * ? [..]、**、! 取反、/ 锚定、结尾 / 仅匹配目录），
+不支持 core.excludesFile 与 .git/info/exclude。
+"""
+import os
+import re
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# 默认Markdown扩展名
+MARKDOWN_EXTENSIONS = (".md", ".markdown")
+
+# 默认跳过的目录（依赖、版本控制与虚拟环境目录）
+DEFAULT_EXCLUDE_DIRS = (
+    "node_modules", "vendor", ".git", ".hg", ".svn",
+    "__pycache__", ".venv", "venv", ".tox",
+)
+
+GITIGNORE_NAME = ".gitignore"
+
+
+class IgnorePattern:
+    """单条 gitignore 规则（匹配相对规则所在目录的 / 分隔路径）"""
+
+    __slots__ = ("regex", "negate", "dir_only")
+
+    def __init__(self, regex: 're.Pattern', negate: bool, dir_only: bool):
+        self.regex = regex
+        self.negate = negate
+        self.dir_only = dir_only
+
+
+def _translate(pattern: str) -> str:
+    """gitignore 通配符 -> 正则（* ? 不匹配 /，** 匹配任意层级）"""
+    parts = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == "*":
+            if pattern.startswith("**/", i):
+                parts.append("(?:.*/)?")
+                i += 3
+                continue
+            if pattern.startswith("**", i) and i + 2 == n:
+                parts.append(".*")
+                i += 2
+                continue
+            parts.append("[^/]*")
+        elif c == "?":
+            parts.append("[^/]")
+        elif c == "[":
+            j = i + 1
+            if j < n and pattern[j] == "!":
+                j += 1
+            if j < n and pattern[j] == "]":
+                j += 1  # 紧跟 [ 或 [! 的 ] 是字符本身
+            end = pattern.find("]", j)
+            if end < 0:
+                parts.append(re.escape(c))
+            else:
+                body = pattern[i + 1:end]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                parts.append("[" + body.replace("\\", "\\\\") + "]")
+                i = end
+        elif c == "\\" and i + 1 < n:
+            i += 1
+            parts.append(re.escape(pattern[i]))
+        else:
+            parts.append(re.escape(c))
+        i += 1
+    return "".join(parts)
+
+
+def compile_pattern(line: str) -> Optional[IgnorePattern]:
+    """解析一行 gitignore 规则；空行与注释返回None"""
+    line = line.rstrip("\n\r")
+    if not line.endswith("\\ "):
+        line = line.rstrip(" ")
+    if not line or line.startswith("#"):
+        return None
+    negate = line.startswith("!")
+    if negate:
+        line = line[1:]
+    elif line.startswith("\\"):
+        line = line[1:]  # \! 与 \# 转义
+    dir_only = line.endswith("/")
+    line = line.rstrip("/")
+    if not line:
+        return None
+    # 不含 / 的规则匹配任意层级的同名项；含 / 的规则相对规则所在目录锚定
+    if "/" in line:
+        body = _translate(line.lstrip("/"))
+    else:
+        body = "(?:.*/)?" + _translate(line)
+    return IgnorePattern(re.compile(body + r"\Z", re.DOTALL), negate, dir_only)
+
+
+def compile_patterns(lines: Iterable[str]) -> List[IgnorePattern]:
+    return [p for p in (compile_pattern(line) for line in lines) if p is not None]
+
+
+# (规则所在目录相对根目录的前缀，如 "" 或 "docs/"，规则列表)
+_RuleSet = Tuple[str, List[IgnorePattern]]
+
+
+def _match(rule_sets: Sequence[_RuleSet], rel_path: str, is_dir: bool) -> Optional[bool]:
+    """按 gitignore 语义匹配（后出现的规则优先）；True=忽略，False=取反保留，None=无规则匹配"""
+    result = None
+    for prefix, patterns in rule_sets:
+        if not rel_path.startswith(prefix):
+            continue
+        sub_path = rel_path[len(prefix):]
+        for pattern in patterns:
+            if pattern.dir_only and not is_dir:
+                continue
+            if pattern.regex.match(sub_path):
+                result = not pattern.negate
+    return result
+
+
+class FileWalker:
+    """
+    Markdown 文件遍历器（可迭代，按发现顺序产出以root为前缀的文件路径）
+
+    Args:
+        root: 遍历根目录
+        extensions: 文件扩展名（不区分大小写）
+        include: 包含规则（gitignore语法）；非空时文件须匹配其中之一
+        exclude: 排除规则（gitignore语法，优先级高于 .gitignore）
+        use_gitignore: 是否遵循各级 .gitignore
+        exclude_dirs: 默认跳过的目录名
+        follow_symlinks: 是否跟随符号链接
+    """
+
+    def __init__(
+        self,
+        root: str,
+        extensions: Sequence[str] = MARKDOWN_EXTENSIONS,
+        include: Sequence[str] = (),
+        exclude: Sequence[str] = (),
+        use_gitignore: bool = True,
+        exclude_dirs: Sequence[str] = DEFAULT_EXCLUDE_DIRS,
+        follow_symlinks: bool = True
+    ):
+        self.root = root
+        self.extensions = tuple(ext.lower() if ext.startswith(".") else "." + ext.lower()
+                                for ext in extensions)
+        self.include = compile_patterns(include)
+        self.use_gitignore = use_gitignore
+        self.follow_symlinks = follow_symlinks
+        self._base_rules: List[IgnorePattern] = compile_patterns(d + "/" for d in exclude_dirs)
+        self._exclude_rules: List[IgnorePattern] = compile_patterns(exclude)
+        self._gitignore_cache: Dict[str, List[IgnorePattern]] = {}
+
+    def _gitignore(self, directory: str) -> List[IgnorePattern]:
+        patterns = self._gitignore_cache.get(directory)
+        if patterns is None:
+            patterns = []
+            if self.use_gitignore:
+                try:
+                    with open(os.path.join(directory, GITIGNORE_NAME), encoding="utf-8", errors="replace") as f:
+                        patterns = compile_patterns(f)
+                except OSError:
+                    pass
+            self._gitignore_cache[directory] = patterns
+        return patterns
+
+    def _ignored(self, rule_sets: Sequence[_RuleSet], rel_path: str, is_dir: bool) -> bool:
+        # 默认目录 -> 各级 .gitignore -> exclude，后者覆盖前者
+        base = _match([("", self._base_rules)], rel_path, is_dir)
+        gitignore = _match(rule_sets, rel_path, is_dir)
+        exclude = _match([("", self._exclude_rules)], rel_path, is_dir)
+        for result in (exclude, gitignore, base):
+            if result is not None:
+                return result
+        return False
+
+    def _wanted_file(self, rule_sets: Sequence[_RuleSet], rel_path: str) -> bool:
+        if not rel_path.lower().endswith(self.extensions):
+            return False
+        if self._ignored(rule_sets, rel_path, False):
+            return False
+        return not self.include or self._included(rel_path)
+
+    def _included(self, rel_path: str) -> bool:
+        """文件本身或其任一上级目录匹配 include 规则"""
+        rules = [("", self.include)]
+        if _match(rules, rel_path, False):
+            return True
+        parts = rel_path.split("/")[:-1]
+        return any(_match(rules, "/".join(parts[:depth]), True) for depth in range(1, len(parts) + 1))
+
+    def _rule_sets_for(self, rel_dir: str) -> List[_RuleSet]:
+        """rel_dir（含）及其所有上级目录的 .gitignore 规则"""
+        rule_sets = [("", self._gitignore(self.root))]
+        prefix = ""
+        for part in [p for p in rel_dir.split("/") if p]:
+            prefix += part + "/"
+            rule_sets.append((prefix, self._gitignore(os.path.join(self.root, *prefix[:-1].split("/")))))
+        return rule_sets
+
+    def excludes_dir(self, rel_dir: str) -> bool:
+        """判断相对根目录的目录（/ 分隔，""为根目录）或其任一上级目录是否被排除"""
+        parts = [p for p in rel_dir.split("/") if p]
+        for depth in range(1, len(parts) + 1):
+            if self._ignored(self._rule_sets_for("/".join(parts[:depth - 1])), "/".join(parts[:depth]), True):
+                return True
+        return False
+
+    def matches(self, rel_path: str) -> bool:
+        """
+        判断相对根目录的文件路径（/ 分隔）是否会被遍历产出（不访问文件本身）
+
+        供 git、文件监听等外部来源的路径与目录遍历保持一致的过滤规则
+        """
+        rel_dir = rel_path.rpartition("/")[0]
+        if self.excludes_dir(rel_dir):
+            return False
+        return self._wanted_file(self._rule_sets_for(rel_dir), rel_path)
+
+    def __iter__(self) -> Iterator[str]:
+        try:
+            root_stat = os.stat(self.root)
+        except OSError:
+            return
+        visited = {(root_stat.st_dev, root_stat.st_ino)}
+        # 栈元素：(目录路径, 相对根目录的前缀, 适用的 .gitignore 规则)
+        stack: List[Tuple[str, str, List[_RuleSet]]] = [
+            (self.root, "", [("", self._gitignore(self.root))])
+        ]
+        while stack:
+            directory, prefix, rule_sets = stack.pop()
+            try:
+                with os.scandir(directory) as it:
+                    entries = sorted(it, key=lambda e: e.name)
+            except OSError:
+                continue  # 无权限或遍历期间被删除
+
+            subdirs = []
+            for entry in entries:
+                rel_path = prefix + entry.name
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=self.follow_symlinks)
+                except OSError:
+                    continue
+                if is_dir:
+                    if self._ignored(rule_sets, rel_path, True):
+                        continue
+                    try:
+                        st = entry.stat()  # 符号链接时为目标目录
+                    except OSError:
+                        continue
+                    key = (st.st_dev, st.st_ino)
+                    if key in visited:
+                        continue  # 符号链接成环或已经由其他路径遍历
+                    visited.add(key)
+                    subdirs.append((entry.path, rel_path + "/"))
+                elif self._wanted_file(rule_sets, rel_path):
+                    try:
+                        if not entry.is_file(follow_symlinks=self.follow_symlinks):
+                            continue
+                    except OSError:
+                        continue
+                    yield entry.path
+
+            # 逆序入栈，按名称顺序深度优先
+            for path, sub_prefix in reversed(subdirs):
+                patterns = self._gitignore(path)
+                stack.append((path, sub_prefix, rule_sets + [(sub_prefix, patterns)] if patterns else rule_sets))
@@ -0,0 +1,201 @@
+"""
+关键词出现位置索引
+
+每个文档只扫描正文一次：全部关键词编译为一个前缀树正则（最长优先的交替分支），
+一次 split 得到每个匹配位置上最长的关键词，匹配偏移由片段长度在C层累加得到；
+覆盖率、密度与位置分布检查均读取同一份出现位置。
+
+正则匹配互不重叠，同一位置或匹配区间内开始的其他关键词按索引构建时预计算的关系补全：
+- 同一位置开始的较短关键词必为最长匹配的前缀，按关键词批量记录
+- 匹配区间内开始、完全落在匹配内的关键词由匹配文本保证，按关键词批量记录
+- 可能超出匹配末尾的关键词，在其起始偏移处用同一正则再匹配一次
+因此得到的是全部出现位置（含相互重叠的出现），与逐个关键词 str.find 的结果相同；
+次数由位置贪心取不重叠出现得到（与 str.count 一致），窗口判断由位置二分
+（与 keyword in text[start:end] 一致）。
+"""
+import bisect
+import re
+import threading
+from collections import OrderedDict
+from itertools import accumulate, islice
+from typing import Dict, Iterable, List, Optional, Pattern, Tuple
+
+from md_audit.utils.metrics import record_cache
+
+# 关键词索引缓存容量（按关键词元组，最近最少使用淘汰）
+INDEX_CACHE_SIZE = 256
+
+
+class KeywordOccurrences:
+    """单个文本上的关键词出现位置与次数"""
+
+    def __init__(self, text: str, counts: Dict[str, int], offsets: Dict[str, List[int]]):
+        self.text = text
+        self.counts = counts
+        self.offsets = offsets
+
+    @property
+    def text_length(self) -> int:
+        return len(self.text)
+
+    def contains(self, keyword: str) -> bool:
+        """等价于 keyword in text"""
+        return self.counts.get(keyword, 0) > 0
+
+    def count(self, keyword: str) -> int:
+        """等价于 text.count(keyword)（从左到右的非重叠计数）"""
+        return self.counts.get(keyword, 0)
+
+    def contains_within(self, keyword: str, start: int, end: int) -> bool:
+        """等价于 keyword in text[start:end]（start/end 为非负偏移），由出现位置二分判断"""
+        if not keyword:
+            return True
+        starts = self.offsets.get(keyword)
+        if not starts:
+            return False
+        # start 之后的第一个出现结束最早，它在窗口内即有出现
+        i = bisect.bisect_left(starts, start)
+        return i < len(starts) and starts[i] + len(keyword) <= min(end, len(self.text))
+
+
+def _trie_pattern(keywords: Iterable[str]) -> str:
+    """关键词前缀树 -> 正则（同一位置优先匹配最长的关键词）"""
+    trie: Dict[str, dict] = {}
+    for kw in keywords:
+        node = trie
+        for ch in kw:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            # 已是完整关键词，后续字符可选（贪婪，先尝试更长的关键词）
+            return body + "?" if len(branches) == 1 and len(body) == 1 else "(?:" + body + ")?"
+        return body
+
+    return build(trie)
+
+
+def _count_non_overlapping(starts: List[int], length: int) -> int:
+    """从全部出现位置贪心选取不重叠的出现（与 str.count 的计数方式相同）"""
+    if len(starts) < 2:
+        return len(starts)
+    count = 0
+    next_free = 0
+    for pos in starts:
+        if pos >= next_free:
+            count += 1
+            next_free = pos + length
+    return count
+
+
+class KeywordIndex:
+    """去重后的关键词集合（编译一次扫描所需的正则与关键词关系），可在多个文本上复用"""
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords: Tuple[str, ...] = tuple(dict.fromkeys(keywords))
+        searchable = [kw for kw in self.keywords if kw]
+        # 捕获分组：split 交替给出 [间隔文本, 关键词, 间隔文本, ...]
+        self._pattern: Optional[Pattern] = (
+            re.compile("(" + _trie_pattern(searchable) + ")") if searchable else None
+        )
+        # 最长匹配为 kw 时需额外记录的出现：
+        # - _prefixes[kw]: 同一位置开始的较短关键词（kw 的前缀）
+        # - _covered[kw]: (偏移 d, 关键词...)，匹配区间内开始且完全落在 kw 内的关键词
+        # - _probes[kw]: 有关键词可能超出 kw 末尾的偏移 d，扫描时在该处重新匹配一次
+        self._prefixes: Dict[str, Tuple[str, ...]] = {}
+        self._covered: Dict[str, Tuple[Tuple[int, Tuple[str, ...]], ...]] = {}
+        self._probes: Dict[str, Tuple[int, ...]] = {}
+        for kw in searchable:
+            prefixes = tuple(other for other in searchable if other != kw and kw.startswith(other))
+            if prefixes:
+                self._prefixes[kw] = prefixes
+            covered = []
+            probes = []
+            for d in range(1, len(kw)):
+                rest = kw[d:]
+                if any(other.startswith(rest) and other != rest for other in searchable):
+                    probes.append(d)
+                else:
+                    inside = tuple(other for other in searchable if rest.startswith(other))
+                    if inside:
+                        covered.append((d, inside))
+            if covered:
+                self._covered[kw] = tuple(covered)
+            if probes:
+                self._probes[kw] = tuple(probes)
+
+    def scan(self, text: str) -> KeywordOccurrences:
+        """一次扫描文本，记录每个关键词的全部出现位置，并据此计数"""
+        offsets: Dict[str, List[int]] = {kw: [] for kw in self.keywords if kw}
+        if self._pattern is not None:
+            parts = self._pattern.split(text)
+            # 各片段的起始偏移（C层累加），关键词片段位于奇数下标
+            starts = accumulate(map(len, parts), initial=0)
+            for kw, pos in zip(islice(parts, 1, None, 2), islice(starts, 1, None, 2)):
+                offsets[kw].append(pos)
+
+            # 按关键词批量补全被最长匹配覆盖的出现，补全后的列表重新排序
+            extra: Dict[str, List[int]] = {}
+            for kw, prefixes in self._prefixes.items():
+                if offsets[kw]:
+                    for other in prefixes:
+                        extra.setdefault(other, []).extend(offsets[kw])
+            for kw, covered in self._covered.items():
+                matched = offsets[kw]
+                if matched:
+                    for d, inside in covered:
+                        shifted = [pos + d for pos in matched]
+                        for other in inside:
+                            extra.setdefault(other, []).extend(shifted)
+            match = self._pattern.match
+            prefixes_of = self._prefixes
+            for kw, probes in self._probes.items():
+                for pos in offsets[kw]:
+                    for d in probes:
+                        m = match(text, pos + d)
+                        if m is not None:
+                            longest = m[1]
+                            extra.setdefault(longest, []).append(pos + d)
+                            for other in prefixes_of.get(longest, ()):
+                                extra.setdefault(other, []).append(pos + d)
+            for other, found in extra.items():
+                found.extend(offsets[other])
+                found.sort()
+                offsets[other] = found
+
+        counts: Dict[str, int] = {}
+        for kw in self.keywords:
+            if kw:
+                counts[kw] = _count_non_overlapping(offsets[kw], len(kw))
+            else:
+                counts[kw] = len(text) + 1
+        return KeywordOccurrences(text, counts, offsets)
+
+
+_index_cache: 'OrderedDict[Tuple[str, ...], KeywordIndex]' = OrderedDict()
+_index_cache_lock = threading.Lock()
+
+
+def build_keyword_index(keywords: Tuple[str, ...]) -> KeywordIndex:
+    """
+    构建关键词索引（按关键词元组缓存，批量分析中相同关键词集合复用同一实例）
+
+    命中与未命中计入 /metrics 的 md_audit_cache_requests_total{cache="keyword_index"}
+    """
+    with _index_cache_lock:
+        index = _index_cache.get(keywords)
+        if index is not None:
+            _index_cache.move_to_end(keywords)
+    record_cache("keyword_index", hit=index is not None)
+    if index is None:
+        index = KeywordIndex(keywords)
+        with _index_cache_lock:
+            _index_cache[keywords] = index
+            if len(_index_cache) > INDEX_CACHE_SIZE:
+                _index_cache.popitem(last=False)
+    return index
@@ -0,0 +1,132 @@
+"""
+启动耗时剖析（md-audit --startup-profile）
+
+以 python -X importtime 重新执行同一命令：子进程标准输出原样转发，
+结束后在标准错误输出首次输出耗时、总耗时，以及按顶层包汇总的导入耗时
+和 md_audit 各模块的累计导入耗时（含其触发的第三方导入）。
+"""
+import os
+import subprocess
+import sys
+import threading
+import time
+from typing import Dict, List, Tuple
+
+# -X importtime 输出行前缀
+IMPORTTIME_PREFIX = "import time:"
+
+
+def parse_importtime(lines: List[str]) -> List[Tuple[str, int, int]]:
+    """
+    解析 -X importtime 输出
+
+    Returns:
+        [(模块名, 自身耗时µs, 累计耗时µs)]，按导入完成顺序
+    """
+    records = []
+    for line in lines:
+        if not line.startswith(IMPORTTIME_PREFIX):
+            continue
+        parts = line[len(IMPORTTIME_PREFIX):].split("|")
+        if len(parts) != 3:
+            continue
+        self_us, cumulative_us, name = parts
+        try:
+            records.append((name.strip(), int(self_us), int(cumulative_us)))
+        except ValueError:
+            continue  # 表头行
+    return records
+
+
+def format_profile(
+    records: List[Tuple[str, int, int]],
+    first_output_ms: float,
+    total_ms: float,
+    top_n: int = 15
+) -> str:
+    """输出Markdown格式的启动耗时报告"""
+    by_package: Dict[str, List[int]] = {}
+    for name, self_us, _ in records:
+        stats = by_package.setdefault(name.split(".")[0], [0, 0])
+        stats[0] += self_us
+        stats[1] += 1
+    import_ms = sum(self_us for _, self_us, _ in records) / 1000
+
+    lines = [
+        "# 启动耗时剖析",
+        "",
+        f"- 首次输出: {first_output_ms:.1f} ms" if first_output_ms >= 0 else "- 首次输出: -（无标准输出）",
+        f"- 总耗时: {total_ms:.1f} ms",
+        f"- 模块导入: {import_ms:.1f} ms（{len(records)} 个模块，不含解释器启动）",
+        "",
+        "## 按顶层包",
+        "",
+        "| 包 | 导入耗时(ms) | 模块数 |",
+        "|----|--------------|--------|",
+    ]
+    packages = sorted(by_package.items(), key=lambda item: item[1][0], reverse=True)
+    for package, (self_us, count) in packages[:top_n]:
+        lines.append(f"| `{package}` | {self_us / 1000:.1f} | {count} |")
+
+    own = [r for r in records if r[0] == "md_audit" or r[0].startswith("md_audit.")]
+    if own:
+        lines.extend([
+            "",
+            "## md_audit 模块（累计，含触发的依赖导入）",
+            "",
+            "| 模块 | 累计(ms) | 自身(ms) |",
+            "|------|----------|----------|",
+        ])
+        for name, self_us, cumulative_us in sorted(own, key=lambda r: r[2], reverse=True)[:top_n]:
+            lines.append(f"| `{name}` | {cumulative_us / 1000:.1f} | {self_us / 1000:.1f} |")
+    return "\n".join(lines)
+
+
+def run(argv: List[str], top_n: int = 15) -> int:
+    """
+    在 -X importtime 下重新执行 md_audit 命令并输出剖析结果
+
+    Args:
+        argv: 去掉 --startup-profile 后的命令行参数
+        top_n: 每个表格最多显示的行数
+
+    Returns:
+        子进程退出码
+    """
+    cmd = [sys.executable, "-X", "importtime", "-m", "md_audit.main", *argv]
+    start = time.perf_counter()
+    # 子进程输出不缓冲，与终端下逐行输出一致，首次输出时间才有意义
+    env = dict(os.environ, PYTHONUNBUFFERED="1")
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=env)
+
+    # 标准错误单独线程读取，避免管道写满阻塞子进程；非importtime行原样转发
+    importtime_lines: List[str] = []
+
+    def drain_stderr():
+        for raw in proc.stderr:
+            line = raw.decode("utf-8", errors="replace")
+            if line.startswith(IMPORTTIME_PREFIX):
+                importtime_lines.append(line)
+            else:
+                sys.stderr.write(line)
+
+    reader = threading.Thread(target=drain_stderr, daemon=True)
+    reader.start()
+
+    first_output_ms = -1.0
+    out = sys.stdout.buffer
+    while True:
+        chunk = proc.stdout.read1(65536)
+        if not chunk:
+            break
+        if first_output_ms < 0:
+            first_output_ms = (time.perf_counter() - start) * 1000
+        out.write(chunk)
+        out.flush()
+
+    returncode = proc.wait()
+    reader.join()
+    total_ms = (time.perf_counter() - start) * 1000
+
+    sys.stderr.write("\n" + format_profile(parse_importtime(importtime_lines), first_output_ms, total_ms, top_n) + "\n")
+    return returncode
@@ -0,0 +1,291 @@
+"""
+目录监听模式（md-audit watch）
+
+保持分析器常驻，监听目录中Markdown文件的新增、修改与删除：
+- Linux 下通过 ctypes 直接调用 libc 的 inotify（无需安装任何原生扩展），
+  其他平台或 inotify 不可用时回退为定时扫描 mtime/大小
+- 连续保存产生的事件先合并，静默 debounce 秒后（或累计等待超过 max_delay 秒）
+  才统一处理
+- 只重新分析变更的文件，单文件报告按文件更新，SUMMARY.md 由内存中的
+  全部报告重新汇总（不重新遍历目录、不重新分析未变更文件），内容不变时不重写
+- 站点级检查（站内链接、近重复、标题/描述唯一性、关键词蚕食）每批变更后由内存中
+  全部报告携带的文档特征重新运行，与 analyze <目录> 的汇总一致
+"""
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from md_audit.utils.file_walker import FileWalker
+
+# inotify 事件掩码（linux/inotify.h）
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = getattr(os, "O_CLOEXEC", 0o2000000)
+
+WATCH_MASK = (IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+              | IN_CREATE | IN_DELETE | IN_DELETE_SELF)
+
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class PollingWatcher:
+    """定时扫描文件 mtime/大小 的监听后端（全平台可用）"""
+
+    backend = "polling"
+
+    def __init__(self, walker: FileWalker, interval: float = 1.0):
+        self.walker = walker
+        self.interval = interval
+        self._snapshot = self._scan()
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        snapshot = {}
+        for path in self.walker:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def poll(self, timeout: Optional[float]) -> Set[str]:
+        """等待最多timeout秒（None为一个扫描间隔），返回新增/修改/删除的文件路径"""
+        time.sleep(self.interval if timeout is None else min(timeout, self.interval))
+        current = self._scan()
+        previous = self._snapshot
+        self._snapshot = current
+        changed = {p for p, state in current.items() if previous.get(p) != state}
+        changed.update(p for p in previous if p not in current)
+        return changed
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyWatcher:
+    """基于 inotify 的监听后端（ctypes 调用 libc，递归监听所有子目录）"""
+
+    backend = "inotify"
+
+    def __init__(self, walker: FileWalker):
+        libc_name = ctypes.util.find_library("c")
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self._libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 失败")
+        self.walker = walker
+        self._dirs: Dict[int, str] = {}
+        self._overflowed = False
+        self._add_tree(walker.root)
+
+    def _rel(self, path: str) -> str:
+        return os.path.relpath(path, self.walker.root).replace(os.sep, "/")
+
+    def _add_dir(self, path: str) -> None:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            return  # 目录已删除或无权限
+        self._dirs[wd] = path
+
+    def _add_tree(self, root: str) -> List[str]:
+        """监听root及其全部未排除的子目录，返回其中已存在的Markdown文件"""
+        files = []
+        if self.walker.excludes_dir(self._rel(root)):
+            return files
+        for dirpath, dirnames, filenames in os.walk(root):
+            self._add_dir(dirpath)
+            dirnames[:] = [d for d in dirnames
+                           if not self.walker.excludes_dir(self._rel(os.path.join(dirpath, d)))]
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                if self.walker.matches(self._rel(path)):
+                    files.append(path)
+        return files
+
+    def poll(self, timeout: Optional[float]) -> Set[str]:
+        """等待事件最多timeout秒（None为一直等待），返回新增/修改/删除的文件路径"""
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return set()
+        changed: Set[str] = set()
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            self._parse(data, changed)
+        if self._overflowed:
+            # 事件队列溢出：无法确定变更范围，全部视为变更
+            self._overflowed = False
+            changed.update(self.walker)
+        return changed
+
+    def _parse(self, data: bytes, changed: Set[str]) -> None:
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                self._overflowed = True
+                continue
+            directory = self._dirs.get(wd)
+            if directory is None:
+                continue
+            if mask & (IN_IGNORED | IN_DELETE_SELF):
+                self._dirs.pop(wd, None)
+                continue
+            path = os.path.join(directory, name)
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    # 新目录（含移入的目录树）：补充监听并将其中已有文件视为新增
+                    changed.update(self._add_tree(path))
+                elif mask & (IN_MOVED_FROM | IN_DELETE):
+                    # 目录移出/删除后其下文件已不可枚举：以 "目录/" 标记，由会话按报告路径前缀判定删除
+                    changed.add(path + os.sep)
+                continue
+            if self.walker.matches(self._rel(path)):
+                changed.add(path)
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+def create_watcher(walker: FileWalker, interval: float = 1.0, force_polling: bool = False):
+    """优先使用 inotify，不可用时回退到定时扫描（文件过滤规则与 walker 一致）"""
+    if not force_polling and hasattr(os, "O_NONBLOCK") and ctypes.util.find_library("c"):
+        try:
+            return InotifyWatcher(walker)
+        except (OSError, AttributeError):
+            pass  # 非Linux libc（无inotify符号）或inotify实例数已达上限
+    return PollingWatcher(walker, interval)
+
+
+class WatchSession:
+    """
+    监听会话：维护目录下全部文件的最新报告，按变更增量更新输出
+
+    Args:
+        analyzer: 已构建的 MarkdownSEOAnalyzer
+        root: 监听目录（报告中的文件路径以其为前缀，与 analyze_directory 一致）
+        write_outputs: 输出回调 (变更的报告列表, 删除的文件路径列表, 全部报告, 站点级检查)，
+            未启用站点级检查时最后一项为None
+        walk_options: 文件过滤选项（extensions/include/exclude/use_gitignore，同 analyze_directory）
+        corpus_factory: 创建空的站点级检查（CorpusAuditor）；为None时不做站点级检查
+    """
+
+    def __init__(self, analyzer, root: str, user_keywords: Optional[List[str]] = None,
+                 max_workers: int = 4, profile: bool = False,
+                 write_outputs: Optional[Callable] = None,
+                 walk_options: Optional[dict] = None,
+                 corpus_factory: Optional[Callable] = None):
+        self.analyzer = analyzer
+        self.root = root
+        self.user_keywords = user_keywords
+        self.max_workers = max_workers
+        self.profile = profile
+        self.write_outputs = write_outputs
+        self.walk_options = walk_options or {}
+        self.corpus_factory = corpus_factory
+        self.reports: Dict[str, object] = {}
+        self.corpus = None  # 最近一次完成的站点级检查
+
+    def initial_scan(self) -> None:
+        """首轮完整分析（复用 analyze_directory）"""
+        corpus = self.corpus_factory() if self.corpus_factory else None
+        for report in self.analyzer.analyze_directory(
+            self.root, user_keywords=self.user_keywords,
+            max_workers=self.max_workers, profile=self.profile, corpus=corpus, **self.walk_options
+        ):
+            self.reports[report.file_path] = report
+        self.corpus = corpus.finalize() if corpus is not None else None
+        if self.write_outputs:
+            self.write_outputs(list(self.reports.values()), [], self.all_reports(), self.corpus)
+
+    def create_watcher(self, interval: float = 1.0, force_polling: bool = False):
+        """创建与首轮分析过滤规则一致的监听后端"""
+        return create_watcher(FileWalker(self.root, **self.walk_options), interval, force_polling)
+
+    def all_reports(self) -> List[object]:
+        return list(self.reports.values())
+
+    def update(self, paths: Set[str]) -> Tuple[List[object], List[str]]:
+        """
+        处理一批变更
+
+        Returns:
+            (重新分析得到的报告, 已删除的文件路径)
+        """
+        removed_dirs = [p for p in paths if p.endswith(os.sep)]
+        paths = {p for p in paths if not p.endswith(os.sep)}
+        removed_set = {p for p in paths if not os.path.isfile(p) and p in self.reports}
+        for prefix in removed_dirs:
+            removed_set.update(p for p in self.reports if p.startswith(prefix))
+        removed = sorted(removed_set)
+        for path in removed:
+            self.reports.pop(path, None)
+
+        targets = sorted(p for p in paths if os.path.isfile(p))
+        # 站点级检查依赖全部页面：新报告在分析完成时加入，其余页面沿用已有报告的文档特征
+        corpus = self.corpus_factory() if self.corpus_factory else None
+        updated = []
+        for path, report in self.analyzer.analyze_files(
+            targets, self.user_keywords, self.max_workers, self.profile, corpus=corpus
+        ).items():
+            if report is not None:
+                previous = self.reports.get(path)
+                self.reports[path] = report
+                updated.append((report, previous))
+
+        if updated or removed:
+            if corpus is not None:
+                fresh = {id(r) for r, _ in updated}
+                for report in self.reports.values():
+                    if id(report) not in fresh:
+                        corpus.add(report)
+                self.corpus = corpus.finalize()
+            if self.write_outputs:
+                self.write_outputs([r for r, _ in updated], removed, self.all_reports(), self.corpus)
+        for report, previous in updated:
+            delta = ""
+            if previous is not None:
+                diff = report.total_score - previous.total_score
+                delta = f"（{diff:+.1f}）" if diff else "（未变）"
+            print(f"🔄 {report.file_path}: {report.total_score:.1f}/100{delta}")
+        for path in removed:
+            print(f"🗑️  {path}: 已删除")
+        return [r for r, _ in updated], removed
+
+    def run(self, watcher, debounce: float = 0.3, max_delay: float = 2.0) -> None:
+        """事件循环：合并突发事件，静默 debounce 秒后处理（Ctrl+C 退出）"""
+        pending: Set[str] = set()
+        first_event = 0.0
+        try:
+            while True:
+                changed = watcher.poll(debounce if pending else None)
+                if changed:
+                    if not pending:
+                        first_event = time.monotonic()
+                    pending |= changed
+                    if time.monotonic() - first_event < max_delay:
+                        continue
+                if pending:
+                    batch, pending = pending, set()
+                    self.update(batch)
+        finally:
+            watcher.close()
@@ -0,0 +1,69 @@
+# 管理API路由（配置热加载）
+import hmac
+import logging
+import os
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+
+from web.models.responses import ErrorResponse, ReloadResponse
+from web.services.analyzer_service import reload_analyzer
+from web.utils.threadpool import run_in_worker
+
+
+logger = logging.getLogger(__name__)
+
+# 管理接口令牌（未设置时管理接口禁用）
+ADMIN_TOKEN_ENV = "MD_AUDIT_ADMIN_TOKEN"
+
+router = APIRouter(prefix="/api/v1/admin", tags=["admin"])
+
+
+def require_admin_token(authorization: Optional[str] = Header(None)):
+    """校验 Authorization: Bearer <MD_AUDIT_ADMIN_TOKEN>"""
+    token = os.getenv(ADMIN_TOKEN_ENV)
+    if not token:
+        raise HTTPException(
+            status_code=403,
+            detail=ErrorResponse(
+                error_code="ADMIN_DISABLED",
+                message="管理接口未启用",
+                suggestion=f"设置环境变量 {ADMIN_TOKEN_ENV} 后重启服务"
+            ).model_dump()
+        )
+    scheme, _, credentials = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(credentials.encode(), token.encode()):
+        raise HTTPException(
+            status_code=401,
+            detail=ErrorResponse(
+                error_code="UNAUTHORIZED",
+                message="管理令牌无效",
+                suggestion="请求头需携带 Authorization: Bearer <token>"
+            ).model_dump()
+        )
+
+
+@router.post("/reload", response_model=ReloadResponse, dependencies=[Depends(require_admin_token)])
+async def reload_config(force: bool = False):
+    """
+    热加载配置
+
+    在工作线程中重新加载配置并构建新analyzer，完成后原子替换；
+    构建期间及进行中的请求继续使用旧实例。
+
+    - **force**: 配置指纹未变时也重建
+    """
+    try:
+        result = await run_in_worker(reload_analyzer, force)
+    except Exception as e:
+        logger.error(f"配置热加载失败: {e}")
+        raise HTTPException(
+            status_code=400,
+            detail=ErrorResponse(
+                error_code="RELOAD_FAILED",
+                message="配置加载失败，继续使用当前配置",
+                suggestion="请检查配置文件格式与字段",
+                details=str(e)
+            ).model_dump()
+        )
+    return ReloadResponse(**result)
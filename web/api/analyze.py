@@ -14,6 +14,8 @@ from web.services.file_service import FileService
 from web.services.analyzer_service import AnalyzerService
 from web.services.history_service import HistoryService
 from web.models.responses import AnalyzeResponse, ErrorResponse, BatchAnalyzeResponse, BatchAnalyzeItem
+from web.utils.json_response import FastJSONResponse
+from web.utils.threadpool import run_in_worker
 from md_audit.models.data_models import DiagnosticItem, SeverityLevel, SEOReport
 from md_audit.reporter import MarkdownReporter
 
@@ -58,7 +60,7 @@ class ExportReportRequest(BaseModel):
     relevance_score: float = 0
 
 
-@router.post("/analyze", response_model=AnalyzeResponse)
+@router.post("/analyze", response_model=AnalyzeResponse, response_class=FastJSONResponse)
 @limiter.limit("10/minute")  # 上传限流（放宽到10次/分钟，便于开发测试）
 async def analyze_file(
     request: Request,  # slowapi需要request参数
@@ -77,8 +79,8 @@ async def analyze_file(
         # 1. 保存上传文件
         temp_file = await file_service.save_upload(file)
 
-        # 2. 执行分析（复用现有analyzer）
-        report = analyzer_service.analyze_file(str(temp_file))
+        # 2. 执行分析（复用现有analyzer，在工作线程中执行）
+        report = await run_in_worker(analyzer_service.analyze_file, str(temp_file))
 
         # 3. 保存历史记录
         report_dict = report.model_dump()  # Pydantic序列化
@@ -87,7 +89,8 @@ async def analyze_file(
         # 4. 清理临时文件
         temp_file.unlink()
 
-        return AnalyzeResponse(report=report_dict, history_id=history_id)
+        # 直接返回响应，跳过response_model校验与jsonable_encoder
+        return FastJSONResponse({"report": report_dict, "history_id": history_id})
 
     except ValueError as e:
         # 文件校验错误
@@ -113,7 +116,7 @@ async def analyze_file(
         )
 
 
-@router.post("/analyze/batch", response_model=BatchAnalyzeResponse)
+@router.post("/analyze/batch", response_model=BatchAnalyzeResponse, response_class=FastJSONResponse)
 @limiter.limit("5/minute")  # 批量分析限流更严格
 async def analyze_batch(
     request: Request,
@@ -148,8 +151,8 @@ async def analyze_batch(
             # 1. 保存上传文件
             temp_file = await file_service.save_upload(file)
 
-            # 2. 执行分析
-            report = analyzer_service.analyze_file(str(temp_file))
+            # 2. 执行分析（工作线程中执行）
+            report = await run_in_worker(analyzer_service.analyze_file, str(temp_file))
             report_dict = report.model_dump()
 
             # 3. 保存历史记录
@@ -185,13 +188,13 @@ async def analyze_batch(
     # 计算平均分
     average_score = total_score / success_count if success_count > 0 else 0
 
-    return BatchAnalyzeResponse(
+    return FastJSONResponse(BatchAnalyzeResponse(
         total_files=len(files),
         success_count=success_count,
         failed_count=failed_count,
         results=results,
         average_score=round(average_score, 1)
-    )
+    ))
 
 
 @router.post("/analyze/export/markdown", response_class=Response)
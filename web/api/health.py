@@ -16,11 +16,10 @@ async def health_check():
     try:
         # 检查analyzer模块是否可导入
         from md_audit.analyzer import MarkdownSEOAnalyzer
-        from md_audit.config import MarkdownSEOConfig
+        from web.services.analyzer_service import get_compiled_config
 
-        # 检查配置是否有效
-        config = MarkdownSEOConfig()
-        ai_enabled = config.enable_ai_analysis and bool(config.llm_api_key)
+        # 检查配置是否有效（复用已编译的配置，不重复读取环境变量）
+        ai_enabled = get_compiled_config().ai_enabled
 
         return HealthResponse(
             status="healthy",
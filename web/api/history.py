@@ -3,6 +3,7 @@ from fastapi import APIRouter, HTTPException, Depends, Query
 
 from web.services.history_service import HistoryService
 from web.models.responses import HistoryListResponse, ErrorResponse
+from web.utils.json_response import FastJSONResponse
 
 
 router = APIRouter(prefix="/api/v1", tags=["history"])
@@ -12,7 +13,7 @@ def get_history_service():
     return HistoryService()
 
 
-@router.get("/history", response_model=HistoryListResponse)
+@router.get("/history", response_model=HistoryListResponse, response_class=FastJSONResponse)
 async def get_history_list(
     page: int = Query(1, ge=1, description="页码（从1开始）"),
     page_size: int = Query(20, ge=1, le=100, description="每页数量"),
@@ -28,7 +29,7 @@ async def get_history_list(
     """
     try:
         result = history_service.get_history_list(page, page_size, severity)
-        return HistoryListResponse(**result)
+        return FastJSONResponse(HistoryListResponse(**result))
 
     except Exception as e:
         raise HTTPException(
@@ -42,7 +43,7 @@ async def get_history_list(
         )
 
 
-@router.get("/history/{record_id}")
+@router.get("/history/{record_id}", response_class=FastJSONResponse)
 async def get_history_detail(
     record_id: str,
     history_service: HistoryService = Depends(get_history_service),
@@ -54,7 +55,7 @@ async def get_history_detail(
     """
     try:
         record = history_service.get_report(record_id)
-        return {"report": record["report"]}
+        return FastJSONResponse({"report": record["report"]})
 
     except ValueError as e:
         raise HTTPException(
@@ -0,0 +1,21 @@
+# 指标API路由（Prometheus文本格式，进程内采集）
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from md_audit.utils.metrics import REGISTRY
+
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    """
+    Prometheus指标导出
+
+    包含路由请求数与延迟、分析各阶段延迟、LLM重试次数、缓存命中率和线程池排队深度
+    """
+    return PlainTextResponse(
+        REGISTRY.render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -8,9 +8,11 @@ from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 import logging
 import os
+import time
 from pathlib import Path
 
-from web.api import analyze, history, health
+from web.api import admin, analyze, history, health, metrics
+from md_audit.utils.metrics import HTTP_REQUESTS, HTTP_LATENCY, HTTP_IN_FLIGHT
 
 
 # 日志配置
@@ -53,11 +55,23 @@ app.add_middleware(
 # Gzip压缩中间件
 app.add_middleware(GZipMiddleware, minimum_size=1000)
 
-# 请求日志中间件
+# 请求日志中间件（同时记录路由级请求数与延迟指标）
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
     logger.info(f"{request.method} {request.url.path} - {request.client.host}")
-    response = await call_next(request)
+    start = time.perf_counter()
+    status_code = 500
+    HTTP_IN_FLIGHT.inc()
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+    finally:
+        HTTP_IN_FLIGHT.dec()
+        # 使用路由模板（如 /api/v1/history/{record_id}）作为标签，避免标签基数爆炸
+        route = request.scope.get("route")
+        route_path = (getattr(route, "path", "") or "/") if route else "<unmatched>"
+        HTTP_LATENCY.observe(time.perf_counter() - start, method=request.method, route=route_path)
+        HTTP_REQUESTS.inc(method=request.method, route=route_path, status=str(status_code))
     logger.info(f"{request.method} {request.url.path} - {response.status_code}")
     return response
 
@@ -65,6 +79,8 @@ async def log_requests(request: Request, call_next):
 app.include_router(analyze.router)
 app.include_router(history.router)
 app.include_router(health.router)
+app.include_router(metrics.router)
+app.include_router(admin.router)
 
 # 挂载静态文件（前端构建产物）
 static_dir = Path(__file__).parent / "static"
@@ -85,9 +101,19 @@ async def root():
 
 # 定时清理临时文件
 from web.services.file_service import FileService
-from web.services.analyzer_service import clear_analyzer_cache, get_analyzer
+from web.services.analyzer_service import (
+    clear_analyzer_cache,
+    config_file_state,
+    get_analyzer,
+    get_config_path,
+    reload_analyzer,
+)
+from web.utils.threadpool import run_in_worker
 import asyncio
 
+# 配置文件轮询间隔（秒），<=0 时不监听
+CONFIG_WATCH_INTERVAL = float(os.getenv("MD_AUDIT_CONFIG_WATCH_INTERVAL", "2"))
+
 
 async def cleanup_task():
     """后台任务：每小时清理临时文件"""
@@ -99,6 +125,22 @@ async def cleanup_task():
         logger.info("临时文件清理完成")
 
 
+async def config_watch_task():
+    """后台任务：轮询配置文件，变更后在工作线程中重建analyzer并原子替换"""
+    last_state = config_file_state()
+    while True:
+        await asyncio.sleep(CONFIG_WATCH_INTERVAL)
+        state = config_file_state()
+        if state is None or state == last_state:
+            continue  # 文件未变化，或编辑器保存过程中暂时不存在
+        last_state = state
+        try:
+            result = await run_in_worker(reload_analyzer)
+            logger.info(f"检测到配置文件变更：{result['status']}")
+        except Exception as e:
+            logger.error(f"配置文件变更后热加载失败，继续使用当前配置：{e}")
+
+
 @app.on_event("startup")
 async def startup_event():
     """应用启动时执行"""
@@ -117,6 +159,12 @@ async def startup_event():
     # 启动后台清理任务
     asyncio.create_task(cleanup_task())
 
+    # 监听配置文件（设置了 SEO_RULES_CONFIG 时）
+    config_path = get_config_path()
+    if config_path is not None and CONFIG_WATCH_INTERVAL > 0:
+        asyncio.create_task(config_watch_task())
+        logger.info(f"监听配置文件变更: {config_path}（每{CONFIG_WATCH_INTERVAL:g}秒）")
+
     logger.info("MD Audit Web服务已启动")
 
 
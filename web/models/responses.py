@@ -64,3 +64,12 @@ class HealthResponse(BaseModel):
     version: str = Field(..., description="Web服务版本")
     analyzer_version: str = Field(..., description="Analyzer版本")
     ai_enabled: bool = Field(..., description="AI分析是否启用")
+
+
+class ReloadResponse(BaseModel):
+    """配置热加载响应"""
+    status: str = Field(..., description="reloaded（已替换）/unchanged（配置未变）")
+    fingerprint: str = Field(..., description="当前配置指纹（SHA-256）")
+    previous_fingerprint: Optional[str] = Field(None, description="替换前的配置指纹")
+    build_ms: float = Field(..., description="加载配置与构建analyzer耗时（毫秒）")
+    config_path: Optional[str] = Field(None, description="配置文件路径（未设置时为None）")
@@ -1,14 +1,78 @@
 # 分析服务（封装现有analyzer）
+import os
+import threading
+import time
 from pathlib import Path
 from functools import lru_cache
+from typing import Optional, Tuple
 import logging
 from md_audit.analyzer import MarkdownSEOAnalyzer
-from md_audit.config import MarkdownSEOConfig
+from md_audit.config import CompiledConfig, MarkdownSEOConfig, compile_config
+from md_audit.utils.metrics import CONFIG_RELOADS
 
 logger = logging.getLogger(__name__)
 
-# 全局analyzer实例（懒加载）
+# 配置文件路径（可选）：设置后从该文件加载规则，并可热加载
+CONFIG_PATH_ENV = "SEO_RULES_CONFIG"
+
+# 全局analyzer实例与编译后的配置（懒加载）
 _analyzer_instance = None
+_compiled_config = None
+
+# 串行化analyzer的构建与替换（读取实例不加锁）
+_build_lock = threading.Lock()
+
+
+def get_config_path() -> Optional[Path]:
+    """获取配置文件路径（未设置 SEO_RULES_CONFIG 时返回None，仅使用默认值与环境变量）"""
+    path = os.getenv(CONFIG_PATH_ENV)
+    return Path(path) if path else None
+
+
+def config_file_state() -> Optional[Tuple[int, int]]:
+    """配置文件的 (修改时间ns, 大小)，用于检测变更；未配置或文件不存在时返回None"""
+    path = get_config_path()
+    if path is None:
+        return None
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _load_compiled_config(strict: bool) -> CompiledConfig:
+    """
+    加载并编译配置
+
+    Args:
+        strict: 配置文件不存在时是否抛出异常（热加载为True，启动时回退到默认配置）
+    """
+    path = get_config_path()
+    if path is not None:
+        if path.exists():
+            return compile_config(MarkdownSEOConfig.from_json(str(path)))
+        if strict:
+            raise FileNotFoundError(f"配置文件不存在: {path}")
+        logger.warning(f"配置文件不存在（{path}），使用默认配置")
+    return compile_config(MarkdownSEOConfig())
+
+
+def get_compiled_config() -> CompiledConfig:
+    """
+    获取编译后的配置（只读取一次配置文件与环境变量，之后复用）
+
+    Returns:
+        CompiledConfig实例
+    """
+    global _compiled_config
+    compiled = _compiled_config
+    if compiled is None:
+        with _build_lock:
+            if _compiled_config is None:
+                _compiled_config = _load_compiled_config(strict=False)
+            compiled = _compiled_config
+    return compiled
 
 
 def get_analyzer():
@@ -19,17 +83,81 @@ def get_analyzer():
         MarkdownSEOAnalyzer实例
     """
     global _analyzer_instance
-    if _analyzer_instance is None:
-        config = MarkdownSEOConfig()
-        _analyzer_instance = MarkdownSEOAnalyzer(config)
-        logger.info(f"Analyzer初始化完成 - AI引擎: {'启用' if _analyzer_instance.ai_engine else '禁用'}")
-    return _analyzer_instance
+    analyzer = _analyzer_instance
+    if analyzer is None:
+        compiled = get_compiled_config()
+        with _build_lock:
+            if _analyzer_instance is None:
+                _analyzer_instance = MarkdownSEOAnalyzer(compiled)
+                logger.info(
+                    f"Analyzer初始化完成 - AI引擎: {'启用' if _analyzer_instance.ai_engine else '禁用'}，"
+                    f"配置指纹: {compiled.fingerprint[:12]}"
+                )
+            analyzer = _analyzer_instance
+    return analyzer
+
+
+def reload_analyzer(force: bool = False) -> dict:
+    """
+    重新加载配置并构建新analyzer，构建完成后原子替换全局实例
+
+    在工作线程中调用（阻塞）。新实例复用旧实例的CWV探测结果，LLM配置未变时
+    复用AI引擎；进行中的请求已在依赖注入时持有旧实例，会在旧实例上完成。
+    配置加载或构建失败时抛出异常，旧实例保持不变。
+
+    Args:
+        force: 配置指纹未变时是否仍然重建
+
+    Returns:
+        热加载结果（status: reloaded/unchanged，新旧配置指纹与构建耗时）
+    """
+    global _analyzer_instance, _compiled_config
+    with _build_lock:
+        start = time.perf_counter()
+        previous = _analyzer_instance
+        try:
+            compiled = _load_compiled_config(strict=True)
+            unchanged = (
+                not force
+                and previous is not None
+                and previous.compiled.fingerprint == compiled.fingerprint
+                and previous.compiled.llm_settings == compiled.llm_settings
+            )
+            if not unchanged:
+                analyzer = MarkdownSEOAnalyzer(compiled, reuse=previous)
+        except Exception:
+            CONFIG_RELOADS.inc(result="failed")
+            raise
+
+        previous_fingerprint = previous.compiled.fingerprint if previous is not None else None
+        if not unchanged:
+            # 先替换配置再替换实例，读取方始终看到完整构建的对象
+            _compiled_config = compiled
+            _analyzer_instance = analyzer
+
+    status = "unchanged" if unchanged else "reloaded"
+    CONFIG_RELOADS.inc(result=status)
+    build_ms = round((time.perf_counter() - start) * 1000, 1)
+    if not unchanged:
+        logger.info(
+            f"配置已热加载 - 指纹: {(previous_fingerprint or '-')[:12]} -> {compiled.fingerprint[:12]}，"
+            f"构建耗时 {build_ms}ms"
+        )
+    path = get_config_path()
+    return {
+        "status": status,
+        "fingerprint": compiled.fingerprint,
+        "previous_fingerprint": previous_fingerprint,
+        "build_ms": build_ms,
+        "config_path": str(path) if path else None,
+    }
 
 
 def clear_analyzer_cache():
-    """清除analyzer缓存（用于重新加载配置）"""
-    global _analyzer_instance
+    """清除analyzer缓存（下次请求时完整重建；运行中的服务请使用 reload_analyzer）"""
+    global _analyzer_instance, _compiled_config
     _analyzer_instance = None
+    _compiled_config = None
     logger.info("Analyzer缓存已清除")
 
 
@@ -4,6 +4,9 @@ from pathlib import Path
 from datetime import datetime
 from typing import Optional
 
+from md_audit.utils import fast_json
+from md_audit.utils.metrics import STORAGE_LATENCY
+
 
 class HistoryService:
     """历史记录管理服务（JSON文件存储）"""
@@ -133,14 +136,13 @@ class HistoryService:
 
     def _load_history(self) -> dict:
         """加载历史记录"""
-        try:
-            return json.loads(self.history_file.read_text(encoding="utf-8"))
-        except (json.JSONDecodeError, FileNotFoundError):
-            return {}
+        with STORAGE_LATENCY.time(operation="history_load"):
+            try:
+                return fast_json.loads(self.history_file.read_bytes())
+            except (json.JSONDecodeError, FileNotFoundError):
+                return {}
 
     def _save_history(self, history: dict):
-        """保存历史记录"""
-        self.history_file.write_text(
-            json.dumps(history, ensure_ascii=False, indent=2),
-            encoding="utf-8"
-        )
+        """保存历史记录（紧凑格式，不缩进）"""
+        with STORAGE_LATENCY.time(operation="history_save"):
+            self.history_file.write_bytes(fast_json.dumps(history))
@@ -0,0 +1,18 @@
+# 快速JSON响应
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+from md_audit.utils import fast_json
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    报告类接口的JSON响应
+
+    直接返回该响应可跳过FastAPI默认的 response_model 二次校验与 jsonable_encoder，
+    由 fast_json 将Pydantic模型或字典一次序列化为字节（orjson/pydantic-core）。
+    """
+
+    def render(self, content: Any) -> bytes:
+        return fast_json.dumps(content)
@@ -0,0 +1,36 @@
+# 工作线程池调用（带 /metrics 排队与执行中任务数）
+from typing import Any, Callable, TypeVar
+
+from starlette.concurrency import run_in_threadpool
+
+from md_audit.utils.metrics import THREADPOOL_TASKS
+
+T = TypeVar("T")
+
+
+async def run_in_worker(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    在 Starlette 工作线程池中执行阻塞调用（分析、热加载等），不阻塞事件循环
+
+    提交后计入 md_audit_threadpool_tasks{state="queued"}，工作线程开始执行时
+    转入 state="running"，结束后移出；线程池满时 queued 即为排队长度。
+    """
+    started = False
+
+    def call() -> T:
+        nonlocal started
+        started = True
+        THREADPOOL_TASKS.dec(state="queued")
+        THREADPOOL_TASKS.inc(state="running")
+        try:
+            return func(*args, **kwargs)
+        finally:
+            THREADPOOL_TASKS.dec(state="running")
+
+    THREADPOOL_TASKS.inc(state="queued")
+    try:
+        return await run_in_threadpool(call)
+    finally:
+        # 等待空闲线程期间被取消（客户端断开）时任务不会执行
+        if not started:
+            THREADPOOL_TASKS.dec(state="queued")